@@ -0,0 +1,174 @@
+"""Offline benchmarks for the resume generation and PDF rendering hot paths
+
+Run from the repository root:
+
+    python -m benchmarks.run                                    # print results
+    python -m benchmarks.run --save benchmarks/baseline.json   # record a baseline
+    python -m benchmarks.run --compare benchmarks/baseline.json --tolerance 0.25
+
+--compare exits with status 1 if any case's p50 latency or peak memory is
+more than `tolerance` above the baseline. No network or database is used:
+inputs are synthetic resumes of increasing size. PDFs are rendered in this
+process (no worker pool) so timings measure layout work, not IPC.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+# ResumeGenerator refuses to start without a key; nothing here calls the API
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from benchmarks import synthetic
+from services.pdf_generator import PDFGenerator, normalize_resume_data_for_pdf
+from services.resume_generator import ResumeGenerator
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(fn: Callable[[], object], min_seconds: float, min_iterations: int, max_iterations: int) -> Dict:
+    """Time repeated calls of `fn`, then one more call under tracemalloc for peak memory"""
+    fn()  # warm up caches, imports and font loading
+
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_iterations and (
+        len(samples) < min_iterations or time.perf_counter() - started < min_seconds
+    ):
+        call_started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    # Measured separately since tracing slows every allocation down
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": len(samples),
+        "ops_per_second": round(len(samples) / elapsed, 2),
+        "p50_ms": round(_percentile(samples, 0.50) * 1000, 4),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 4),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def build_cases(quick: bool) -> Dict[str, Callable[[], object]]:
+    """Benchmark name -> zero-argument callable, one per function and input size"""
+    resume_generator = ResumeGenerator()
+    pdf_generator = PDFGenerator(render_workers=0)
+    loop = asyncio.new_event_loop()
+
+    def generate_pdf(resume_data):
+        return loop.run_until_complete(pdf_generator.generate_pdf(resume_data))
+
+    cases = {}
+    for projects in synthetic.sizes(quick):
+        request = synthetic.make_resume_request(projects)
+        response_text = synthetic.make_llm_response(projects)
+        stored = synthetic.make_stored_resume_data(projects)
+        parsed = synthetic.make_resume_data(projects)
+        cases[f"preprocess_user_input/projects={projects}"] = lambda r=request: resume_generator.preprocess_user_input(r)
+        cases[f"parse_resume_response/projects={projects}"] = lambda t=response_text: resume_generator._parse_resume_response(t)
+        cases[f"normalize_resume_data_for_pdf/projects={projects}"] = lambda d=stored: normalize_resume_data_for_pdf(d)
+        cases[f"generate_pdf/projects={projects}"] = lambda d=parsed: generate_pdf(d)
+    return cases
+
+
+def run(quick: bool = False, only: str = None) -> Dict:
+    min_seconds = 0.2 if quick else 1.0
+    results = {}
+    for name, fn in build_cases(quick).items():
+        if only and only not in name:
+            continue
+        is_pdf = name.startswith("generate_pdf")
+        results[name] = measure(
+            fn,
+            min_seconds=min_seconds,
+            min_iterations=5 if is_pdf else 50,
+            max_iterations=200 if is_pdf else 100000,
+        )
+        print(_format_row(name, results[name]))
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+# Differences below these are timer and allocator noise, whatever the percentage
+NOISE_FLOORS = {"p50_ms": 0.01, "peak_memory_kb": 4.0}
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Describe every case that got slower or hungrier than the baseline allows"""
+    regressions = []
+    for name, base in baseline["results"].items():
+        result = current["results"].get(name)
+        if result is None:
+            continue
+        for metric, floor in NOISE_FLOORS.items():
+            if result[metric] > base[metric] * (1 + tolerance) and result[metric] - base[metric] > floor:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]} vs baseline {base[metric]} "
+                    f"(+{(result[metric] / base[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _format_row(name: str, result: Dict) -> str:
+    return (
+        f"{name:<48} {result['ops_per_second']:>10.1f} ops/s  "
+        f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  "
+        f"peak {result['peak_memory_kb']:>9.1f} KiB"
+    )
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and shorter runs, for smoke checks")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="fail if results regress against this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression as a fraction (default 0.25)")
+    args = parser.parse_args(argv)
+
+    current = run(quick=args.quick, only=args.only)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
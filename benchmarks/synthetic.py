@@ -0,0 +1,101 @@
+import json
+import random
+from typing import Dict, List
+
+from models.resume_models import ExperienceLevel, ResumeRequest
+
+FIRST_NAMES = ["Aarav", "Zoë", "Łukasz", "Søren", "María José", "Chloé", "Ngozi", "Hiroshi", "Émile", "Ananya"]
+LAST_NAMES = ["Sharma", "Østergaard", "Nuñez-García", "Kowalczyk", "O'Brien", "Müller", "Okafor", "Tanaka", "Dubois"]
+TECHNOLOGIES = [
+    "Python", "FastAPI", "MongoDB", "React", "TypeScript", "Docker", "Kubernetes", "PostgreSQL",
+    "Redis", "TensorFlow", "PyTorch", "Go", "Rust", "AWS Lambda", "GraphQL", "Kafka", "C++", "Node.js",
+]
+WORDS = [
+    "scalable", "pipeline", "latency", "distributed", "dashboard", "résumé", "naïve", "café", "throughput",
+    "microservice", "optimised", "façade", "real-time", "analytics", "inference", "caching", "coördinated",
+    "deployment", "observability", "schema", "migration", "benchmark", "–", "±", "→", "✓",
+]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 20)) for _ in range(sentences))
+
+
+def make_resume_data(projects: int, seed: int = 0) -> Dict:
+    """Parsed resume JSON of the shape the LLM returns, with `projects` project entries"""
+    rng = random.Random(seed * 1000 + projects)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return {
+        "name": name,
+        "contact_info": {
+            "email": f"candidate{projects}@example.com",
+            "phone": "+91 98765 43210",
+        },
+        # Long summaries stress paragraph wrapping in the PDF layout
+        "summary": _paragraph(rng, 6 + projects // 5),
+        "education": [
+            {
+                "degree": "B.Tech in Computer Science",
+                "institution": "Indian Institute of Technology, Bombay",
+                "year": str(2015 + index),
+                "cgpa": "8.7/10",
+                "details": _sentence(rng, 12),
+            }
+            for index in range(2)
+        ],
+        "skills": rng.sample(TECHNOLOGIES, k=min(len(TECHNOLOGIES), 6 + projects // 3)),
+        "projects": [
+            {
+                "title": f"Project {index + 1}: {_sentence(rng, 3).rstrip('.')}",
+                "description": _paragraph(rng, 3),
+                "technologies": ", ".join(rng.sample(TECHNOLOGIES, k=4)),
+                "duration": f"{rng.randint(1, 12)} months",
+            }
+            for index in range(projects)
+        ],
+    }
+
+
+def make_resume_request(projects: int, seed: int = 0) -> ResumeRequest:
+    """Form input for a candidate with `projects` projects, with messy whitespace like real input"""
+    data = make_resume_data(projects, seed)
+    project_text = "\n\n".join(
+        f"  {project['title']}   -  {project['description']}\n   Tech:  {project['technologies']}  "
+        for project in data["projects"]
+    )
+    return ResumeRequest(
+        name=data["name"],
+        email=data["contact_info"]["email"],
+        phone=data["contact_info"]["phone"],
+        experience_level=ExperienceLevel.MID,
+        target_role="Backend Engineer",
+        skills=" ,  ".join(data["skills"]),
+        education="  ".join(f"{entry['degree']}, {entry['institution']} ({entry['year']})" for entry in data["education"]),
+        projects=project_text,
+        additional_info=data["summary"],
+    )
+
+
+def make_llm_response(projects: int, seed: int = 0) -> str:
+    """Raw completion text: the resume JSON wrapped in the chatter models tend to add"""
+    body = json.dumps(make_resume_data(projects, seed), indent=2, ensure_ascii=False)
+    return f"Here is the generated resume:\n\n```json\n{body}\n```\n\nLet me know if you need changes."
+
+
+def make_stored_resume_data(projects: int, seed: int = 0) -> Dict:
+    """Resume data as stored by older versions, with string fields the PDF path must normalize"""
+    data = make_resume_data(projects, seed)
+    data["skills"] = ", ".join(data["skills"])
+    data["email"] = data.pop("contact_info")["email"]
+    if projects % 2:
+        data["education"] = data["education"][0]
+    return data
+
+
+def sizes(quick: bool = False) -> List[int]:
+    return [1, 10] if quick else [1, 5, 20, 50]
@@ -0,0 +1,210 @@
+"""Open-loop load driver for the resume builder
+
+Sends a weighted mix of requests at a fixed target rate and reports
+throughput and latency percentiles per endpoint:
+
+    python -m loadtest.driver --base-url http://127.0.0.1:8000 --rps 20 --duration 60 \\
+        --mix generate=1,pdf=3,login=2,dashboard=4
+
+Requests are started on schedule whether or not earlier ones finished (an
+open loop), so a slow server shows up as rising latency rather than as a
+lower request rate. Once --max-in-flight requests are outstanding, further
+scheduled requests are counted as dropped instead of sent.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.synthetic import make_resume_data, make_resume_request
+
+DEFAULT_MIX = "generate=1,pdf=3,login=2,dashboard=4"
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}', expected one of {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def login(client: httpx.AsyncClient, rng: random.Random, user: int) -> httpx.Response:
+    return await client.post("/login", data={"email": f"loadtest{user}@example.com", "name": f"Load Test {user}"})
+
+
+async def generate(client: httpx.AsyncClient, rng: random.Random, user: int) -> httpx.Response:
+    request = make_resume_request(rng.randint(1, 5), seed=rng.randrange(1000000))
+    form = request.model_dump(mode="json")
+    form["email"] = f"loadtest{user}@example.com"
+    return await client.post("/generate-resume", data=form)
+
+
+async def download_pdf(client: httpx.AsyncClient, rng: random.Random, user: int) -> httpx.Response:
+    # A handful of distinct resumes, so the PDF cache sees realistic repeats
+    return await client.post("/download-pdf", json=make_resume_data(rng.randint(1, 10), seed=rng.randrange(20)))
+
+
+async def dashboard(client: httpx.AsyncClient, rng: random.Random, user: int) -> httpx.Response:
+    return await client.get("/dashboard", params={"email": f"loadtest{user}@example.com"})
+
+
+SCENARIOS = {
+    "generate": generate,
+    "pdf": download_pdf,
+    "login": login,
+    "dashboard": dashboard,
+}
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Dict[str, int] = defaultdict(int)
+        self.errors = 0
+
+    def record(self, latency: float, status: Optional[int]):
+        self.latencies.append(latency)
+        if status is None:
+            self.errors += 1
+            self.statuses["error"] += 1
+        else:
+            self.statuses[str(status)] += 1
+            if status >= 400:
+                self.errors += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        ordered = sorted(self.latencies)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 1)
+
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "throughput_rps": round((len(ordered) - self.errors) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": percentile(0.50),
+            "p90_ms": percentile(0.90),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(ordered[-1] * 1000, 1) if ordered else None,
+            "statuses": dict(self.statuses),
+        }
+
+
+async def run_load(
+    base_url: str,
+    rps: float,
+    duration: float,
+    mix: Dict[str, float],
+    users: int = 50,
+    max_in_flight: int = 500,
+    timeout: float = 120.0,
+    seed: int = 0,
+) -> Dict:
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    stats = {name: EndpointStats() for name in names}
+    in_flight = set()
+    dropped = 0
+
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+
+        async def one(name: str, request_rng: random.Random, user: int):
+            started = time.perf_counter()
+            try:
+                response = await SCENARIOS[name](client, request_rng, user)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            stats[name].record(time.perf_counter() - started, status)
+
+        started = time.perf_counter()
+        sent = 0
+        while True:
+            # Schedule against the start time so the rate doesn't drift
+            next_at = started + sent / rps
+            now = time.perf_counter()
+            if next_at - started >= duration:
+                break
+            if next_at > now:
+                await asyncio.sleep(next_at - now)
+            sent += 1
+
+            if len(in_flight) >= max_in_flight:
+                dropped += 1
+                continue
+            name = rng.choices(names, weights)[0]
+            task = asyncio.ensure_future(one(name, random.Random(rng.random()), rng.randrange(users)))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "target_rps": rps,
+        "duration_seconds": round(elapsed, 2),
+        "scheduled": sent,
+        "dropped": dropped,
+        "endpoints": {name: endpoint.summary(elapsed) for name, endpoint in stats.items()},
+    }
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"target {report['target_rps']} rps for {report['duration_seconds']}s: "
+        f"{report['scheduled']} scheduled, {report['dropped']} dropped",
+        f"{'endpoint':<10} {'requests':>8} {'errors':>7} {'ok rps':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}  statuses",
+    ]
+    for name, summary in report["endpoints"].items():
+        def cell(value):
+            return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+        lines.append(
+            f"{name:<10} {summary['requests']:>8} {summary['errors']:>7} {summary['throughput_rps']:>8.2f} "
+            f"{cell(summary['p50_ms'])} {cell(summary['p90_ms'])} {cell(summary['p99_ms'])} {cell(summary['max_ms'])}  "
+            f"{json.dumps(summary['statuses'], sort_keys=True)}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load driver for the resume builder")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=10.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep sending")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"endpoint weights (default {DEFAULT_MIX})")
+    parser.add_argument("--users", type=int, default=50, help="distinct user emails to spread requests over")
+    parser.add_argument("--max-in-flight", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(
+        args.base_url, args.rps, args.duration, args.mix,
+        users=args.users, max_in_flight=args.max_in_flight, timeout=args.timeout, seed=args.seed,
+    ))
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
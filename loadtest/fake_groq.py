@@ -0,0 +1,285 @@
+"""Local stand-in for the Groq chat completions API
+
+Serves POST /openai/v1/chat/completions (streaming and non-streaming) with
+synthetic resume JSON, so the app can be load tested without the real API:
+
+    python -m loadtest.fake_groq --port 8099 --latency lognormal --latency-ms 800
+    GROQ_BASE_URL=http://127.0.0.1:8099 uvicorn main:app
+
+Latency is a sampled time to first token plus completion tokens divided by
+--tokens-per-second. --rate-limit-rate and --malformed-rate inject 429s and
+unparseable completions at random. Rate limit headers follow Groq: the
+x-ratelimit-*-requests headers report a per-day request budget
+(--requests-per-day) and the x-ratelimit-*-tokens headers a per-minute
+token budget (--tokens-per-minute) that refills continuously. A
+--requests-per-minute budget is enforced with 429s only, as Groq does.
+GET /stats shows what was served.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from benchmarks.synthetic import make_resume_data
+
+
+class FakeGroqConfig(BaseModel):
+    latency: str = "lognormal"
+    latency_ms: float = 500.0
+    latency_spread: float = 0.5
+    tokens_per_second: float = 500.0
+    rate_limit_rate: float = 0.0
+    malformed_rate: float = 0.0
+    requests_per_minute: int = 0
+    requests_per_day: int = 14400
+    tokens_per_minute: int = 0
+    projects: int = 3
+    seed: int = 0
+
+
+class FakeGroq:
+    """Completion behaviour and counters for one fake server"""
+
+    def __init__(self, config: FakeGroqConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.window_started = self.day_started = self.tokens_updated = time.monotonic()
+        self.window_requests = 0
+        self.day_requests = 0
+        # Without a token budget the headers still report one, just a large one
+        self.token_capacity = config.tokens_per_minute or 1000000
+        self.tokens_available = float(self.token_capacity)
+        self.stats = {"requests": 0, "streamed": 0, "rate_limited": 0, "malformed": 0, "completion_tokens": 0}
+
+    def time_to_first_token(self) -> float:
+        config = self.config
+        median = config.latency_ms / 1000
+        if config.latency == "fixed":
+            return median
+        if config.latency == "uniform":
+            return max(0.0, self.random.uniform(median * (1 - config.latency_spread), median * (1 + config.latency_spread)))
+        if config.latency == "exponential":
+            return self.random.expovariate(1 / median) if median > 0 else 0.0
+        # lognormal: right-skewed with a long tail, like real LLM latency
+        return self.random.lognormvariate(math.log(median), config.latency_spread) if median > 0 else 0.0
+
+    def token_delay(self, tokens: int) -> float:
+        return tokens / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0.0
+
+    def _refill(self, now: float):
+        if now - self.window_started >= 60:
+            self.window_started = now
+            self.window_requests = 0
+        if now - self.day_started >= 86400:
+            self.day_started = now
+            self.day_requests = 0
+        refill = (now - self.tokens_updated) * self.token_capacity / 60
+        self.tokens_available = min(self.token_capacity, self.tokens_available + refill)
+        self.tokens_updated = now
+
+    def rate_limit(self, reserved_tokens: int):
+        """(limited_by, retry_after_seconds) for a new request that may use `reserved_tokens`
+
+        limited_by is None when the request is admitted, otherwise "requests"
+        or "tokens". Admitted requests are counted, and pay for their tokens
+        with charge_tokens() once the completion is known.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        per_second = self.token_capacity / 60
+        if self.config.requests_per_minute and self.window_requests >= self.config.requests_per_minute:
+            return "requests", 60 - (now - self.window_started)
+        if self.day_requests >= self.config.requests_per_day:
+            return "requests", 86400 - (now - self.day_started)
+        reserved_tokens = min(reserved_tokens, self.token_capacity)
+        if self.config.tokens_per_minute and reserved_tokens > self.tokens_available:
+            return "tokens", (reserved_tokens - self.tokens_available) / per_second
+        if self.random.random() < self.config.rate_limit_rate:
+            return "requests", self.random.uniform(0.5, 2.0)
+        self.window_requests += 1
+        self.day_requests += 1
+        return None, 0.0
+
+    def charge_tokens(self, tokens: int):
+        self._refill(time.monotonic())
+        self.tokens_available = max(0.0, self.tokens_available - tokens)
+
+    def rate_limit_headers(self) -> dict:
+        """x-ratelimit-* headers with Groq's semantics: requests per day, tokens per minute"""
+        self._refill(time.monotonic())
+        per_second = self.token_capacity / 60
+        return {
+            "x-ratelimit-limit-requests": str(self.config.requests_per_day),
+            "x-ratelimit-remaining-requests": str(max(self.config.requests_per_day - self.day_requests, 0)),
+            # Time until the budget is back to full, refilling continuously
+            "x-ratelimit-reset-requests": _duration(self.day_requests * 86400 / self.config.requests_per_day),
+            "x-ratelimit-limit-tokens": str(self.token_capacity),
+            "x-ratelimit-remaining-tokens": str(int(self.tokens_available)),
+            "x-ratelimit-reset-tokens": _duration((self.token_capacity - self.tokens_available) / per_second),
+        }
+
+    def completion_text(self, prompt: str) -> str:
+        data = make_resume_data(self.config.projects, seed=self.random.randrange(1000000))
+        match = re.search(r"- Name: (.+)", prompt)
+        if match:
+            data["name"] = match.group(1).strip()
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+
+        if self.random.random() < self.config.malformed_rate:
+            self.stats["malformed"] += 1
+            kind = self.random.choice(["truncated", "prose", "missing_field"])
+            if kind == "truncated":
+                return text[: len(text) // 2]
+            if kind == "prose":
+                return "I'm sorry, I can't produce JSON for this request right now."
+            del data["projects"]
+            return json.dumps(data)
+        return text
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _duration(seconds: float) -> str:
+    """Groq's duration format, e.g. 7.66s or 2m59.56s"""
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}m{seconds:.2f}s" if minutes else f"{seconds:.2f}s"
+
+
+def create_app(config: FakeGroqConfig) -> FastAPI:
+    fake = FakeGroq(config)
+    app = FastAPI(title="Fake Groq")
+
+    @app.get("/stats")
+    async def stats():
+        return fake.stats
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        fake.stats["requests"] += 1
+        model = body.get("model", "fake-model")
+        prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+
+        prompt_tokens = _tokens(prompt)
+        limited_by, retry_after = fake.rate_limit(prompt_tokens + int(body.get("max_tokens") or 1024))
+        if limited_by:
+            fake.stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={**fake.rate_limit_headers(), "retry-after": f"{retry_after:.2f}"},
+                content={"error": {
+                    "message": f"Rate limit reached for {limited_by}",
+                    "type": limited_by,
+                    "code": "rate_limit_exceeded",
+                }},
+            )
+
+        text = fake.completion_text(prompt)
+        completion_tokens = _tokens(text)
+        fake.stats["completion_tokens"] += completion_tokens
+        fake.charge_tokens(prompt_tokens + completion_tokens)
+        headers = fake.rate_limit_headers()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        await asyncio.sleep(fake.time_to_first_token())
+
+        if body.get("stream"):
+            fake.stats["streamed"] += 1
+
+            async def events():
+                pieces = re.findall(r".{1,16}", text, flags=re.S)
+                for index, piece in enumerate(pieces):
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "delta": {"role": "assistant", "content": piece} if index == 0 else {"content": piece},
+                            "finish_reason": None,
+                        }],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    await asyncio.sleep(fake.token_delay(_tokens(piece)))
+                final = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+        await asyncio.sleep(fake.token_delay(completion_tokens))
+        return JSONResponse(headers=headers, content={
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    return app
+
+
+def main():
+    defaults = FakeGroqConfig()
+    parser = argparse.ArgumentParser(description="Fake Groq chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "exponential", "lognormal"], default=defaults.latency)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="median time to first token")
+    parser.add_argument("--latency-spread", type=float, default=defaults.latency_spread,
+                        help="relative half-width (uniform) or sigma (lognormal)")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second, help="0 for instant")
+    parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate, help="fraction of requests answered 429")
+    parser.add_argument("--malformed-rate", type=float, default=defaults.malformed_rate, help="fraction of unparseable completions")
+    parser.add_argument("--requests-per-minute", type=int, default=defaults.requests_per_minute, help="0 for unlimited")
+    parser.add_argument("--requests-per-day", type=int, default=defaults.requests_per_day)
+    parser.add_argument("--tokens-per-minute", type=int, default=defaults.tokens_per_minute, help="0 for unlimited")
+    parser.add_argument("--projects", type=int, default=defaults.projects, help="projects per generated resume")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    config = FakeGroqConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_spread=args.latency_spread,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        malformed_rate=args.malformed_rate,
+        requests_per_minute=args.requests_per_minute,
+        requests_per_day=args.requests_per_day,
+        tokens_per_minute=args.tokens_per_minute,
+        projects=args.projects,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
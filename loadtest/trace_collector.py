@@ -0,0 +1,167 @@
+"""Local stand-in for an OpenTelemetry collector's OTLP/HTTP traces endpoint
+
+Accepts the JSON encoding of POST /v1/traces, keeps recent traces in memory
+and optionally appends every span to a JSONL file:
+
+    python -m loadtest.trace_collector --port 4318 --output traces.jsonl
+    TRACE_EXPORTER=otlp TRACE_OTLP_ENDPOINT=http://127.0.0.1:4318/v1/traces uvicorn main:app
+
+GET /traces lists recent traces, slowest first; GET /traces/{id} returns
+one by trace ID or request ID (X-Request-ID), as a span tree with
+?format=text. Span files written here or by TRACE_EXPORTER=jsonl can be
+read without a server:
+
+    python -m loadtest.trace_collector --show traces.jsonl --request-id 5f0c...
+"""
+import argparse
+import json
+import sys
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from services.tracing import from_otlp
+
+
+def format_trace(spans: List[Dict]) -> str:
+    """Indented span tree with durations and offsets from the start of the trace"""
+    if not spans:
+        return ""
+    started = min(span["start_time_unix_nano"] for span in spans)
+    span_ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    for span in spans:
+        # Spans whose parent wasn't recorded here (e.g. an upstream service) are roots
+        parent_id = span["parent_id"] if span["parent_id"] in span_ids else None
+        children[parent_id].append(span)
+
+    lines = [f"trace {spans[0]['trace_id']}  request {spans[0].get('request_id') or '-'}"]
+
+    def walk(parent_id: Optional[str], depth: int):
+        for span in sorted(children[parent_id], key=lambda s: s["start_time_unix_nano"]):
+            offset = (span["start_time_unix_nano"] - started) / 1e6
+            attributes = " ".join(f"{key}={value}" for key, value in span["attributes"].items())
+            error = f"  ERROR {span['error']}" if span.get("error") else ""
+            lines.append(
+                f"{span['duration_ms']:>10.1f} ms  +{offset:<9.1f} {'  ' * depth}{span['name']}  {attributes}{error}".rstrip()
+            )
+            walk(span["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def _summary(trace_id: str, spans: List[Dict]) -> Dict:
+    root = min(spans, key=lambda span: (span["parent_id"] is not None, span["start_time_unix_nano"]))
+    return {
+        "trace_id": trace_id,
+        "request_id": root.get("request_id"),
+        "name": root["name"],
+        "duration_ms": root["duration_ms"],
+        "spans": len(spans),
+        "errors": sum(1 for span in spans if span["status"] == "error"),
+    }
+
+
+class TraceStore:
+    """The most recent traces, grouped by trace ID"""
+
+    def __init__(self, max_traces: int = 1000, output: Optional[str] = None):
+        self.max_traces = max_traces
+        self.output = output
+        self.traces: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self.by_request_id: Dict[str, str] = {}
+        self.received_spans = 0
+
+    def add(self, spans: List[Dict]):
+        self.received_spans += len(spans)
+        if self.output:
+            with open(self.output, "a", encoding="utf-8") as f:
+                for span in spans:
+                    f.write(json.dumps(span, ensure_ascii=False) + "\n")
+        for span in spans:
+            trace_id = span["trace_id"]
+            if trace_id not in self.traces:
+                self.traces[trace_id] = []
+            self.traces[trace_id].append(span)
+            if span.get("request_id"):
+                self.by_request_id[span["request_id"]] = trace_id
+        while len(self.traces) > self.max_traces:
+            trace_id, evicted = self.traces.popitem(last=False)
+            for span in evicted:
+                self.by_request_id.pop(span.get("request_id"), None)
+
+    def get(self, trace_or_request_id: str) -> Optional[List[Dict]]:
+        trace_id = self.by_request_id.get(trace_or_request_id, trace_or_request_id)
+        return self.traces.get(trace_id)
+
+
+def create_app(max_traces: int = 1000, output: Optional[str] = None) -> FastAPI:
+    store = TraceStore(max_traces, output)
+    app = FastAPI(title="Trace collector")
+
+    @app.post("/v1/traces")
+    async def export_traces(request: Request):
+        if "json" not in request.headers.get("content-type", ""):
+            # Only the JSON encoding is implemented, not protobuf
+            return JSONResponse(status_code=415, content={"message": "Only application/json is supported"})
+        store.add(from_otlp(await request.json()))
+        return {"partialSuccess": {}}
+
+    @app.get("/traces")
+    async def list_traces(limit: int = 50):
+        summaries = [_summary(trace_id, spans) for trace_id, spans in store.traces.items()]
+        summaries.sort(key=lambda summary: summary["duration_ms"], reverse=True)
+        return {"received_spans": store.received_spans, "traces": summaries[:limit]}
+
+    @app.get("/traces/{trace_id}")
+    async def get_trace(trace_id: str, format: str = "json"):
+        spans = store.get(trace_id)
+        if spans is None:
+            raise HTTPException(status_code=404, detail="Trace not found")
+        if format == "text":
+            return PlainTextResponse(format_trace(spans) + "\n")
+        return {"trace_id": spans[0]["trace_id"], "spans": spans}
+
+    return app
+
+
+def show(path: str, request_id: Optional[str] = None, slowest: int = 5) -> str:
+    """Span trees from a JSONL file: one request's, or the slowest few"""
+    store = TraceStore(max_traces=sys.maxsize)
+    with open(path, encoding="utf-8") as f:
+        store.add([json.loads(line) for line in f if line.strip()])
+    if request_id:
+        spans = store.get(request_id)
+        if spans is None:
+            return f"No trace for {request_id} in {path}"
+        return format_trace(spans)
+    summaries = sorted(
+        (_summary(trace_id, spans) for trace_id, spans in store.traces.items()),
+        key=lambda summary: summary["duration_ms"], reverse=True
+    )
+    return "\n\n".join(format_trace(store.traces[summary["trace_id"]]) for summary in summaries[:slowest])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OTLP/HTTP trace collector stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--output", metavar="PATH", help="append received spans to this JSONL file")
+    parser.add_argument("--max-traces", type=int, default=1000, help="traces kept in memory")
+    parser.add_argument("--show", metavar="PATH", help="print span trees from a JSONL file and exit")
+    parser.add_argument("--request-id", help="with --show, the request to print")
+    parser.add_argument("--slowest", type=int, default=5, help="with --show, how many of the slowest traces to print")
+    args = parser.parse_args()
+
+    if args.show:
+        print(show(args.show, args.request_id, args.slowest))
+        return
+    uvicorn.run(create_app(args.max_traces, args.output), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
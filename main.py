@@ -1,26 +1,54 @@
-from fastapi import FastAPI, Request, Form, HTTPException, Depends
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi import FastAPI, Request, Form, HTTPException, Depends, UploadFile, File
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, PlainTextResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 import uvicorn
 import os
 from pathlib import Path
-from typing import Optional, List
+from urllib.parse import quote
+from typing import Optional, List, Tuple
+import csv
 import json
 import asyncio
+import re
+import logging
+from collections import deque
 from dotenv import load_dotenv
 
 from services.resume_generator import ResumeGenerator
-from services.pdf_generator import PDFGenerator
-from services.database_service import DatabaseService
+from services.pdf_generator import PDFGenerator, PDFRenderBusy, normalize_resume_data_for_pdf
+from services.database_service import DatabaseService, InvalidCursor
+from services.cache import MongoCacheTier
+from services.llm_scheduler import SchedulerOverloaded
+from services.pdf_store import LocalPDFStore, GridFSPDFStore
+from services.pdf_prerender import PDFPrerenderer
+from services.zip_export import stream_zip
+from services.bulk_generator import BulkResumeGenerator, BulkUploadTooLarge, parse_bulk_upload, read_upload
+from services.job_queue import JobQueue, InMemoryJobStore, MongoJobStore
+from services.metrics import REGISTRY, PDF_BYTES, stage_timer
+from services.tracing import RequestTracingMiddleware, configure_tracing
+from services.logging_config import configure_logging, logging_stats
 from models.resume_models import ResumeRequest, ResumeResponse
 from models.database_models import UserModel, ResumeModel
+from bson import ObjectId
 
 # Load environment variables
 load_dotenv()
+# Spawned PDF render workers re-run this module as __mp_main__; only the
+# server process should own the log listener and the root handlers
+if __name__ != "__mp_main__":
+    configure_logging()
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="AI Resume Builder", description="Professional Resume Builder using LangChain and Groq API")
 
+# Request IDs for every request; spans are exported when TRACE_EXPORTER is set
+tracer = configure_tracing()
+app.add_middleware(RequestTracingMiddleware)
+
 # Setup static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
@@ -29,14 +57,53 @@ templates = Jinja2Templates(directory="templates")
 resume_generator = ResumeGenerator()
 pdf_generator = PDFGenerator()
 db_service = DatabaseService()
+pdf_store = LocalPDFStore(os.getenv("PDF_STORE_DIR", "pdf_store"))
+bulk_generator = BulkResumeGenerator(
+    resume_generator,
+    db_service,
+    concurrency=int(os.getenv("BULK_GENERATION_CONCURRENCY", "4")),
+    batch_size=int(os.getenv("BULK_SAVE_BATCH_SIZE", "50"))
+)
+job_queue = JobQueue(
+    InMemoryJobStore(retention_seconds=float(os.getenv("JOB_RETENTION_SECONDS", "3600"))),
+    workers=int(os.getenv("JOB_WORKERS", "2"))
+)
+pdf_prerenderer = PDFPrerenderer(
+    enabled=os.getenv("PDF_PRERENDER") == "1",
+    max_concurrency=int(os.getenv("PDF_PRERENDER_MAX_CONCURRENCY", "2")),
+    is_saturated=pdf_generator.is_saturated
+)
 
 @app.on_event("startup")
 async def startup_event():
+    global pdf_store
     await db_service.connect()
+    # Reconnects later if MongoDB was down at startup, and watches it afterwards
+    db_service.start_health_probe()
+    if os.getenv("GENERATION_CACHE_TIER") == "mongo" and db_service.connected:
+        resume_generator.cache.attach_tier(MongoCacheTier(
+            db_service.db.generation_cache,
+            ttl_seconds=resume_generator.cache.memory.ttl_seconds
+        ))
+    if os.getenv("PDF_STORE") == "gridfs" and db_service.connected:
+        pdf_store = GridFSPDFStore(db_service.db)
+    if os.getenv("JOB_STORE") == "mongo" and db_service.connected:
+        job_queue.store = MongoJobStore(
+            db_service.db.jobs,
+            retention_seconds=float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+        )
+    job_queue.register("generate_resume", run_generation_job)
+    job_queue.register("bulk_generate_resumes", run_bulk_generation_job)
+    await job_queue.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await job_queue.stop()
+    await pdf_prerenderer.cancel_all()
     await db_service.disconnect()
+    await resume_generator.aclose()
+    pdf_generator.shutdown()
+    tracer.shutdown()
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -45,8 +112,7 @@ async def home(request: Request):
 
 from models.resume_models import ExperienceLevel  # Add this import
 
-@app.post("/generate-resume")
-async def generate_resume(
+def resume_request_form(
     name: str = Form(...),
     email: str = Form(...),
     phone: str = Form(...),
@@ -56,121 +122,299 @@ async def generate_resume(
     education: str = Form(...),
     projects: str = Form(...),
     additional_info: str = Form(default="")
-):
+) -> ResumeRequest:
+    """Build a ResumeRequest from the resume builder form fields"""
+    # Contact details and free text stay out of the logs
+    logger.debug("Received resume form: experience_level=%s target_role=%s", experience_level, target_role)
     try:
-        print("Received data:", name, email, phone, experience_level, target_role, skills, education, projects, additional_info)
         # Convert experience_level string to Enum
-        resume_request = ResumeRequest(
+        level = ExperienceLevel(experience_level)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid experience level: {experience_level}")
+    try:
+        return ResumeRequest(
             name=name,
             email=email,
             phone=phone,
-            experience_level=ExperienceLevel(experience_level),  # <-- FIXED HERE
+            experience_level=level,
             target_role=target_role,
             skills=skills,
             education=education,
             projects=projects,
             additional_info=additional_info
         )
-        
-        resume_content = await resume_generator.generate_resume(resume_request)
-        
-        # Save resume to database
-        try:
-            resume_title = f"{target_role} Resume - {resume_request.name}"
+    except ValidationError as e:
+        # Reported like FastAPI's own request validation errors
+        raise RequestValidationError(e.errors())
+
+async def save_generated_resume(resume_request: ResumeRequest, resume_content: dict) -> dict:
+    """Save a generated resume and attach its database ID to the content"""
+    try:
+        resume_title = resume_request.default_title()
+        with stage_timer("generate", "save"):
             resume_id = await db_service.save_resume(
-                user_email=email,
+                user_email=resume_request.email,
                 resume_data=resume_content,
                 title=resume_title
             )
-            resume_content['_id'] = resume_id  # Add ID to response
-        except Exception as db_error:
-            print(f"Database save error: {str(db_error)}")
-            # Continue without failing - resume generation worked
+        resume_content['_id'] = resume_id  # Add ID to response
+        
+        # A download almost always follows, so get the PDF ready in the background
+        saved_resume = ResumeModel(
+            _id=resume_id,
+            user_email=resume_request.email,
+            resume_data=resume_content,
+            title=resume_title
+        )
+        pdf_prerenderer.schedule(resume_id, lambda: prerender_resume_pdf(saved_resume))
+    except Exception as db_error:
+        logger.error("Database save error: %s", db_error)
+        # Continue without failing - resume generation worked
+    return resume_content
+
+@app.post("/generate-resume")
+async def generate_resume(
+    resume_request: ResumeRequest = Depends(resume_request_form),
+    mode: str = "sync"
+):
+    try:
+        if mode == "job":
+            # Return right away; the client polls /jobs/{id} for the result
+            job_id = await job_queue.submit("generate_resume", resume_request.model_dump(mode="json"))
+            return JSONResponse(
+                status_code=202,
+                content={"success": True, "job_id": job_id, "status_url": f"/jobs/{job_id}"}
+            )
+        
+        resume_content = await resume_generator.generate_resume(resume_request)
+        
+        # Save resume to database
+        resume_content = await save_generated_resume(resume_request, resume_content)
         
         return {"success": True, "resume": resume_content}
+    except SchedulerOverloaded as e:
+        raise overloaded_exception(e)
     except Exception as e:
-        print("Error in /generate-resume:", str(e))
+        logger.exception("Error in /generate-resume: %s", e)
         raise HTTPException(status_code=500, detail=f"Error generating resume: {str(e)}")
 
+async def run_generation_job(payload: dict) -> dict:
+    """Job handler: generate, parse and save a resume in the background"""
+    resume_request = ResumeRequest(**payload)
+    
+    # Background jobs can afford to wait for LLM capacity instead of failing
+    resume_content = await resume_generator.generate_resume_waiting(resume_request)
+    
+    resume_content = await save_generated_resume(resume_request, resume_content)
+    return {"resume": resume_content}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status and, once finished, result of a background job"""
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {"success": True, "job": {
+        "id": job["_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job["created_at"].isoformat(),
+        "started_at": job["started_at"].isoformat() if job.get("started_at") else None,
+        "finished_at": job["finished_at"].isoformat() if job.get("finished_at") else None
+    }}
+
+@app.post("/bulk/generate-resumes")
+async def bulk_generate_resumes(file: UploadFile = File(...)):
+    """Queue resume generation for a whole cohort from a CSV or JSONL upload
+    
+    A cohort takes minutes, far longer than a request may stay open, so it
+    runs as a background job; /jobs/{id} has the per-row report once done.
+    """
+    try:
+        content = await read_upload(file, int(os.getenv("BULK_MAX_UPLOAD_BYTES", str(5 * 1024 * 1024))))
+        rows = parse_bulk_upload(file.filename, content, max_rows=int(os.getenv("BULK_MAX_ROWS", "1000")))
+    except BulkUploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read upload: {str(e)}")
+    
+    job_id = await job_queue.submit("bulk_generate_resumes", {"filename": file.filename, "rows": rows})
+    return JSONResponse(
+        status_code=202,
+        content={"success": True, "job_id": job_id, "status_url": f"/jobs/{job_id}", "total": len(rows)}
+    )
+
+async def run_bulk_generation_job(payload: dict) -> dict:
+    """Job handler: generate and save a cohort upload, returning the per-row report"""
+    return await bulk_generator.run(payload["rows"])
+
+def overloaded_exception(error: SchedulerOverloaded) -> HTTPException:
+    """503 telling the client when the LLM is expected to have capacity again"""
+    return HTTPException(
+        status_code=503,
+        detail=f"Resume generation is temporarily overloaded: {str(error)}",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+def sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.post("/generate-resume/stream")
+async def generate_resume_stream(resume_request: ResumeRequest = Depends(resume_request_form)):
+    """Generate a resume, pushing each section to the browser as soon as it is complete"""
+    # Reject before the stream starts so overloaded clients get a real 503
+    try:
+        resume_generator.scheduler.ensure_capacity()
+    except SchedulerOverloaded as e:
+        raise overloaded_exception(e)
+    
+    async def event_stream():
+        try:
+            async for kind, payload in resume_generator.stream_resume(resume_request):
+                if kind == "section":
+                    yield sse_event("section", payload)
+                else:
+                    resume_content = await save_generated_resume(resume_request, payload)
+                    yield sse_event("complete", {"success": True, "resume": resume_content})
+        except SchedulerOverloaded as e:
+            yield sse_event("error", {
+                "detail": f"Resume generation is temporarily overloaded: {str(e)}",
+                "retry_after": e.retry_after
+            })
+        except Exception as e:
+            logger.exception("Error in /generate-resume/stream: %s", e)
+            yield sse_event("error", {"detail": f"Error generating resume: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the given strong ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or any(
+        tag == etag or tag.removeprefix('W/') == etag for tag in candidates
+    )
+
+async def pdf_response(request: Request, resume_data: dict, load_pdf=None) -> Response:
+    """Serve a normalized resume as a PDF, honoring conditional GETs via ETag
+    
+    `load_pdf` can supply the bytes from somewhere other than the PDF cache.
+    """
+    etag = f'"{pdf_generator.cache_key(resume_data)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    # The ETag is derived from the content, so a match needs no render at all
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    # Cache or store lookup, plus the render on a miss
+    with stage_timer("pdf", "fetch"):
+        if load_pdf:
+            pdf_bytes = await load_pdf()
+        else:
+            pdf_bytes, _ = await pdf_generator.generate_pdf_cached(resume_data)
+    PDF_BYTES.inc(len(pdf_bytes), kind="sent")
+    headers["Content-Disposition"] = pdf_content_disposition(resume_data)
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
 @app.post("/download-pdf")
-async def download_pdf(resume_data: dict):
+async def download_pdf(resume_data: dict, request: Request):
     """Generate and download PDF version of the resume"""
     try:
-        print("Received PDF data structure:")
-        print(json.dumps(resume_data, indent=2))
-        
         # Ensure proper data structure for PDF generator
-        processed_data = normalize_resume_data_for_pdf(resume_data)
+        with stage_timer("pdf", "normalize"):
+            processed_data = normalize_resume_data_for_pdf(resume_data)
         
-        print("Processed PDF data structure:")
-        print(json.dumps(processed_data, indent=2))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PDF request sections: %s", sorted(processed_data))
         
-        # Generate PDF
-        pdf_path = await pdf_generator.generate_pdf(processed_data)
-        
-        return FileResponse(
-            path=pdf_path,
-            filename=f"{processed_data.get('name', 'resume').replace(' ', '_')}_resume.pdf",
-            media_type="application/pdf"
-        )
+        # Generate PDF in memory (or reuse a cached render) and send the bytes directly
+        return await pdf_response(request, processed_data)
         
+    except PDFRenderBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
-        print(f"PDF generation error: {str(e)}")
+        logger.exception("PDF generation error: %s", e)
         raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
 
-def normalize_resume_data_for_pdf(resume_data: dict) -> dict:
-    """Normalize resume data structure for PDF generation"""
-    normalized = resume_data.copy()
-    
-    # Ensure contact_info is properly structured
-    if 'contact_info' not in normalized or not isinstance(normalized.get('contact_info'), dict):
-        normalized['contact_info'] = {
-            'email': resume_data.get('email', ''),
-            'phone': resume_data.get('phone', '')
-        }
-    
-    # Ensure skills is a list
-    if 'skills' in normalized:
-        if isinstance(normalized['skills'], str):
-            # Split string into list
-            skills_list = [skill.strip() for skill in normalized['skills'].split(',')]
-            normalized['skills'] = [skill for skill in skills_list if skill]
-        elif not isinstance(normalized['skills'], list):
-            normalized['skills'] = [str(normalized['skills'])]
-    
-    # Ensure education is a list
-    if 'education' in normalized:
-        if isinstance(normalized['education'], str):
-            # Convert string to basic education entry
-            normalized['education'] = [{
-                'degree': '',
-                'institution': '',
-                'year': '',
-                'cgpa': '',
-                'details': normalized['education']
-            }]
-        elif not isinstance(normalized['education'], list):
-            normalized['education'] = [normalized['education']]
-    
-    # Ensure projects is a list
-    if 'projects' in normalized:
-        if isinstance(normalized['projects'], str):
-            # Convert string to basic project entry
-            normalized['projects'] = [{
-                'title': 'Projects',
-                'description': normalized['projects'],
-                'technologies': '',
-                'duration': ''
-            }]
-        elif not isinstance(normalized['projects'], list):
-            normalized['projects'] = [normalized['projects']]
-    
-    return normalized
+def pdf_content_disposition(resume_data: dict) -> str:
+    """Content-Disposition header for downloading a resume PDF"""
+    filename = f"{str(resume_data.get('name') or 'resume').replace(' ', '_')}_resume.pdf"
+    quoted = quote(filename)
+    if quoted != filename:
+        # Non-ASCII names need the RFC 5987 form, headers are latin-1 only
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "AI Resume Builder"}
+    return {
+        "status": "healthy",
+        "service": "AI Resume Builder",
+        "generation_cache": resume_generator.cache.stats(),
+        "generation_in_flight": resume_generator.in_flight.stats(),
+        "llm_scheduler": resume_generator.scheduler.stats(),
+        "pdf_renderer": pdf_generator.stats(),
+        "pdf_cache": pdf_generator.cache.stats(),
+        "pdf_prerender": pdf_prerenderer.stats(),
+        "resume_cache": db_service.resume_cache.stats() if db_service.resume_cache is not None else None,
+        "offline_store": await db_service.offline_store.stats(),
+        "write_behind": db_service.write_behind.stats() if db_service.write_behind is not None else None,
+        "jobs": job_queue.stats(),
+        "tracing": tracer.stats(),
+        "logging": logging_stats(),
+        "mongodb_connected": db_service.connected,
+        "circuit_breakers": {
+            "mongodb": db_service.breaker.stats(),
+            "groq": resume_generator.scheduler.breaker.stats()
+        }
+    }
+
+def collect_app_metrics():
+    """Scrape-time metrics from counters the services already keep"""
+    caches = {
+        "generation": resume_generator.cache,
+        "pdf": pdf_generator.cache,
+        "resume": db_service.resume_cache,
+    }
+    caches = {name: cache.stats() for name, cache in caches.items() if cache is not None}
+    scheduler = resume_generator.scheduler.stats()
+    breakers = {"mongodb": db_service.breaker, "groq": resume_generator.scheduler.breaker}
+    
+    yield ("resume_builder_cache_hits_total", "counter", "Cache hits",
+           [({"cache": name}, stats["hits"]) for name, stats in caches.items()])
+    yield ("resume_builder_cache_misses_total", "counter", "Cache misses",
+           [({"cache": name}, stats["misses"]) for name, stats in caches.items()])
+    yield ("resume_builder_llm_retries_total", "counter", "LLM calls retried after 429/5xx/connection errors",
+           [({}, scheduler["retries"])])
+    yield ("resume_builder_llm_rejected_total", "counter", "LLM calls rejected by admission control",
+           [({}, scheduler["rejected"])])
+    yield ("resume_builder_llm_requests", "gauge", "LLM calls running or waiting for a slot",
+           [({"state": "running"}, scheduler["running"]), ({"state": "waiting"}, scheduler["waiting"])])
+    yield ("resume_builder_pdf_renders_pending", "gauge", "PDF renders queued or running",
+           [({}, pdf_generator.pending)])
+    if db_service.write_behind is not None:
+        yield ("resume_builder_write_behind_queue_depth", "gauge", "Resumes waiting to be written to MongoDB",
+               [({}, db_service.write_behind.stats()["queue_depth"])])
+    yield ("resume_builder_circuit_breaker_open", "gauge", "1 while a dependency's circuit breaker is open",
+           [({"dependency": name}, int(breaker.state == "open")) for name, breaker in breakers.items()])
+
+REGISTRY.add_collector(collect_app_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 # New endpoints for user authentication and resume management
 
@@ -181,15 +425,16 @@ async def login_user(email: str = Form(...), name: str = Form(...)):
         user = await db_service.create_or_get_user(email, name)
         return {"success": True, "user": {"email": user.email, "name": user.name}}
     except Exception as e:
-        print(f"Login error: {str(e)}")
+        logger.exception("Login error: %s", e)
         raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
 
 @app.get("/user/{email}/resumes")
-async def get_user_resumes(email: str):
-    """Get all resumes for a user"""
+async def get_user_resumes(email: str, limit: int = 20, cursor: Optional[str] = None):
+    """Get a page of resume metadata for a user, newest first"""
     try:
-        resumes = await db_service.get_user_resumes(email)
-        return {"success": True, "resumes": [
+        limit = max(1, min(limit, 100))
+        resumes, next_cursor = await db_service.list_user_resumes(email, limit=limit, cursor=cursor)
+        return {"success": True, "next_cursor": next_cursor, "resumes": [
             {
                 "id": str(resume.id),
                 "title": resume.title,
@@ -197,10 +442,68 @@ async def get_user_resumes(email: str):
                 "updated_at": resume.updated_at.isoformat()
             } for resume in resumes
         ]}
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"Get resumes error: {str(e)}")
+        logger.exception("Get resumes error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get resumes: {str(e)}")
 
+async def render_for_export(resume: ResumeModel) -> bytes:
+    """Render a stored resume for bulk export, waiting out render backpressure
+    
+    Gives up with PDFRenderBusy once EXPORT_RENDER_WAIT_SECONDS have passed.
+    """
+    processed_data = normalize_resume_data_for_pdf(resume.resume_data)
+    deadline = asyncio.get_running_loop().time() + float(os.getenv("EXPORT_RENDER_WAIT_SECONDS", "60"))
+    while True:
+        try:
+            return await load_stored_resume_pdf(resume, processed_data)
+        except PDFRenderBusy:
+            if asyncio.get_running_loop().time() >= deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+def export_filename(resume: ResumeModel, extension: str = "pdf") -> str:
+    """Unique, filesystem-safe archive member name for a resume"""
+    title = re.sub(r'[^\w\-. ]', '_', resume.title).strip() or "resume"
+    return f"{title}_{resume.id}.{extension}"
+
+async def export_entry(resume: ResumeModel) -> Tuple[str, bytes]:
+    """Archive member for one resume; a failed render becomes a short error note instead"""
+    try:
+        return export_filename(resume), await render_for_export(resume)
+    except Exception as e:
+        logger.warning("Export render failed for resume %s: %s", resume.id, e)
+        message = f"The PDF for this resume could not be rendered: {str(e) or type(e).__name__}\n"
+        return export_filename(resume, "error.txt"), message.encode("utf-8")
+
+@app.get("/user/{email}/resumes/export.zip")
+async def export_user_resumes(email: str):
+    """Stream a ZIP archive with a PDF of every resume for a user"""
+    window = int(os.getenv("EXPORT_RENDER_CONCURRENCY", str(max(pdf_generator.render_workers, 1))))
+    
+    async def rendered_resumes():
+        # Render up to `window` PDFs ahead in parallel while keeping archive order
+        pending = deque()
+        try:
+            async for resume in db_service.iter_user_resumes(email):
+                pending.append(asyncio.ensure_future(export_entry(resume)))
+                if len(pending) >= window:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            # Client went away: don't leave renders running
+            for task in pending:
+                task.cancel()
+    
+    archive_name = quote(f"{email}_resumes.zip")
+    return StreamingResponse(
+        stream_zip(rendered_resumes()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename*=utf-8''{archive_name}"}
+    )
+
 @app.get("/resume/{resume_id}")
 async def get_resume(resume_id: str, user_email: str):
     """Get a specific resume"""
@@ -211,20 +514,87 @@ async def get_resume(resume_id: str, user_email: str):
         
         return {"success": True, "resume": resume.resume_data}
     except Exception as e:
-        print(f"Get resume error: {str(e)}")
+        logger.exception("Get resume error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get resume: {str(e)}")
 
+async def load_stored_resume_pdf(resume: ResumeModel, resume_data: dict) -> bytes:
+    """Load a saved resume's PDF from cache or the PDF store, rendering and storing it if needed"""
+    key = pdf_generator.cache_key(resume_data)
+    pdf_url = pdf_store.url_for(key)
+    
+    pdf_bytes = await pdf_generator.cache.get(key)
+    stored = False
+    if resume.pdf_url == pdf_url:
+        if pdf_bytes is None:
+            pdf_bytes = await pdf_store.get(pdf_url)
+            if pdf_bytes is not None:
+                await pdf_generator.cache.set(key, pdf_bytes)
+        stored = pdf_bytes is not None
+    
+    if pdf_bytes is None:
+        pdf_bytes, _ = await pdf_generator.generate_pdf_cached(resume_data)
+    
+    if not stored:
+        await pdf_store.put(key, pdf_bytes)
+        await db_service.set_resume_pdf_url(str(resume.id), resume.user_email, pdf_url)
+        if resume.pdf_url and resume.pdf_url != pdf_url:
+            # Rendered from content the resume no longer has
+            await delete_stored_pdf(resume.pdf_url)
+    return pdf_bytes
+
+async def delete_stored_pdf(pdf_url: str):
+    """Remove a PDF artifact; a failure only leaves an orphaned file behind"""
+    try:
+        await pdf_store.delete(pdf_url)
+    except Exception as e:
+        logger.warning("Could not delete stored PDF %s: %s", pdf_url, e)
+
+async def prerender_resume_pdf(resume: ResumeModel):
+    """Render a freshly saved resume into the PDF cache and store"""
+    processed_data = normalize_resume_data_for_pdf(resume.resume_data)
+    await load_stored_resume_pdf(resume, processed_data)
+
+@app.get("/resume/{resume_id}/pdf")
+async def get_resume_pdf(resume_id: str, user_email: str, request: Request):
+    """Download a saved resume as a PDF without sending its content back to the server"""
+    try:
+        if not ObjectId.is_valid(resume_id):
+            raise HTTPException(status_code=404, detail="Resume not found")
+        
+        resume = await db_service.get_resume_by_id(resume_id, user_email)
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        
+        processed_data = normalize_resume_data_for_pdf(resume.resume_data)
+        return await pdf_response(
+            request,
+            processed_data,
+            load_pdf=lambda: load_stored_resume_pdf(resume, processed_data)
+        )
+    except HTTPException:
+        raise
+    except PDFRenderBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        logger.exception("Get resume PDF error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to get resume PDF: {str(e)}")
+
 @app.delete("/resume/{resume_id}")
 async def delete_resume(resume_id: str, user_email: str):
     """Delete a resume"""
     try:
+        resume = await db_service.get_resume_by_id(resume_id, user_email)
         success = await db_service.delete_resume(resume_id, user_email)
+        pdf_prerenderer.cancel(resume_id)
         if not success:
             raise HTTPException(status_code=404, detail="Resume not found")
         
+        if resume is not None and resume.pdf_url:
+            await delete_stored_pdf(resume.pdf_url)
+        
         return {"success": True, "message": "Resume deleted successfully"}
     except Exception as e:
-        print(f"Delete resume error: {str(e)}")
+        logger.exception("Delete resume error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to delete resume: {str(e)}")
 
 @app.get("/dashboard")
@@ -234,14 +604,18 @@ async def dashboard(request: Request, email: str = None):
         return templates.TemplateResponse("login.html", {"request": request})
     
     try:
-        resumes = await db_service.get_user_resumes(email)
+        # Only the first page is rendered; the page fetches the rest as needed
+        resumes, next_cursor = await db_service.list_user_resumes(
+            email, limit=int(os.getenv("DASHBOARD_PAGE_SIZE", "12"))
+        )
         return templates.TemplateResponse("dashboard.html", {
             "request": request,
             "user_email": email,
-            "resumes": resumes
+            "resumes": resumes,
+            "next_cursor": next_cursor
         })
     except Exception as e:
-        print(f"Dashboard error: {str(e)}")
+        logger.exception("Dashboard error: %s", e)
         return templates.TemplateResponse("error.html", {
             "request": request,
             "error": "Failed to load dashboard"
@@ -62,3 +62,14 @@ class ResumeModel(BaseModel):
         "populate_by_name": True,
         "json_encoders": {ObjectId: str}
     }
+
+class ResumeSummaryModel(BaseModel):
+    """Resume metadata for listings, without the resume content"""
+    id: PyObjectId = Field(alias="_id")
+    title: str
+    created_at: datetime
+    updated_at: datetime
+    model_config = {
+        "arbitrary_types_allowed": True,
+        "populate_by_name": True,
+    }
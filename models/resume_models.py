@@ -21,6 +21,10 @@ class ResumeRequest(BaseModel):
     projects: str = Field(..., description="Project details and descriptions")
     additional_info: Optional[str] = Field(default="", description="Additional information, certifications, etc.")
 
+    def default_title(self) -> str:
+        """Title used when the generated resume is saved"""
+        return f"{self.target_role} Resume - {self.name}"
+
 class ResumeSection(BaseModel):
     """Individual resume section"""
     title: str
@@ -0,0 +1,191 @@
+import asyncio
+import csv
+import io
+import json
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from models.resume_models import ResumeRequest
+from services.database_service import PartialSaveError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BulkUploadTooLarge(Exception):
+    """Raised when an upload has more bytes or rows than allowed"""
+
+
+async def read_upload(upload, max_bytes: int, chunk_size: int = 64 * 1024) -> bytes:
+    """Read an uploaded file in chunks, giving up as soon as it passes max_bytes"""
+    chunks = []
+    size = 0
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            return b"".join(chunks)
+        size += len(chunk)
+        if size > max_bytes:
+            raise BulkUploadTooLarge(f"Upload is larger than the limit of {max_bytes} bytes")
+        chunks.append(chunk)
+
+
+def parse_bulk_upload(filename: str, content: bytes, max_rows: Optional[int] = None) -> List[Dict]:
+    """Parse a CSV or JSONL upload into raw row dicts
+
+    JSONL is detected from a .jsonl/.ndjson extension or a leading '{';
+    anything else is read as CSV with a header row of ResumeRequest fields.
+    Parsing stops with BulkUploadTooLarge once there are more than
+    `max_rows` rows.
+    """
+    text = content.decode("utf-8-sig")
+    name = (filename or "").lower()
+    rows = []
+
+    def add(row: Dict):
+        if max_rows is not None and len(rows) >= max_rows:
+            raise BulkUploadTooLarge(f"Upload has more than {max_rows} rows")
+        rows.append(row)
+
+    if name.endswith((".jsonl", ".ndjson")) or text.lstrip().startswith("{"):
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                row = {"__error__": f"Invalid JSON on line {line_number}: {e}"}
+            add(row if isinstance(row, dict) else {"__error__": f"Line {line_number} is not an object"})
+        return rows
+
+    for row in csv.DictReader(io.StringIO(text)):
+        add(dict(row))
+    return rows
+
+
+class BulkResumeGenerator:
+    """Generates and saves resumes for a whole cohort upload
+
+    Rows are validated up front, then a fixed number of workers generate
+    them so a large upload never floods the event loop or the LLM
+    scheduler. Generated resumes are saved with batched inserts, and every
+    row gets a status in the final report.
+    """
+
+    def __init__(
+        self,
+        resume_generator,
+        db_service,
+        concurrency: int = 4,
+        batch_size: int = 50,
+        max_overload_retries: int = 5,
+    ):
+        self.resume_generator = resume_generator
+        self.db_service = db_service
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_overload_retries = max_overload_retries
+
+    def validate_rows(self, rows: List[Dict]) -> Tuple[List[Tuple[int, ResumeRequest]], List[Dict]]:
+        """Split rows into valid requests and per-row results for rows that failed validation"""
+        valid = []
+        results = []
+        for row_number, row in enumerate(rows, start=1):
+            if "__error__" in row:
+                results.append({"row": row_number, "status": "invalid", "error": row["__error__"]})
+                continue
+            try:
+                cleaned = {key.strip(): value for key, value in row.items() if key and value is not None}
+                valid.append((row_number, ResumeRequest(**cleaned)))
+            except ValidationError as e:
+                errors = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                )
+                results.append({"row": row_number, "status": "invalid", "error": errors})
+        return valid, results
+
+    async def run(self, rows: List[Dict]) -> Dict:
+        """Validate, generate and save every row, returning a per-row report"""
+        valid, results = self.validate_rows(rows)
+
+        # Onboard the cohort's accounts in one batch so students can log in
+        cohort = {resume_request.email: resume_request.name for _, resume_request in valid}
+        try:
+            await self.db_service.create_or_get_users(list(cohort.items()))
+        except Exception as e:
+            logger.warning("Bulk user onboarding failed: %s", e)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in valid:
+            queue.put_nowait(item)
+
+        pending_saves: List[Tuple[Dict, Dict]] = []
+        save_lock = asyncio.Lock()
+
+        async def flush():
+            async with save_lock:
+                batch = pending_saves[:]
+                pending_saves.clear()
+                if not batch:
+                    return
+                try:
+                    resume_ids = await self.db_service.save_resumes([resume for _, resume in batch])
+                    for (result, _), resume_id in zip(batch, resume_ids):
+                        result["status"] = "saved"
+                        result["resume_id"] = resume_id
+                except PartialSaveError as e:
+                    # Only the failed rows are reported, so a re-run doesn't duplicate the rest
+                    logger.warning("Bulk save failed for %d of %d resumes", len(e.errors), len(batch))
+                    for index, ((result, _), resume_id) in enumerate(zip(batch, e.resume_ids)):
+                        if resume_id is None:
+                            result["status"] = "generated"
+                            result["error"] = f"Save failed: {e.errors[index]}"
+                        else:
+                            result["status"] = "saved"
+                            result["resume_id"] = resume_id
+                except Exception as e:
+                    logger.warning("Bulk save of %d resumes failed: %s", len(batch), e)
+                    for result, _ in batch:
+                        result["status"] = "generated"
+                        result["error"] = f"Save failed: {str(e)}"
+
+        async def worker():
+            while True:
+                try:
+                    row_number, resume_request = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = {"row": row_number, "email": resume_request.email}
+                results.append(result)
+                try:
+                    # Wait out scheduler overload instead of failing the row
+                    resume_content = await self.resume_generator.generate_resume_waiting(
+                        resume_request, self.max_overload_retries
+                    )
+                except Exception as e:
+                    result["status"] = "failed"
+                    result["error"] = str(e)
+                    continue
+
+                pending_saves.append((result, {
+                    "user_email": resume_request.email,
+                    "resume_data": resume_content,
+                    "title": resume_request.default_title(),
+                }))
+                if len(pending_saves) >= self.batch_size:
+                    await flush()
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(valid)) or 1)))
+        await flush()
+
+        results.sort(key=lambda result: result["row"])
+        statuses = [result["status"] for result in results]
+        return {
+            "total": len(rows),
+            "saved": statuses.count("saved"),
+            "generated": statuses.count("generated"),
+            "failed": statuses.count("failed"),
+            "invalid": statuses.count("invalid"),
+            "rows": results,
+        }
@@ -0,0 +1,298 @@
+import asyncio
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from bson import Binary
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """In-process LRU cache with optional TTL and total size budget"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, size = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting least recently used entries to stay in budget"""
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Never cache a single value larger than the whole budget
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[key] = (value, expires_at, size)
+        self.current_bytes += size
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.current_bytes > self.max_bytes
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        """Remove a value if present"""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self):
+        """Remove every value"""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry, returning how many were removed"""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at is not None and expires_at < now]
+        for key in expired:
+            self._remove(key)
+        return len(expired)
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Entry counts and hit/miss counters"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskCacheTier:
+    """Second-level cache tier storing raw bytes as files in a local directory"""
+
+    def __init__(self, directory: str, ttl_seconds: Optional[float] = None):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # Fan out into subdirectories so a single directory doesn't grow unbounded
+        return os.path.join(self.directory, key[:2], key)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if self.ttl_seconds and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see partial files
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _remove(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, data: bytes):
+        await asyncio.to_thread(self._write, key, data)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._remove, key)
+
+
+class MongoCacheTier:
+    """Second-level cache tier storing raw bytes in a MongoDB collection with a TTL index"""
+
+    def __init__(self, collection, ttl_seconds: Optional[float] = None):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self._index_ready = False
+
+    async def _ensure_index(self):
+        if self._index_ready or not self.ttl_seconds:
+            return
+        await self.collection.create_index("created_at", expireAfterSeconds=int(self.ttl_seconds))
+        self._index_ready = True
+
+    async def get(self, key: str) -> Optional[bytes]:
+        doc = await self.collection.find_one({"_id": key})
+        if not doc:
+            return None
+        # The TTL monitor only runs periodically, so check expiry on read too
+        if self.ttl_seconds and doc["created_at"] < datetime.utcnow() - timedelta(seconds=self.ttl_seconds):
+            return None
+        return bytes(doc["value"])
+
+    async def set(self, key: str, data: bytes):
+        await self._ensure_index()
+        await self.collection.replace_one(
+            {"_id": key},
+            {"_id": key, "value": Binary(data), "created_at": datetime.utcnow()},
+            upsert=True
+        )
+
+    async def delete(self, key: str):
+        await self.collection.delete_one({"_id": key})
+
+
+class LocalSharedCacheTier:
+    """In-process stand-in for a shared cache service such as Redis or memcached
+
+    It has the same async get/set/delete interface over bytes, with a TTL,
+    so a networked client can be dropped in without touching callers. Like
+    such a service it is bounded: least recently used entries are evicted
+    past `max_entries`, and expired entries are swept out on writes at most
+    once per TTL.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self._values = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds, sizeof=len)
+        self._next_purge = time.monotonic() + ttl_seconds if ttl_seconds else None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._values.get(key)
+
+    async def set(self, key: str, data: bytes):
+        self._values.set(key, data)
+        if self._next_purge is not None and self._next_purge <= time.monotonic():
+            self._values.purge_expired()
+            self._next_purge = time.monotonic() + self.ttl_seconds
+
+    async def delete(self, key: str):
+        self._values.delete(key)
+
+
+class TieredCache:
+    """In-memory LRU cache backed by an optional slower tier (disk, Mongo, ...)
+
+    Values are kept as-is in memory and converted with `encode`/`decode` when
+    they go to or come from the second tier, which only stores bytes. The
+    memory tier may be None when every read must see the shared tier. Errors
+    from the second tier are logged and treated as misses so a broken cache
+    never fails a request.
+    """
+
+    def __init__(
+        self,
+        memory: Optional[LRUCache],
+        tier=None,
+        encode: Callable[[Any], bytes] = bytes,
+        decode: Callable[[bytes], Any] = bytes,
+    ):
+        self.memory = memory
+        self.tier = tier
+        self.encode = encode
+        self.decode = decode
+        self.hits = 0
+        self.misses = 0
+        self.tier_hits = 0
+
+    def attach_tier(self, tier):
+        """Set or replace the second-level tier"""
+        self.tier = tier
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key) if self.memory is not None else None
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self.tier is not None:
+            try:
+                data = await self.tier.get(key)
+            except Exception as e:
+                logger.warning("Cache tier read failed: %s", e)
+                data = None
+            if data is not None:
+                value = self.decode(data)
+                if self.memory is not None:
+                    self.memory.set(key, value)
+                self.hits += 1
+                self.tier_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any):
+        if self.memory is not None:
+            self.memory.set(key, value)
+        if self.tier is not None:
+            try:
+                await self.tier.set(key, self.encode(value))
+            except Exception as e:
+                logger.warning("Cache tier write failed: %s", e)
+
+    async def delete(self, key: str):
+        if self.memory is not None:
+            self.memory.delete(key)
+        if self.tier is not None:
+            try:
+                await self.tier.delete(key)
+            except Exception as e:
+                logger.warning("Cache tier delete failed: %s", e)
+
+    def stats(self) -> dict:
+        """Overall hit/miss counters plus the in-memory tier's own stats"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "tier_hits": self.tier_hits,
+            "tier": type(self.tier).__name__ if self.tier is not None else None,
+            "memory": self.memory.stats() if self.memory is not None else None,
+        }
@@ -0,0 +1,129 @@
+import time
+from contextlib import contextmanager
+from typing import Tuple, Type
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a dependency that keeps failing, then probes it to recover
+
+    Closed: calls go through; `failure_threshold` consecutive failures open
+    the breaker. Open: `allow()` refuses calls for `reset_timeout_seconds`.
+    Half-open: up to `half_open_max_calls` probe calls are let through; a
+    success closes the breaker again and a failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CLOSED
+        self._failures = 0
+        self._probes = 0
+        self._opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; in half-open state this takes a probe slot"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will let a probe through"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout_seconds - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        state = self.state
+        if state == HALF_OPEN:
+            logger.info("Circuit breaker %s closed", self.name)
+        if state != OPEN:
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        state = self.state
+        if state == HALF_OPEN:
+            self.trip()
+        elif state == CLOSED:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self.trip()
+
+    def trip(self):
+        """Open the breaker right away, e.g. when a health check fails"""
+        if self._state != OPEN:
+            self.times_opened += 1
+            logger.warning("Circuit breaker %s opened", self.name)
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._failures = 0
+        self._probes = 0
+
+    def reset(self):
+        """Close the breaker, e.g. after a fresh connection was established"""
+        self._state = CLOSED
+        self._failures = 0
+        self._probes = 0
+
+    def release_probe(self):
+        """Give back a half-open probe slot for a call that ended without a verdict"""
+        if self._state == HALF_OPEN and self._probes:
+            self._probes -= 1
+
+    @contextmanager
+    def track(self, failure_types: Tuple[Type[BaseException], ...] = (Exception,)):
+        """Record the outcome of the wrapped call
+
+        Exceptions of `failure_types` count as failures. Any other exception
+        (e.g. a validation error, or cancellation) says nothing about the
+        dependency's health, so it only frees the probe slot.
+        """
+        try:
+            yield
+        except failure_types:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release_probe()
+            raise
+        else:
+            self.record_success()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after(), 2),
+        }
@@ -1,13 +1,66 @@
 import os
+import asyncio
+import base64
+import copy
+import functools
+import json
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Tuple, TypeVar
 from motor.motor_asyncio import AsyncIOMotorClient
-from models.database_models import UserModel, ResumeModel
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError, PyMongoError
+from models.database_models import UserModel, ResumeModel, ResumeSummaryModel
+from services.cache import LRUCache, LocalSharedCacheTier, TieredCache
+from services.offline_store import OfflineStore
+from services.write_behind import WriteBehindBuffer
+from services.circuit_breaker import CLOSED, CircuitBreaker
+from services.metrics import mongo_pool_metrics
+from services.tracing import current_span, span
+import bson
 from bson import ObjectId
 import logging
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+class InvalidCursor(ValueError):
+    """Raised for a pagination cursor that wasn't produced by encode_cursor"""
+
+class PartialSaveError(Exception):
+    """Raised by save_resumes when only some resumes of a batch were written
+    
+    `resume_ids` has the ID of every resume in input order, None where the
+    insert failed, and `errors` maps those input indexes to the error.
+    """
+    
+    def __init__(self, resume_ids: List[Optional[str]], errors: Dict[int, str]):
+        super().__init__(f"{len(errors)} of {len(resume_ids)} resumes failed to save")
+        self.resume_ids = resume_ids
+        self.errors = errors
+
+def tracks_mongo(method):
+    """Trace a DatabaseService call as a span named after the method
+    
+    The circuit breaker is not fed here: a call may be answered from a
+    cache or the write-behind buffer, so only the driver calls themselves
+    report to it (see DatabaseService._mongo).
+    """
+    span_name = f"db.{method.__name__.lstrip('_')}"
+    
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        backend = "mongodb" if self._mongo_available() else "sqlite"
+        with span(span_name, **{"db.system": backend}):
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+def record_document_size(document: dict):
+    """Put a document's BSON size on the current span, only paying for the encode when traced"""
+    db_span = current_span()
+    if db_span.recording:
+        db_span.set_attribute("db.document_bytes", len(bson.encode(document)))
+
 class DatabaseService:
     def __init__(self):
         # MongoDB connection string - add this to your .env file
@@ -16,69 +69,357 @@ class DatabaseService:
         self.client = None
         self.db = None
         self.connected = False
+        self._index_task = None
+        self._replay_task = None
+        self._probe_task = None
+        # Fail fast instead of waiting out the driver's 30s default when MongoDB is down
+        self.server_selection_timeout_ms = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+        self.health_check_seconds = float(os.getenv("MONGODB_HEALTH_CHECK_SECONDS", "10"))
+        # Open, calls go to the offline store; the health probe closes it again
+        self.breaker = CircuitBreaker(
+            "mongodb",
+            failure_threshold=int(os.getenv("MONGODB_BREAKER_FAILURES", "5")),
+            reset_timeout_seconds=float(os.getenv("MONGODB_BREAKER_RESET_SECONDS", "10"))
+        )
+        self.resume_cache = self._build_resume_cache()
+        # Writes made while MongoDB is unreachable go here and are replayed on reconnect
+        self.offline_store = OfflineStore(os.getenv("OFFLINE_STORE_PATH", "offline_store.db"))
+        self.replay_batch_size = int(os.getenv("OFFLINE_REPLAY_BATCH_SIZE", "500"))
+        # Optionally acknowledge save_resume before the insert and batch the writes
+        self.write_behind = None
+        if os.getenv("DB_WRITE_BEHIND", "0") == "1":
+            self.write_behind = WriteBehindBuffer(
+                self._insert_resume_docs,
+                max_batch=int(os.getenv("DB_WRITE_BEHIND_BATCH_SIZE", "100")),
+                max_delay_seconds=float(os.getenv("DB_WRITE_BEHIND_MAX_DELAY_SECONDS", "0.5")),
+                fallback=self.offline_store.save_resumes
+            )
+        
+    @staticmethod
+    def _build_resume_cache() -> Optional[TieredCache]:
+        """Read-through cache for single-resume lookups
+        
+        RESUME_CACHE_BACKEND picks where entries live: "memory" (per-process
+        LRU), "shared" (a cache every instance sees, so invalidations are
+        visible everywhere) or "none".
+        """
+        backend = os.getenv("RESUME_CACHE_BACKEND", "memory").lower()
+        ttl_seconds = float(os.getenv("RESUME_CACHE_TTL_SECONDS", "60"))
+        if backend == "none" or ttl_seconds <= 0:
+            return None
+        
+        memory = None
+        tier = None
+        if backend == "shared":
+            tier = LocalSharedCacheTier(
+                ttl_seconds=ttl_seconds,
+                max_entries=int(os.getenv("RESUME_CACHE_SHARED_SIZE", "10000"))
+            )
+        else:
+            memory = LRUCache(
+                max_entries=int(os.getenv("RESUME_CACHE_SIZE", "1024")),
+                ttl_seconds=ttl_seconds
+            )
+        return TieredCache(
+            memory,
+            tier=tier,
+            encode=lambda resume: resume.model_dump_json(by_alias=True).encode("utf-8"),
+            decode=lambda data: ResumeModel(**json.loads(data))
+        )
+    
+    @staticmethod
+    def _resume_cache_key(resume_id: str, user_email: str) -> str:
+        return f"{resume_id}:{user_email}"
+    
+    async def _invalidate_resume(self, resume_id: str, user_email: str):
+        if self.resume_cache is not None:
+            await self.resume_cache.delete(self._resume_cache_key(resume_id, user_email))
+        
+    def _mongo_available(self) -> bool:
+        return self.connected and self.breaker.state == CLOSED
+        
+    async def _mongo(self, operation: Awaitable[T]) -> T:
+        """Await a MongoDB driver call, reporting its outcome to the circuit breaker"""
+        with self.breaker.track((ConnectionFailure,)):
+            return await operation
         
     async def connect(self):
         """Connect to MongoDB"""
+        if self.client:
+            self.client.close()
         try:
-            self.client = AsyncIOMotorClient(self.connection_string)
+            self.client = AsyncIOMotorClient(
+                self.connection_string,
+                serverSelectionTimeoutMS=self.server_selection_timeout_ms,
+                event_listeners=[mongo_pool_metrics()]
+            )
             self.db = self.client[self.database_name]
             # Test the connection
             await self.client.admin.command('ping')
             self.connected = True
+            self.breaker.reset()
             logger.info("Successfully connected to MongoDB")
+            # Build indexes in the background so startup isn't held up
+            self._index_task = asyncio.create_task(self.ensure_indexes())
+            self._start_replay()
         except Exception as e:
-            logger.warning(f"Failed to connect to MongoDB: {e}. Running in offline mode.")
+            logger.warning("Failed to connect to MongoDB: %s. Running in offline mode.", e)
             self.connected = False
         
+    def _start_replay(self):
+        if self.offline_store.exists() and (self._replay_task is None or self._replay_task.done()):
+            self._replay_task = asyncio.create_task(self.replay_offline_writes())
+        
+    def start_health_probe(self):
+        """Keep checking MongoDB in the background, reconnecting and closing the breaker when it's back"""
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_loop())
+        
+    async def _probe_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_seconds)
+            try:
+                await self.probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("MongoDB health probe failed unexpectedly: %s", e)
+        
+    async def probe(self):
+        """One health check: reconnect if offline, otherwise ping and update the breaker"""
+        if not self.connected:
+            await self.connect()
+            return
+        
+        if not self.breaker.allow():
+            # Open and still cooling down
+            return
+        was_closed = self.breaker.state == CLOSED
+        try:
+            await self.client.admin.command('ping')
+        except PyMongoError as e:
+            if was_closed:
+                logger.warning("MongoDB health check failed: %s", e)
+            self.breaker.trip()
+            return
+        except BaseException:
+            # Any other error (or cancellation) says nothing about MongoDB,
+            # but the half-open probe slot must not stay taken
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        if not was_closed:
+            logger.info("MongoDB is reachable again")
+            self._start_replay()
+        
+    async def ensure_indexes(self):
+        """Create the indexes the query patterns rely on (idempotent)"""
+        indexes = {
+            # Login looks users up by email, and there must only be one per email
+            "users": [
+                IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+            ],
+            # Dashboard listing: filter by owner and active flag, newest first,
+            # with _id as the keyset pagination tie-breaker.
+            # Lookups by _id + user_email are served by the built-in _id index.
+            "resumes": [
+                IndexModel(
+                    [("user_email", ASCENDING), ("is_active", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)],
+                    name="user_active_updated_id"
+                ),
+            ],
+        }
+        
+        for collection_name, models in indexes.items():
+            for model in models:
+                name = model.document["name"]
+                try:
+                    logger.info("Ensuring index %s.%s", collection_name, name)
+                    await self.db[collection_name].create_indexes([model])
+                    logger.info("Index %s.%s is ready", collection_name, name)
+                except PyMongoError as e:
+                    # e.g. existing duplicate emails prevent the unique index
+                    logger.error("Failed to create index %s.%s: %s", collection_name, name, e)
+        
+    async def replay_offline_writes(self) -> int:
+        """Copy everything written to the offline store into MongoDB, in batches
+        
+        Replayed rows are removed from the offline store. Documents Mongo
+        rejects are moved to its dead letter table so one bad document can't
+        hold up the rest; anything else that fails stays there for the next
+        connect. Returns the number of documents replayed.
+        """
+        replayed = 0
+        try:
+            while True:
+                pending = await self.offline_store.pending_users(self.replay_batch_size)
+                if not pending:
+                    break
+                operations = []
+                for user_doc, _ in pending:
+                    update = {"$setOnInsert": {"_id": user_doc["_id"], "name": user_doc["name"], "created_at": user_doc["created_at"]}}
+                    if user_doc["last_login"]:
+                        update["$max"] = {"last_login": user_doc["last_login"]}
+                    operations.append(UpdateOne({"email": user_doc["email"]}, update, upsert=True))
+                failed = await self._replay_batch(self.db.users, operations)
+                await self.offline_store.mark_users_replayed([
+                    (user_doc["email"], version) for index, (user_doc, version) in enumerate(pending) if index not in failed
+                ])
+                if failed:
+                    logger.error("MongoDB rejected %d offline users; moved them to the dead letter table", len(failed))
+                    await self.offline_store.dead_letter_users([
+                        (pending[index][0]["email"], pending[index][1], error) for index, error in failed.items()
+                    ])
+                replayed += len(pending) - len(failed)
+            
+            while True:
+                pending = await self.offline_store.pending_resumes(self.replay_batch_size)
+                if not pending:
+                    break
+                failed = await self._replay_batch(
+                    self.db.resumes,
+                    [ReplaceOne({"_id": resume_doc["_id"]}, resume_doc, upsert=True) for resume_doc, _ in pending]
+                )
+                await self.offline_store.mark_resumes_replayed([
+                    (str(resume_doc["_id"]), version) for index, (resume_doc, version) in enumerate(pending) if index not in failed
+                ])
+                if failed:
+                    logger.error("MongoDB rejected %d offline resumes; moved them to the dead letter table", len(failed))
+                    await self.offline_store.dead_letter_resumes([
+                        (str(pending[index][0]["_id"]), pending[index][1], error) for index, error in failed.items()
+                    ])
+                for resume_doc, _ in pending:
+                    await self._invalidate_resume(str(resume_doc["_id"]), resume_doc["user_email"])
+                replayed += len(pending) - len(failed)
+        except PyMongoError as e:
+            logger.warning("Replaying offline writes stopped after %d documents: %s", replayed, e)
+        
+        if replayed:
+            logger.info("Replayed %d offline writes to MongoDB", replayed)
+        return replayed
+    
+    @staticmethod
+    async def _replay_batch(collection, operations: list) -> Dict[int, str]:
+        """Run one unordered replay batch, returning the operations Mongo rejected by index
+        
+        Errors that aren't about particular documents (connection, write
+        concern) are raised and stop the replay.
+        """
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg", "") for error in e.details.get("writeErrors", [])}
+            if not failed:
+                raise
+            return failed
+        return {}
+        
     async def disconnect(self):
         """Disconnect from MongoDB"""
+        for task in (self._probe_task, self._index_task, self._replay_task):
+            if task and not task.done():
+                task.cancel()
+        if self.write_behind is not None:
+            # Don't lose acknowledged resumes on shutdown
+            await self.write_behind.close()
+        self.offline_store.close()
         if self.client:
             self.client.close()
             self.connected = False
       # User operations
+    @tracks_mongo
     async def create_or_get_user(self, email: str, name: str) -> UserModel:
         """Create a new user or get existing user"""
-        if not self.connected:
-            # Return a mock user for offline mode
-            return UserModel(
-                id=ObjectId(),
-                email=email,
-                name=name,
-                created_at=datetime.utcnow(),
-                last_login=datetime.utcnow()
-            )
+        if not self._mongo_available():
+            return UserModel(**await self.offline_store.create_or_get_user(email, name))
+            
+        users_collection = self.db.users
+        
+        # One atomic round trip: update last_login, or insert the user if new
+        query = {"email": email}
+        update = {
+            "$set": {"last_login": datetime.utcnow()},
+            "$setOnInsert": {"name": name, "created_at": datetime.utcnow()}
+        }
+        try:
+            user_doc = await self._mongo(users_collection.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER
+            ))
+        except DuplicateKeyError:
+            # A concurrent first login inserted the user; now it's a plain update
+            user_doc = await self._mongo(users_collection.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER
+            ))
+        return UserModel(**user_doc)
+    
+    @tracks_mongo
+    async def create_or_get_users(self, users: List[Tuple[str, str]]) -> List[UserModel]:
+        """Batched create_or_get_user for bulk onboarding, given (email, name) pairs"""
+        if not users:
+            return []
+        
+        if not self._mongo_available():
+            return [UserModel(**user_doc) for user_doc in await self.offline_store.create_or_get_users(users)]
             
         users_collection = self.db.users
         
-        # Check if user exists
-        existing_user = await users_collection.find_one({"email": email})
-        if existing_user:
-            # Update last login
-            await users_collection.update_one(
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
                 {"email": email},
-                {"$set": {"last_login": datetime.utcnow()}}
+                {"$setOnInsert": {"name": name, "created_at": now, "last_login": None}},
+                upsert=True
             )
-            return UserModel(**existing_user)
-        
-        # Create new user
-        user_data = {
-            "email": email,
-            "name": name,
-            "created_at": datetime.utcnow(),
-            "last_login": datetime.utcnow()
-        }
+            for email, name in users
+        ]
+        try:
+            await self._mongo(users_collection.bulk_write(operations, ordered=False))
+        except BulkWriteError as e:
+            # Duplicate key errors only mean a concurrent insert won the race
+            other_errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != 11000]
+            if other_errors:
+                raise
         
-        result = await users_collection.insert_one(user_data)
-        user_data["id"] = result.inserted_id
-        return UserModel(**user_data)
+        emails = [email for email, _ in users]
+        user_docs = await self._mongo(users_collection.find({"email": {"$in": emails}}).to_list(length=len(emails)))
+        by_email = {user_doc["email"]: user_doc for user_doc in user_docs}
+        return [UserModel(**by_email[email]) for email in emails if email in by_email]
     
     # Resume operations
+    @tracks_mongo
     async def save_resume(self, user_email: str, resume_data: dict, title: str, pdf_url: str = None) -> str:
-        """Save a resume to the database"""
-        if not self.connected:
-            # Return a mock resume ID for offline mode
-            logger.warning("Database not connected. Resume not saved.")
-            return str(ObjectId())
+        """Save a resume to the database
+        
+        With write-behind enabled the ID is allocated here and the insert
+        happens in a later batch. Until then the resume can be fetched and
+        updated by ID but does not show up in listings.
+        """
+        if self.write_behind is not None:
+            now = datetime.utcnow()
+            resume_id = ObjectId()
+            resume_doc = {
+                "_id": resume_id,
+                "user_email": user_email,
+                # The batch is written later, so the caller's dict may have changed by then
+                "resume_data": copy.deepcopy(resume_data),
+                "pdf_url": pdf_url,
+                "title": title,
+                "created_at": now,
+                "updated_at": now,
+                "is_active": True
+            }
+            record_document_size(resume_doc)
+            # Only the in-process buffer is written here
+            current_span().set_attributes({"db.system": "write_behind", "db.write_behind": True})
+            await self.write_behind.add(str(resume_id), resume_doc)
+            return str(resume_id)
+        
+        if not self._mongo_available():
+            logger.warning("MongoDB unavailable. Saving resume to the offline store.")
+            resume_ids = await self.offline_store.save_resumes([
+                {"user_email": user_email, "resume_data": resume_data, "title": title, "pdf_url": pdf_url}
+            ])
+            return resume_ids[0]
             
         resumes_collection = self.db.resumes
         
@@ -91,15 +432,82 @@ class DatabaseService:
             "updated_at": datetime.utcnow(),
             "is_active": True
         }
+        record_document_size(resume_doc)
         
-        result = await resumes_collection.insert_one(resume_doc)
+        result = await self._mongo(resumes_collection.insert_one(resume_doc))
         return str(result.inserted_id)
+    
+    @tracks_mongo
+    async def _insert_resume_docs(self, resume_docs: List[dict]):
+        """Write a write-behind batch; documents carry their own _id"""
+        if not self._mongo_available():
+            await self.offline_store.save_resumes(resume_docs)
+            return
+        try:
+            await self._mongo(self.db.resumes.insert_many(resume_docs, ordered=False))
+        except BulkWriteError as e:
+            # A retried batch may be partly written already; those IDs are duplicates
+            other_errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != 11000]
+            if other_errors:
+                raise
+        
+    @tracks_mongo
+    async def save_resumes(self, resumes: List[dict]) -> List[str]:
+        """Save many resumes with one batched insert
+        
+        Each item has the same keys as save_resume's arguments: user_email,
+        resume_data, title and optionally pdf_url. IDs are returned in order.
+        If only part of the batch is written, PartialSaveError says which
+        resumes were saved.
+        """
+        if not resumes:
+            return []
+        
+        if not self._mongo_available():
+            logger.warning("MongoDB unavailable. Saving resumes to the offline store.")
+            return await self.offline_store.save_resumes(resumes)
+            
+        resumes_collection = self.db.resumes
+        
+        now = datetime.utcnow()
+        resume_docs = [
+            {
+                # Allocated here so a partly failed batch can report what was inserted
+                "_id": ObjectId(),
+                "user_email": resume["user_email"],
+                "resume_data": resume["resume_data"],
+                "pdf_url": resume.get("pdf_url"),
+                "title": resume["title"],
+                "created_at": now,
+                "updated_at": now,
+                "is_active": True
+            }
+            for resume in resumes
+        ]
+        
+        try:
+            await self._mongo(resumes_collection.insert_many(resume_docs, ordered=False))
+        except BulkWriteError as e:
+            errors = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+            if not errors:
+                raise
+            raise PartialSaveError(
+                [None if index in errors else str(resume_doc["_id"]) for index, resume_doc in enumerate(resume_docs)],
+                errors
+            ) from e
+        return [str(resume_doc["_id"]) for resume_doc in resume_docs]
+    
+    @tracks_mongo
     async def get_user_resumes(self, user_email: str) -> List[ResumeModel]:
         """Get all resumes for a user"""
-        if not self.connected:
-            # Return empty list for offline mode
-            logger.warning("Database not connected. Cannot retrieve resumes.")
-            return []
+        return [resume async for resume in self.iter_user_resumes(user_email)]
+    
+    async def iter_user_resumes(self, user_email: str) -> AsyncIterator[ResumeModel]:
+        """Iterate over a user's resumes with a cursor instead of loading them all at once"""
+        if not self._mongo_available():
+            for resume_doc in await self.offline_store.list_resumes(user_email):
+                yield ResumeModel(**resume_doc)
+            return
             
         resumes_collection = self.db.resumes
         
@@ -107,68 +515,169 @@ class DatabaseService:
             {"user_email": user_email, "is_active": True}
         ).sort("updated_at", -1)
         
-        resumes = []
-        async for resume_doc in cursor:
-            resume_doc["id"] = resume_doc["_id"]
-            resumes.append(ResumeModel(**resume_doc))
+        with self.breaker.track((ConnectionFailure,)):
+            async for resume_doc in cursor:
+                resume_doc["id"] = resume_doc["_id"]
+                yield ResumeModel(**resume_doc)
+    
+    @staticmethod
+    def encode_cursor(updated_at: datetime, resume_id: ObjectId) -> str:
+        """Opaque pagination token for the position after a listed resume"""
+        position = json.dumps({"u": updated_at.isoformat(), "i": str(resume_id)})
+        return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+        """Inverse of encode_cursor; raises InvalidCursor for malformed tokens"""
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return datetime.fromisoformat(position["u"]), ObjectId(position["i"])
+        except Exception as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    
+    @tracks_mongo
+    async def list_user_resumes(self, user_email: str, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[ResumeSummaryModel], Optional[str]]:
+        """List resume metadata newest first, one keyset-paginated page at a time
+        
+        Returns the page and the cursor for the next page (None on the last
+        page). Only id, title and timestamps are read from MongoDB.
+        """
+        position = self.decode_cursor(cursor) if cursor else None
+        
+        # Fetch one extra document to know whether another page exists
+        if not self._mongo_available():
+            docs = await self.offline_store.list_resumes(user_email, limit=limit + 1, after=position)
+        else:
+            query = {"user_email": user_email, "is_active": True}
+            if position:
+                updated_at, resume_id = position
+                # Strictly after the cursor position in (updated_at desc, _id desc) order
+                query["$or"] = [
+                    {"updated_at": {"$lt": updated_at}},
+                    {"updated_at": updated_at, "_id": {"$lt": resume_id}},
+                ]
+            
+            docs = await self._mongo(self.db.resumes.find(
+                query,
+                {"title": 1, "created_at": 1, "updated_at": 1}
+            ).sort([("updated_at", -1), ("_id", -1)]).limit(limit + 1).to_list(length=limit + 1))
         
-        return resumes
+        page = [ResumeSummaryModel(**doc) for doc in docs[:limit]]
+        next_cursor = None
+        if len(docs) > limit:
+            last = page[-1]
+            next_cursor = self.encode_cursor(last.updated_at, last.id)
+        return page, next_cursor
+    
+    async def _update_pending_resume(self, resume_id: str, user_email: str, update_data: dict) -> bool:
+        """Apply an update to a resume still waiting in the write-behind buffer"""
+        if self.write_behind is None:
+            return False
+        pending = self.write_behind.get(resume_id)
+        if pending is None or pending["user_email"] != user_email:
+            return False
+        return await self.write_behind.update(resume_id, update_data)
     
+    @tracks_mongo
     async def get_resume_by_id(self, resume_id: str, user_email: str) -> Optional[ResumeModel]:
         """Get a specific resume by ID"""
-        if not self.connected:
-            # Return None for offline mode
-            logger.warning("Database not connected. Cannot retrieve resume.")
-            return None
+        if self.write_behind is not None:
+            pending = self.write_behind.get(resume_id)
+            if pending is not None:
+                if pending["user_email"] == user_email and pending["is_active"]:
+                    return ResumeModel(**copy.deepcopy(pending))
+                return None
+            
+        if not self._mongo_available():
+            resume_doc = await self.offline_store.get_resume(resume_id, user_email)
+            return ResumeModel(**resume_doc) if resume_doc else None
+            
+        cache_key = self._resume_cache_key(resume_id, user_email)
+        if self.resume_cache is not None:
+            cached = await self.resume_cache.get(cache_key)
+            current_span().set_attribute("db.cache_hit", cached is not None)
+            if cached is not None:
+                # Callers may modify what they get back, so never hand out the cached instance
+                return cached.model_copy(deep=True)
             
         resumes_collection = self.db.resumes
         
-        resume_doc = await resumes_collection.find_one({
+        resume_doc = await self._mongo(resumes_collection.find_one({
             "_id": ObjectId(resume_id),
             "user_email": user_email,
             "is_active": True
-        })
+        }))
         
         if resume_doc:
             resume_doc["id"] = resume_doc["_id"]
-            return ResumeModel(**resume_doc)
+            resume = ResumeModel(**resume_doc)
+            # Misses aren't cached, so a resume is visible as soon as it is saved
+            if self.resume_cache is not None:
+                await self.resume_cache.set(cache_key, resume.model_copy(deep=True))
+            return resume
         return None
     
+    @tracks_mongo
     async def update_resume(self, resume_id: str, user_email: str, resume_data: dict, title: str = None) -> bool:
         """Update an existing resume"""
-        if not self.connected:
-            # Return False for offline mode
-            logger.warning("Database not connected. Cannot update resume.")
-            return False
-            
-        resumes_collection = self.db.resumes
-        
         update_data = {
             "resume_data": resume_data,
+            # Any stored PDF was rendered from the old content
+            "pdf_url": None,
             "updated_at": datetime.utcnow()
         }
         
         if title:
             update_data["title"] = title
         
-        result = await resumes_collection.update_one(
+        if await self._update_pending_resume(resume_id, user_email, update_data):
+            return True
+        
+        if not self._mongo_available():
+            # Only resumes saved while offline can be changed until MongoDB is back
+            return await self.offline_store.update_resume(resume_id, user_email, update_data)
+            
+        result = await self._mongo(self.db.resumes.update_one(
             {"_id": ObjectId(resume_id), "user_email": user_email},
             {"$set": update_data}
-        )
+        ))
+        await self._invalidate_resume(resume_id, user_email)
+        return result.modified_count > 0
+    
+    @tracks_mongo
+    async def set_resume_pdf_url(self, resume_id: str, user_email: str, pdf_url: str) -> bool:
+        """Record where the rendered PDF for a resume is stored"""
+        if await self._update_pending_resume(resume_id, user_email, {"pdf_url": pdf_url}):
+            return True
+        
+        if not self._mongo_available():
+            return await self.offline_store.update_resume(resume_id, user_email, {"pdf_url": pdf_url})
+            
+        resumes_collection = self.db.resumes
+        
+        result = await self._mongo(resumes_collection.update_one(
+            {"_id": ObjectId(resume_id), "user_email": user_email},
+            {"$set": {"pdf_url": pdf_url}}
+        ))
+        await self._invalidate_resume(resume_id, user_email)
         return result.modified_count > 0
     
+    @tracks_mongo
     async def delete_resume(self, resume_id: str, user_email: str) -> bool:
         """Soft delete a resume"""
-        if not self.connected:
-            # Return False for offline mode
-            logger.warning("Database not connected. Cannot delete resume.")
-            return False
+        update_data = {"is_active": False, "updated_at": datetime.utcnow()}
+        if await self._update_pending_resume(resume_id, user_email, update_data):
+            return True
+        
+        if not self._mongo_available():
+            return await self.offline_store.update_resume(resume_id, user_email, update_data)
             
         resumes_collection = self.db.resumes
         
-        result = await resumes_collection.update_one(
+        result = await self._mongo(resumes_collection.update_one(
             {"_id": ObjectId(resume_id), "user_email": user_email},
-            {"$set": {"is_active": False, "updated_at": datetime.utcnow()}}
-        )
+            {"$set": update_data}
+        ))
         
+        await self._invalidate_resume(resume_id, user_email)
         return result.modified_count > 0
@@ -0,0 +1,210 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from pymongo import ReturnDocument
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class InMemoryJobStore:
+    """Job store local to this process; jobs are lost on restart"""
+
+    def __init__(self, retention_seconds: float = 3600):
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, dict] = {}
+
+    def _prune(self):
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.get("finished_at") and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def create(self, job: dict):
+        self._prune()
+        self._jobs[job["_id"]] = job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def claim(self, job_id: Optional[str] = None) -> Optional[dict]:
+        """Move a queued job (a specific one, or the oldest) to running and return it"""
+        if job_id is not None:
+            candidates = [self._jobs[job_id]] if job_id in self._jobs else []
+        else:
+            candidates = sorted(self._jobs.values(), key=lambda job: job["created_at"])
+        for job in candidates:
+            if job["status"] == QUEUED:
+                job["status"] = RUNNING
+                job["started_at"] = datetime.utcnow()
+                return dict(job)
+        return None
+
+    async def finish(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        job = self._jobs.get(job_id)
+        if job:
+            job.update(status=status, result=result, error=error, finished_at=datetime.utcnow())
+
+    async def requeue_stale(self, older_than: datetime) -> int:
+        return 0
+
+    async def interrupt(self, job_id: str):
+        """A worker was cancelled mid-run; nothing outlives this process, so the job fails"""
+        await self.finish(job_id, FAILED, error="Interrupted by shutdown")
+
+
+class MongoJobStore:
+    """Persistent job store in a MongoDB collection, shared by every app instance"""
+
+    def __init__(self, collection, retention_seconds: float = 86400):
+        self.collection = collection
+        self.retention_seconds = retention_seconds
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([("status", 1), ("created_at", 1)])
+        await self.collection.create_index("finished_at", expireAfterSeconds=int(self.retention_seconds))
+
+    async def create(self, job: dict):
+        await self.collection.insert_one(job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"_id": job_id})
+
+    async def claim(self, job_id: Optional[str] = None) -> Optional[dict]:
+        """Atomically move a queued job (a specific one, or the oldest) to running"""
+        query = {"status": QUEUED}
+        if job_id is not None:
+            query["_id"] = job_id
+        return await self.collection.find_one_and_update(
+            query,
+            {"$set": {"status": RUNNING, "started_at": datetime.utcnow()}},
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def finish(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        await self.collection.update_one(
+            {"_id": job_id},
+            {"$set": {"status": status, "result": result, "error": error, "finished_at": datetime.utcnow()}}
+        )
+
+    async def requeue_stale(self, older_than: datetime) -> int:
+        """Put back jobs whose worker died mid-run (e.g. the process was restarted)"""
+        result = await self.collection.update_many(
+            {"status": RUNNING, "started_at": {"$lt": older_than}},
+            {"$set": {"status": QUEUED}}
+        )
+        return result.modified_count
+
+    async def interrupt(self, job_id: str):
+        """A worker was cancelled mid-run; the job stays running and requeue_stale picks it up"""
+
+
+class JobQueue:
+    """Background job runner with in-process asyncio workers
+
+    Submitting a job stores it and wakes a local worker right away. Idle
+    workers also poll the store, so with a shared store (Mongo) jobs
+    submitted by other instances or left over from a restart get picked up
+    too.
+    """
+
+    def __init__(self, store=None, workers: int = 2, poll_seconds: float = 5.0, stale_seconds: float = 600.0):
+        self.store = store or InMemoryJobStore()
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self._handlers: Dict[str, Callable[[dict], Awaitable[dict]]] = {}
+        self._wakeups: asyncio.Queue = asyncio.Queue()
+        self._tasks = []
+
+    def register(self, kind: str, handler: Callable[[dict], Awaitable[dict]]):
+        """Register the coroutine that runs jobs of `kind`; it returns the job result"""
+        self._handlers[kind] = handler
+
+    async def start(self):
+        if hasattr(self.store, "ensure_indexes"):
+            await self.store.ensure_indexes()
+        requeued = await self.store.requeue_stale(datetime.utcnow() - timedelta(seconds=self.stale_seconds))
+        if requeued:
+            logger.info("Requeued %d stale jobs", requeued)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, payload: dict) -> str:
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        await self.store.create({
+            "_id": job_id,
+            "kind": kind,
+            "payload": payload,
+            "status": QUEUED,
+            "result": None,
+            "error": None,
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None,
+        })
+        self._wakeups.put_nowait(job_id)
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self.store.get(job_id)
+
+    async def _next_job(self) -> Optional[dict]:
+        try:
+            job_id = await asyncio.wait_for(self._wakeups.get(), timeout=self.poll_seconds)
+        except asyncio.TimeoutError:
+            job_id = None
+        return await self.store.claim(job_id)
+
+    async def _worker(self):
+        while True:
+            try:
+                job = await self._next_job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Job store unavailable: %s", e)
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            if job is None:
+                continue
+
+            handler = self._handlers.get(job["kind"])
+            try:
+                if handler is None:
+                    raise ValueError(f"No handler registered for job kind: {job['kind']}")
+                result = await handler(job["payload"])
+                await self.store.finish(job["_id"], SUCCEEDED, result=result)
+            except asyncio.CancelledError:
+                # Shutting down: the store decides whether the job fails or is requeued later
+                await self.store.interrupt(job["_id"])
+                raise
+            except Exception as e:
+                logger.warning("Job %s failed: %s", job['_id'], e)
+                await self.store.finish(job["_id"], FAILED, error=str(e))
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "store": type(self.store).__name__,
+            "pending_wakeups": self._wakeups.qsize(),
+        }
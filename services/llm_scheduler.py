@@ -0,0 +1,241 @@
+import asyncio
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Mapping, Optional
+
+import groq
+from services.circuit_breaker import OPEN
+from services.tracing import current_span
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerOverloaded(Exception):
+    """Raised when an LLM call cannot be admitted or keeps getting rate limited"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse Groq reset headers such as '7.66s', '2m59.56s' or '120ms' into seconds"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        matched = True
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total if matched else None
+
+
+class TokenBucket:
+    """Continuously refilling budget of requests or tokens per minute
+
+    The bucket starts from a configured per-minute capacity and refills at
+    capacity/60 per second. It can be corrected from the limit/remaining
+    values the API reports for the same per-minute window.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.available = per_minute
+        self.refill_per_second = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be consumed"""
+        self._refill()
+        # Requests larger than the bucket only wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return 60.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self._refill()
+        self.available -= amount
+
+    def update(self, limit: Optional[float], remaining: Optional[float]):
+        """Sync the bucket with per-minute rate limit values reported by the API"""
+        self._refill()
+        if limit:
+            self.capacity = limit
+            self.refill_per_second = limit / 60.0
+        if remaining is not None:
+            self.available = min(self.capacity, remaining)
+
+
+class LLMScheduler:
+    """Admission control, rate limiting and retries in front of the LLM client
+
+    At most `max_concurrency` calls run at once and at most `max_queue` more
+    may wait for a slot, each for no longer than `max_wait_seconds`. Calls are
+    paced by per-minute request and token buckets, the latter corrected from
+    Groq's rate limit headers, and 429/5xx/connection errors are retried with
+    jittered exponential backoff. Anything that cannot be served within those bounds fails fast with
+    SchedulerOverloaded, which carries a Retry-After hint. An optional
+    circuit breaker also fails calls fast while the provider is down.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_queue: int = 32,
+        max_wait_seconds: float = 30.0,
+        max_retries: int = 3,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 6000,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 10.0,
+        breaker=None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.breaker = breaker
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.waiting = 0
+        self.running = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def ensure_capacity(self):
+        """Fail fast if a new call would not even be allowed to queue"""
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise SchedulerOverloaded("LLM request queue is full", self._queue_retry_after())
+        if self.breaker is not None and self.breaker.state == OPEN:
+            self.rejected += 1
+            raise SchedulerOverloaded("LLM provider is unavailable", self.breaker.retry_after())
+
+    def _queue_retry_after(self) -> float:
+        return max(self.requests.wait_time(1), self.tokens.wait_time(1), 1.0)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retries from synchronizing across requests
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** attempt)))
+
+    def _update_from_headers(self, headers: Mapping[str, str]):
+        # Groq's *-requests headers count requests per day, so they would
+        # overwrite the per-minute request bucket; only tokens are per minute
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers[name])
+            except (KeyError, TypeError, ValueError):
+                return None
+
+        self.tokens.update(
+            number("x-ratelimit-limit-tokens"),
+            number("x-ratelimit-remaining-tokens"),
+        )
+
+    async def submit(self, call: Callable[[], Awaitable[Any]], estimated_tokens: int, hold_slot: bool = False) -> Any:
+        """Run `call` under admission control; it must return a raw response with headers
+
+        With `hold_slot` the concurrency slot stays taken after a successful
+        call, e.g. while a streamed response is read, and the caller must
+        call release_slot() when it is done with the response.
+        """
+        self.ensure_capacity()
+
+        deadline = time.monotonic() + self.max_wait_seconds
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise SchedulerOverloaded("Timed out waiting for an LLM slot", self._queue_retry_after())
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        release = True
+        try:
+            if self.breaker is None:
+                response = await self._run_with_retries(call, estimated_tokens, deadline)
+            else:
+                if not self.breaker.allow():
+                    self.rejected += 1
+                    raise SchedulerOverloaded("LLM provider is unavailable", self.breaker.retry_after())
+                # Only errors left after retries say the provider is down; 429s and 4xx don't
+                with self.breaker.track((groq.InternalServerError, groq.APIConnectionError)):
+                    response = await self._run_with_retries(call, estimated_tokens, deadline)
+            release = not hold_slot
+            return response
+        finally:
+            if release:
+                self.release_slot()
+
+    def release_slot(self):
+        """Give back a concurrency slot taken by submit(hold_slot=True)"""
+        self.running -= 1
+        self._slots.release()
+
+    async def _run_with_retries(self, call: Callable[[], Awaitable[Any]], estimated_tokens: int, deadline: float) -> Any:
+        attempt = 0
+        while True:
+            # Pace the call against the request and token budgets
+            delay = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+            if delay > 0:
+                if time.monotonic() + delay > deadline:
+                    self.rejected += 1
+                    raise SchedulerOverloaded("LLM rate limit budget exhausted", delay)
+                await asyncio.sleep(delay)
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+
+            try:
+                response = await call()
+                self._update_from_headers(response.headers)
+                return response
+            except groq.RateLimitError as e:
+                self._update_from_headers(e.response.headers)
+                retry_after = parse_reset_duration(e.response.headers.get("retry-after")) or self._backoff(attempt)
+                if attempt >= self.max_retries or time.monotonic() + retry_after > deadline:
+                    self.rejected += 1
+                    raise SchedulerOverloaded("LLM provider is rate limiting requests", retry_after)
+                logger.warning("Groq rate limited the request, retrying in %.2fs", retry_after)
+            except (groq.InternalServerError, groq.APIConnectionError) as e:
+                # APITimeoutError is a subclass of APIConnectionError
+                retry_after = self._backoff(attempt)
+                if attempt >= self.max_retries or time.monotonic() + retry_after > deadline:
+                    raise
+                logger.warning("Groq request failed (%s), retrying in %.2fs", e, retry_after)
+
+            attempt += 1
+            self.retries += 1
+            current_span().set_attribute("llm.retries", attempt)
+            await asyncio.sleep(retry_after)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "requests_available": round(self.requests.available, 2),
+            "tokens_available": round(self.tokens.available, 2),
+        }
@@ -0,0 +1,246 @@
+import atexit
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from services.tracing import request_id_var, request_path_var
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Candidate digit runs; _redact_phone checks the digit count and grouping
+_PHONE = re.compile(r"(?<![\w.:/-])\+?\(?\d[\d\s().-]{6,}\d(?![\w.:/])")
+_DECIMAL = re.compile(r"\d+\.\d+")
+_DIGIT_GROUP = re.compile(r"\d+")
+
+# Chatty client libraries; groq's debug output includes whole prompts
+LIBRARY_LOGGERS = ("groq", "httpx", "httpcore", "pymongo", "asyncio")
+
+# Extra fields that hold personal data whatever their value looks like
+PII_FIELDS = frozenset({"name", "email", "user_email", "phone"})
+
+# LogRecord attributes that aren't caller supplied extras
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "taskName", "request_id", "http_path",
+}
+
+
+def _redact_email(match: re.Match) -> str:
+    # Stable per address, so one user's lines can still be followed
+    digest = hashlib.sha256(match.group(0).lower().encode("utf-8")).hexdigest()[:8]
+    return f"<email:{digest}>"
+
+
+def _redact_phone(match: re.Match) -> str:
+    text = match.group(0)
+    digits = sum(character.isdigit() for character in text)
+    if not 9 <= digits <= 15 or _DECIMAL.fullmatch(text):
+        return text
+    if not text.startswith("+") and ")" not in text:
+        # Without a country code or area code parentheses, only numbers split
+        # into groups ending in 4+ digits (555-123-4567, 98765 43210) look
+        # like phones; byte counts, IDs and evenly grouped numbers don't
+        groups = _DIGIT_GROUP.findall(text)
+        if len(groups) < 2 or len(groups[-1]) < 4:
+            return text
+    return "<phone>"
+
+
+def redact(text: str) -> str:
+    """Mask email addresses and phone numbers in free text"""
+    if "@" in text:
+        text = _EMAIL.sub(_redact_email, text)
+    return _PHONE.sub(_redact_phone, text)
+
+
+def _redact_field(key: str, value):
+    if key in PII_FIELDS and value:
+        return "<redacted>"
+    if isinstance(value, str):
+        return redact(value)
+    return value
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with request context, extras and PII masked"""
+
+    def __init__(self, redact_pii: bool = True):
+        super().__init__()
+        self.redact_pii = redact_pii
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(message) if self.redact_pii else message,
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+            # Some paths carry the user's email, e.g. /user/{email}/resumes
+            path = record.http_path
+            entry["path"] = redact(path) if self.redact_pii and path else path
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = _redact_field(key, value) if self.redact_pii else value
+        if record.exc_info:
+            exception = self.formatException(record.exc_info)
+            entry["exception"] = redact(exception) if self.redact_pii else exception
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human readable lines for local development, with PII masked"""
+
+    def __init__(self, redact_pii: bool = True):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+        self.redact_pii = redact_pii
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        text = super().format(record)
+        return redact(text) if self.redact_pii else text
+
+
+class RequestContextFilter(logging.Filter):
+    """Tags records with the current request and samples routine ones per route
+
+    `sample_rates` maps path prefixes to the fraction of requests whose
+    DEBUG/INFO records are kept; warnings and errors are always kept. The
+    decision is made per request ID, so a kept request keeps all its lines.
+    """
+
+    def __init__(self, sample_rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        # Longest prefix first, so /resume/x/pdf can differ from /resume
+        self.sample_rates = sorted((sample_rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.sampled_out = 0
+
+    def _sample_rate(self, path: str) -> float:
+        for prefix, rate in self.sample_rates:
+            if path.startswith(prefix):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = request_id_var.get()
+        path = request_path_var.get()
+        record.request_id = request_id
+        record.http_path = path
+        if record.levelno >= logging.WARNING or not self.sample_rates or request_id is None:
+            return True
+        rate = self._sample_rate(path or "")
+        if rate >= 1 or zlib.crc32(request_id.encode("utf-8")) / 0xFFFFFFFF < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread without formatting or blocking
+
+    The stock QueueHandler formats each message in the calling thread; here
+    that happens in the listener, so arguments must not be mutated after
+    they are logged. When the queue is full the record is dropped and
+    counted rather than stalling the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse "/download-pdf=0.1,/generate-resume=0.5" into {path prefix: rate}"""
+    rates = {}
+    for part in value.split(","):
+        prefix, _, rate = part.strip().partition("=")
+        if prefix:
+            rates[prefix] = float(rate or 1)
+    return rates
+
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_filter: Optional[RequestContextFilter] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging():
+    """Route all logging through a queue to one stderr writer, configured by LOG_* variables
+
+    LOG_LEVEL (default INFO), LOG_LIBRARY_LEVEL for client libraries
+    (default WARNING), LOG_FORMAT "json" (default) or "text",
+    LOG_SAMPLE_RATES per-route sampling of DEBUG/INFO lines, LOG_REDACT_PII
+    (default 1) and LOG_QUEUE_SIZE.
+    """
+    global _handler, _filter, _listener
+    if _listener is not None:
+        return
+
+    redact_pii = os.getenv("LOG_REDACT_PII", "1") == "1"
+    if os.getenv("LOG_FORMAT", "json") == "text":
+        formatter = TextFormatter(redact_pii)
+    else:
+        formatter = JSONFormatter(redact_pii)
+    # Neither format prints these, so don't look them up for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(formatter)
+
+    _handler = NonBlockingQueueHandler(queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000"))))
+    _filter = RequestContextFilter(parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "")))
+    _handler.addFilter(_filter)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    # Records below this level are never created, so debug calls on hot paths cost one check
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    library_level = os.getenv("LOG_LIBRARY_LEVEL", "WARNING").upper()
+    for name in LIBRARY_LOGGERS:
+        logging.getLogger(name).setLevel(library_level)
+
+    _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> dict:
+    if _handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "queued": _handler.queue.qsize(),
+        "dropped": _handler.dropped,
+        "sampled_out": _filter.sampled_out,
+    }
@@ -0,0 +1,298 @@
+import bisect
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import monitoring
+
+# Stage timers are the only instrumentation on hot paths; METRICS_ENABLED=0 turns them into no-ops
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (labels, value) pairs for one metric
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class Counter:
+    """Monotonically increasing value, optionally split by labels
+
+    Updates take a lock: MongoDB pool events arrive on driver threads, and
+    the read-modify-write would otherwise lose concurrent increments.
+    """
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            series = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items()]
+        for key, (counts, total, count) in series:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    """Metrics owned by this process, rendered in the Prometheus text format
+
+    Besides metrics updated as things happen, collectors are called at
+    scrape time to report values other components already keep (cache hit
+    counts, scheduler stats...), which costs nothing on the request path.
+    Each collector returns (name, type, help, samples) tuples.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Samples]]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Samples]]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collector in self._collectors:
+            for name, type_name, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {type_name}")
+                for labels, value in samples:
+                    if value is not None:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "resume_builder_stage_seconds",
+    "Time spent in each stage of request handling",
+    ("endpoint", "stage")
+)
+LLM_TOKENS = REGISTRY.counter(
+    "resume_builder_llm_tokens_total",
+    "Tokens used by LLM completions as reported by the API",
+    ("kind",)
+)
+PDF_BYTES = REGISTRY.counter(
+    "resume_builder_pdf_bytes_total",
+    "PDF bytes rendered and sent to clients",
+    ("kind",)
+)
+
+
+class _StageTimer:
+    __slots__ = ("endpoint", "stage", "started")
+
+    def __init__(self, endpoint: str, stage: str):
+        self.endpoint = endpoint
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        STAGE_SECONDS.observe(time.perf_counter() - self.started, endpoint=self.endpoint, stage=self.stage)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def stage_timer(endpoint: str, stage: str):
+    """Context manager recording how long a stage takes into resume_builder_stage_seconds"""
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return _StageTimer(endpoint, stage)
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool listener tracking open and checked-out MongoDB connections"""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.open_connections = registry.gauge(
+            "resume_builder_mongo_pool_connections", "Open connections in the MongoDB pool", ("address",)
+        )
+        self.checked_out = registry.gauge(
+            "resume_builder_mongo_pool_checked_out", "MongoDB connections currently in use", ("address",)
+        )
+        self.checkouts = registry.counter(
+            "resume_builder_mongo_pool_checkouts_total", "MongoDB connection checkouts", ("address", "result")
+        )
+        self.cleared = registry.counter(
+            "resume_builder_mongo_pool_cleared_total", "Times the MongoDB pool was cleared after an error", ("address",)
+        )
+
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.cleared.inc(address=self._address(event))
+
+    def pool_closed(self, event):
+        address = self._address(event)
+        self.open_connections.set(0, address=address)
+        self.checked_out.set(0, address=address)
+
+    def connection_created(self, event):
+        self.open_connections.inc(address=self._address(event))
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open_connections.dec(address=self._address(event))
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.checkouts.inc(address=self._address(event), result="failed")
+
+    def connection_checked_out(self, event):
+        address = self._address(event)
+        self.checkouts.inc(address=address, result="ok")
+        self.checked_out.inc(address=address)
+
+    def connection_checked_in(self, event):
+        self.checked_out.dec(address=self._address(event))
+
+
+_mongo_pool_metrics: Optional[MongoPoolMetrics] = None
+
+
+def mongo_pool_metrics() -> MongoPoolMetrics:
+    """Shared pool listener, created on first use so its metrics are only listed with MongoDB"""
+    global _mongo_pool_metrics
+    if _mongo_pool_metrics is None:
+        _mongo_pool_metrics = MongoPoolMetrics()
+    return _mongo_pool_metrics
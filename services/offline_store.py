@@ -0,0 +1,342 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from bson import ObjectId
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS users (
+        email TEXT PRIMARY KEY,
+        id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        last_login TEXT,
+        version INTEGER NOT NULL DEFAULT 1
+    )""",
+    """CREATE TABLE IF NOT EXISTS resumes (
+        id TEXT PRIMARY KEY,
+        user_email TEXT NOT NULL,
+        title TEXT NOT NULL,
+        resume_data TEXT NOT NULL,
+        pdf_url TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        is_active INTEGER NOT NULL DEFAULT 1,
+        version INTEGER NOT NULL DEFAULT 1
+    )""",
+    # Same shape as the Mongo listing index (see DatabaseService.ensure_indexes)
+    """CREATE INDEX IF NOT EXISTS user_active_updated_id
+        ON resumes (user_email, is_active, updated_at DESC, id DESC)""",
+    # Documents Mongo rejected during replay, kept aside for someone to look at
+    """CREATE TABLE IF NOT EXISTS dead_letters (
+        kind TEXT NOT NULL,
+        key TEXT NOT NULL,
+        document TEXT NOT NULL,
+        error TEXT NOT NULL,
+        failed_at TEXT NOT NULL,
+        PRIMARY KEY (kind, key)
+    )""",
+]
+
+RESUME_COLUMNS = "id, user_email, title, resume_data, pdf_url, created_at, updated_at, is_active"
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    # Fixed-width ISO strings sort the same way as the datetimes they encode
+    return value.isoformat(timespec="microseconds") if value else None
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _resume_doc(row) -> dict:
+    return {
+        "_id": ObjectId(row[0]),
+        "user_email": row[1],
+        "title": row[2],
+        "resume_data": json.loads(row[3]),
+        "pdf_url": row[4],
+        "created_at": _datetime(row[5]),
+        "updated_at": _datetime(row[6]),
+        "is_active": bool(row[7]),
+    }
+
+
+def _user_doc(row) -> dict:
+    return {
+        "_id": ObjectId(row[0]),
+        "email": row[1],
+        "name": row[2],
+        "created_at": _datetime(row[3]),
+        "last_login": _datetime(row[4]),
+    }
+
+
+def _dead_letter(connection, kind: str, select: str, delete: str, to_doc, failed: List[Tuple[str, int, str]]):
+    failed_at = _timestamp(datetime.utcnow())
+    for key, version, error in failed:
+        # A row written again since it was handed out gets another replay attempt
+        row = connection.execute(select, (key, version)).fetchone()
+        if row is None:
+            continue
+        connection.execute(
+            "INSERT OR REPLACE INTO dead_letters (kind, key, document, error, failed_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, key, json.dumps(to_doc(row), default=str), error, failed_at)
+        )
+        connection.execute(delete, (key,))
+
+
+class OfflineStore:
+    """Durable SQLite store used while MongoDB is unreachable
+
+    Methods mirror DatabaseService's and return documents shaped like the
+    Mongo ones (ObjectId `_id`, datetimes). Every row is a write Mongo has
+    not seen yet: `pending_*` hands them out in batches for replay and
+    `mark_*_replayed` removes them, unless they were written again in the
+    meantime (tracked with a per-row version). Rows Mongo rejects are moved
+    to a dead letter table by `dead_letter_*` so they don't block the rest.
+
+    sqlite3 is blocking, so every call runs in a worker thread on a single
+    connection guarded by a lock. The file is only created on first write.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _run_sync(self, fn: Callable[[sqlite3.Connection], object]):
+        with self._lock:
+            connection = self._connect()
+            try:
+                result = fn(connection)
+                connection.commit()
+                return result
+            except Exception:
+                connection.rollback()
+                raise
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], object]):
+        return await asyncio.to_thread(self._run_sync, fn)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    # User operations
+    async def create_or_get_user(self, email: str, name: str) -> dict:
+        now = _timestamp(datetime.utcnow())
+
+        def upsert(connection):
+            connection.execute(
+                """INSERT INTO users (email, id, name, created_at, last_login) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(email) DO UPDATE SET last_login = excluded.last_login, version = version + 1""",
+                (email, str(ObjectId()), name, now, now)
+            )
+            row = connection.execute(
+                "SELECT id, email, name, created_at, last_login FROM users WHERE email = ?", (email,)
+            ).fetchone()
+            return _user_doc(row)
+
+        return await self._run(upsert)
+
+    async def create_or_get_users(self, users: List[Tuple[str, str]]) -> List[dict]:
+        now = _timestamp(datetime.utcnow())
+
+        def upsert_many(connection):
+            connection.executemany(
+                "INSERT OR IGNORE INTO users (email, id, name, created_at, last_login) VALUES (?, ?, ?, ?, NULL)",
+                [(email, str(ObjectId()), name, now) for email, name in users]
+            )
+            docs = []
+            for email, _ in users:
+                row = connection.execute(
+                    "SELECT id, email, name, created_at, last_login FROM users WHERE email = ?", (email,)
+                ).fetchone()
+                docs.append(_user_doc(row))
+            return docs
+
+        return await self._run(upsert_many)
+
+    # Resume operations
+    async def save_resumes(self, resumes: List[dict]) -> List[str]:
+        """Insert resumes given save_resume-style dicts; an `_id` is kept if present"""
+        now = _timestamp(datetime.utcnow())
+        rows = [
+            (
+                str(resume.get("_id") or ObjectId()),
+                resume["user_email"],
+                resume["title"],
+                json.dumps(resume["resume_data"]),
+                resume.get("pdf_url"),
+                _timestamp(resume.get("created_at")) or now,
+                _timestamp(resume.get("updated_at")) or now,
+                int(resume.get("is_active", True)),
+            )
+            for resume in resumes
+        ]
+
+        def insert(connection):
+            connection.executemany(
+                f"INSERT OR REPLACE INTO resumes ({RESUME_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+        await self._run(insert)
+        return [row[0] for row in rows]
+
+    async def get_resume(self, resume_id: str, user_email: str) -> Optional[dict]:
+        def select(connection):
+            row = connection.execute(
+                f"SELECT {RESUME_COLUMNS} FROM resumes WHERE id = ? AND user_email = ? AND is_active = 1",
+                (resume_id, user_email)
+            ).fetchone()
+            return _resume_doc(row) if row else None
+
+        return await self._run(select)
+
+    async def list_resumes(
+        self,
+        user_email: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, ObjectId]] = None,
+    ) -> List[dict]:
+        """Active resumes newest first, optionally strictly after a keyset position"""
+        query = f"SELECT {RESUME_COLUMNS} FROM resumes WHERE user_email = ? AND is_active = 1"
+        params: list = [user_email]
+        if after is not None:
+            updated_at, resume_id = after
+            query += " AND (updated_at < ? OR (updated_at = ? AND id < ?))"
+            params += [_timestamp(updated_at), _timestamp(updated_at), str(resume_id)]
+        query += " ORDER BY updated_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        def select(connection):
+            return [_resume_doc(row) for row in connection.execute(query, params)]
+
+        return await self._run(select)
+
+    async def update_resume(self, resume_id: str, user_email: str, fields: dict) -> bool:
+        """Apply a Mongo-style $set of resume fields"""
+        assignments = []
+        params = []
+        for field, value in fields.items():
+            if field == "resume_data":
+                value = json.dumps(value)
+            elif field in ("created_at", "updated_at"):
+                value = _timestamp(value)
+            elif field == "is_active":
+                value = int(value)
+            assignments.append(f"{field} = ?")
+            params.append(value)
+        params += [resume_id, user_email]
+
+        def update(connection):
+            cursor = connection.execute(
+                f"UPDATE resumes SET {', '.join(assignments)}, version = version + 1 WHERE id = ? AND user_email = ?",
+                params
+            )
+            return cursor.rowcount > 0
+
+        return await self._run(update)
+
+    # Replay
+    async def pending_users(self, limit: int) -> List[Tuple[dict, int]]:
+        def select(connection):
+            rows = connection.execute(
+                "SELECT id, email, name, created_at, last_login, version FROM users LIMIT ?", (limit,)
+            ).fetchall()
+            return [(_user_doc(row), row[5]) for row in rows]
+
+        return await self._run(select)
+
+    async def pending_resumes(self, limit: int) -> List[Tuple[dict, int]]:
+        def select(connection):
+            rows = connection.execute(
+                f"SELECT {RESUME_COLUMNS}, version FROM resumes ORDER BY created_at LIMIT ?", (limit,)
+            ).fetchall()
+            return [(_resume_doc(row), row[8]) for row in rows]
+
+        return await self._run(select)
+
+    async def mark_users_replayed(self, replayed: List[Tuple[str, int]]):
+        """Forget users Mongo now has, given (email, version) pairs"""
+        def delete(connection):
+            connection.executemany("DELETE FROM users WHERE email = ? AND version = ?", replayed)
+
+        await self._run(delete)
+
+    async def mark_resumes_replayed(self, replayed: List[Tuple[str, int]]):
+        """Forget resumes Mongo now has, given (id, version) pairs"""
+        def delete(connection):
+            connection.executemany("DELETE FROM resumes WHERE id = ? AND version = ?", replayed)
+
+        await self._run(delete)
+
+    async def dead_letter_users(self, failed: List[Tuple[str, int, str]]):
+        """Move users Mongo rejected out of the replay queue, given (email, version, error)"""
+        await self._run(lambda connection: _dead_letter(
+            connection, "user", "SELECT id, email, name, created_at, last_login FROM users WHERE email = ? AND version = ?",
+            "DELETE FROM users WHERE email = ?", _user_doc, failed
+        ))
+
+    async def dead_letter_resumes(self, failed: List[Tuple[str, int, str]]):
+        """Move resumes Mongo rejected out of the replay queue, given (id, version, error)"""
+        await self._run(lambda connection: _dead_letter(
+            connection, "resume", f"SELECT {RESUME_COLUMNS} FROM resumes WHERE id = ? AND version = ?",
+            "DELETE FROM resumes WHERE id = ?", _resume_doc, failed
+        ))
+
+    async def dead_letters(self, limit: int = 100) -> List[dict]:
+        def select(connection):
+            rows = connection.execute(
+                "SELECT kind, key, document, error, failed_at FROM dead_letters ORDER BY failed_at LIMIT ?", (limit,)
+            ).fetchall()
+            return [
+                {"kind": row[0], "key": row[1], "document": json.loads(row[2]), "error": row[3], "failed_at": _datetime(row[4])}
+                for row in rows
+            ]
+
+        return await self._run(select)
+
+    async def stats(self) -> dict:
+        if not self.exists():
+            return {"path": self.path, "pending_users": 0, "pending_resumes": 0, "dead_letters": 0}
+
+        def count(connection):
+            return {
+                "path": self.path,
+                "pending_users": connection.execute("SELECT COUNT(*) FROM users").fetchone()[0],
+                "pending_resumes": connection.execute("SELECT COUNT(*) FROM resumes").fetchone()[0],
+                "dead_letters": connection.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0],
+            }
+
+        return await self._run(count)
@@ -1,6 +1,14 @@
 import os
-import tempfile
-from typing import Dict, List
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import re
+import threading
+from io import BytesIO
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
@@ -12,13 +20,120 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase import pdfmetrics
 from datetime import datetime
 
+from services.cache import LRUCache, TieredCache, DiskCacheTier
+from services.metrics import PDF_BYTES, stage_timer
+from services.tracing import current_span, span, traced
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout changes so cached PDFs and ETags are invalidated
+RENDERER_VERSION = "1"
+
+# Resume fields the layout reads; anything else (ids, timestamps) doesn't change the PDF
+RENDERED_FIELDS = ('name', 'contact_info', 'email', 'phone', 'summary', 'education', 'skills', 'projects')
+
+def normalize_resume_data_for_pdf(resume_data: dict) -> dict:
+    """Normalize resume data structure for PDF generation"""
+    normalized = resume_data.copy()
+    
+    # Ensure contact_info is properly structured
+    if 'contact_info' not in normalized or not isinstance(normalized.get('contact_info'), dict):
+        normalized['contact_info'] = {
+            'email': resume_data.get('email', ''),
+            'phone': resume_data.get('phone', '')
+        }
+    
+    # Ensure skills is a list
+    if 'skills' in normalized:
+        if isinstance(normalized['skills'], str):
+            # Split string into list
+            skills_list = [skill.strip() for skill in normalized['skills'].split(',')]
+            normalized['skills'] = [skill for skill in skills_list if skill]
+        elif not isinstance(normalized['skills'], list):
+            normalized['skills'] = [str(normalized['skills'])]
+    
+    # Ensure education is a list
+    if 'education' in normalized:
+        if isinstance(normalized['education'], str):
+            # Convert string to basic education entry
+            normalized['education'] = [{
+                'degree': '',
+                'institution': '',
+                'year': '',
+                'cgpa': '',
+                'details': normalized['education']
+            }]
+        elif not isinstance(normalized['education'], list):
+            normalized['education'] = [normalized['education']]
+    
+    # Ensure projects is a list
+    if 'projects' in normalized:
+        if isinstance(normalized['projects'], str):
+            # Convert string to basic project entry
+            normalized['projects'] = [{
+                'title': 'Projects',
+                'description': normalized['projects'],
+                'technologies': '',
+                'duration': ''
+            }]
+        elif not isinstance(normalized['projects'], list):
+            normalized['projects'] = [normalized['projects']]
+    
+    return normalized
+
+_PAGE_OBJECT = re.compile(rb"/Type\s*/Page\b")
+
+def count_pdf_pages(pdf_bytes: bytes) -> int:
+    """Number of page objects in a rendered PDF (ReportLab doesn't compress the object headers)"""
+    return len(_PAGE_OBJECT.findall(pdf_bytes))
+
+class PDFRenderBusy(Exception):
+    """Raised when too many PDF renders are already queued"""
+
+# Generator owned by each render worker process, built once by the pool initializer
+_worker_generator = None
+
+def _init_render_worker():
+    """Process pool initializer: set up styles once per worker"""
+    global _worker_generator
+    _worker_generator = PDFGenerator(render_workers=0)
+
+def _render_in_worker(resume_data: Dict) -> bytes:
+    """Build a PDF inside a render worker process"""
+    return _worker_generator._build_pdf(resume_data)
+
 class PDFGenerator:
     """PDF generator that matches the exact web preview styling"""
     
-    def __init__(self):
-        self.temp_dir = tempfile.mkdtemp()
+    def __init__(self, render_workers: Optional[int] = None):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        
+        # ReportLab layout is CPU bound, so builds run in a pool of worker
+        # processes; 0 workers renders on a thread in this process instead
+        if render_workers is None:
+            render_workers = int(os.getenv("PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.render_workers = render_workers
+        self.render_timeout = float(os.getenv("PDF_RENDER_TIMEOUT_SECONDS", "30"))
+        self.max_pending = int(os.getenv("PDF_RENDER_MAX_PENDING", str(max(render_workers, 1) * 4)))
+        self.pending = 0
+        self.pool_restarts = 0
+        self.executor = None
+        self._executor_lock = threading.Lock()
+        if render_workers > 0:
+            self.executor = self._new_process_pool()
+        # Threads are only started on first use, so this costs nothing in workers
+        self.thread_executor = ThreadPoolExecutor(max_workers=max(self.max_pending, 1), thread_name_prefix="pdf-render")
+        
+        # Rendered PDFs keyed on their content hash, bounded by total bytes
+        self.cache = TieredCache(LRUCache(
+            max_entries=int(os.getenv("PDF_CACHE_MAX_ENTRIES", "1024")),
+            max_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            sizeof=len
+        ))
+        if os.getenv("PDF_CACHE_TIER") == "disk":
+            self.cache.attach_tier(DiskCacheTier(os.getenv("PDF_CACHE_DIR", ".cache/pdfs")))
     
     def _setup_custom_styles(self):
         """Setup custom styles optimized for single page layout"""
@@ -162,54 +277,158 @@ class PDFGenerator:
         """Limit list items to fit single page"""
         return items[:max_items] if len(items) > max_items else items
 
-    async def generate_pdf(self, resume_data: Dict) -> str:
+    def is_saturated(self) -> bool:
+        """Whether every render slot is busy"""
+        return self.pending >= max(self.render_workers, 1)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.render_workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "pool_restarts": self.pool_restarts,
+        }
+
+    def _new_process_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.render_workers,
+            mp_context=multiprocessing.get_context(os.getenv("PDF_RENDER_START_METHOD", "spawn")),
+            initializer=_init_render_worker
+        )
+
+    def _restart_process_pool(self, broken: ProcessPoolExecutor):
+        """Replace a pool that lost a worker; renders that saw the same pool break only restart it once"""
+        with self._executor_lock:
+            if self.executor is not broken:
+                return
+            self.executor = self._new_process_pool()
+            self.pool_restarts += 1
+        logger.warning("PDF render pool broke (a worker died); started a new one")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def _render(self, resume_data: Dict) -> bytes:
+        """Run the ReportLab build off the event loop with backpressure and a timeout"""
+        if self.pending >= self.max_pending:
+            raise PDFRenderBusy("Too many PDF renders in progress")
+        
+        if not self.executor:
+            return await self._run_render_job(None, resume_data)
+        executor = self.executor
+        try:
+            return await self._run_render_job(executor, resume_data)
+        except BrokenProcessPool:
+            # A killed worker (OOM, crash) fails every job on its pool for good
+            self._restart_process_pool(executor)
+        return await self._run_render_job(self.executor, resume_data)
+
+    async def _run_render_job(self, executor: Optional[ProcessPoolExecutor], resume_data: Dict) -> bytes:
+        loop = asyncio.get_running_loop()
+        if executor:
+            job = executor.submit(_render_in_worker, resume_data)
+        else:
+            job = self.thread_executor.submit(self._build_pdf, resume_data)
+        
+        # A build that already started can't be interrupted, so a timed out
+        # render keeps its slot until the worker is actually done with it
+        self.pending += 1
+        
+        def release(_: Future):
+            try:
+                loop.call_soon_threadsafe(self._release_render_slot)
+            except RuntimeError:
+                # The loop is already closed during shutdown
+                pass
+        
+        job.add_done_callback(release)
+        # On timeout the job is cancelled if it hasn't started yet
+        return await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.render_timeout)
+
+    def _release_render_slot(self):
+        self.pending -= 1
+
+    def cache_key(self, resume_data: Dict) -> str:
+        """Stable hash of everything that affects the rendered PDF"""
+        rendered = {field: resume_data.get(field) for field in RENDERED_FIELDS}
+        key_material = json.dumps(
+            {"renderer": RENDERER_VERSION, "resume": rendered},
+            sort_keys=True, default=str, ensure_ascii=False
+        )
+        return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+    @traced("pdf.generate")
+    async def generate_pdf_cached(self, resume_data: Dict) -> Tuple[bytes, str]:
+        """Return (pdf_bytes, cache_key), rendering only on a cache miss"""
+        key = self.cache_key(resume_data)
+        pdf_bytes = await self.cache.get(key)
+        current_span().set_attribute("pdf.cache_hit", pdf_bytes is not None)
+        if pdf_bytes is None:
+            pdf_bytes = await self.generate_pdf(resume_data)
+            await self.cache.set(key, pdf_bytes)
+        return pdf_bytes, key
+
+    def shutdown(self):
+        """Stop the render worker processes"""
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.thread_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def generate_pdf(self, resume_data: Dict) -> bytes:
         """Generate PDF that exactly matches the web preview styling"""      
         try:
-            print(f"PDF Generator received data keys: {list(resume_data.keys())}")
-            # Create temporary PDF file
-            pdf_filename = f"resume_{resume_data.get('name', 'candidate').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            pdf_path = os.path.join(self.temp_dir, pdf_filename)
-            
-            # Create PDF document with proper margins
-            doc = SimpleDocTemplate(
-                pdf_path,
-                pagesize=A4,
-                rightMargin=60,
-                leftMargin=60,
-                topMargin=60,
-                bottomMargin=60
-            )
-            
-            # Build content that matches web styling exactly
-            story = []
-            
-            # Header section (name + contact) - matches .resume-header
-            self._add_header_section(story, resume_data)
-            
-            # Summary section - matches .resume-summary
-            self._add_summary_section(story, resume_data)
-            
-            # Education section - matches .education-item styling
-            self._add_education_section(story, resume_data)
+            logger.debug("Rendering PDF for %d sections", len(resume_data))
             
-            # Skills section - matches .skills-list styling  
-            self._add_skills_section(story, resume_data)
+            # Render straight into memory; nothing touches the disk
+            with stage_timer("pdf", "render"), span("pdf.render", **{"pdf.render_workers": self.render_workers}) as render_span:
+                pdf_bytes = await self._render(resume_data)
+                if render_span.recording:
+                    render_span.set_attributes({"pdf.bytes": len(pdf_bytes), "pdf.pages": count_pdf_pages(pdf_bytes)})
+            PDF_BYTES.inc(len(pdf_bytes), kind="rendered")
             
-            # Projects section - matches .project-item styling
-            self._add_projects_section(story, resume_data)
-            
-            # Build PDF
-            doc.build(story)
-            
-            print(f"PDF generated successfully at: {pdf_path}")
-            return pdf_path
+            logger.debug("PDF generated successfully (%d bytes)", len(pdf_bytes))
+            return pdf_bytes
             
+        except PDFRenderBusy:
+            raise
         except Exception as e:
-            print(f"PDF generation error details: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("PDF generation error details: %s", e)
             raise Exception(f"Error generating PDF: {str(e)}")
     
+    def _build_pdf(self, resume_data: Dict) -> bytes:
+        """Lay out the PDF into an in-memory buffer (synchronous, CPU bound)"""
+        buffer = BytesIO()
+        
+        # Create PDF document with proper margins
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=60,
+            leftMargin=60,
+            topMargin=60,
+            bottomMargin=60
+        )
+        
+        # Build content that matches web styling exactly
+        story = []
+        
+        # Header section (name + contact) - matches .resume-header
+        self._add_header_section(story, resume_data)
+        
+        # Summary section - matches .resume-summary
+        self._add_summary_section(story, resume_data)
+        
+        # Education section - matches .education-item styling
+        self._add_education_section(story, resume_data)
+        
+        # Skills section - matches .skills-list styling  
+        self._add_skills_section(story, resume_data)
+        
+        # Projects section - matches .project-item styling
+        self._add_projects_section(story, resume_data)
+        
+        # Build PDF
+        doc.build(story)
+        return buffer.getvalue()
+    
     def _add_header_section(self, story: List, resume_data: Dict):
         """Add header section that matches .resume-header styling"""
         # Name - matches .resume-name styling (2.5rem, bold, #2c3e50, center)
@@ -337,11 +556,3 @@ class PDFGenerator:
                 elif isinstance(project, str) and project.strip():
                     story.append(Paragraph(project, self.styles['ItemTitle']))
                     story.append(Spacer(1, 8))  # Reduced spacing
-
-    def cleanup_temp_files(self):
-        """Clean up temporary files"""
-        try:
-            import shutil
-            shutil.rmtree(self.temp_dir)
-        except Exception:
-            pass  # Ignore cleanup errors
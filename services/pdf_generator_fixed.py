@@ -11,6 +11,9 @@ from reportlab.pdfbase import pdfutils
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase import pdfmetrics
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 class PDFGenerator:
     """PDF generator that matches the exact web preview styling"""
@@ -165,7 +168,7 @@ class PDFGenerator:
     async def generate_pdf(self, resume_data: Dict) -> str:
         """Generate PDF that exactly matches the web preview styling"""      
         try:
-            print(f"PDF Generator received data keys: {list(resume_data.keys())}")
+            logger.debug("Rendering PDF for %d sections", len(resume_data))
             # Create temporary PDF file
             pdf_filename = f"resume_{resume_data.get('name', 'candidate').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
             pdf_path = os.path.join(self.temp_dir, pdf_filename)
@@ -201,13 +204,11 @@ class PDFGenerator:
             # Build PDF
             doc.build(story)
             
-            print(f"PDF generated successfully at: {pdf_path}")
+            logger.debug("PDF generated successfully at %s", pdf_path)
             return pdf_path
             
         except Exception as e:
-            print(f"PDF generation error details: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("PDF generation error details: %s", e)
             raise Exception(f"Error generating PDF: {str(e)}")
     
     def _add_header_section(self, story: List, resume_data: Dict):
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Awaitable, Callable, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PDFPrerenderer:
+    """Speculatively renders PDFs in the background right after a resume is saved
+
+    Renders are best effort: they are skipped rather than queued when the
+    prerenderer is already at its concurrency limit or the render pool is
+    saturated, so speculative work never delays real downloads. Each render
+    is tracked by resume id and can be cancelled.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_concurrency: int = 2,
+        is_saturated: Callable[[], bool] = lambda: False,
+    ):
+        self.enabled = enabled
+        self.max_concurrency = max_concurrency
+        self.is_saturated = is_saturated
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.scheduled = 0
+        self.skipped = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def schedule(self, key: str, render: Callable[[], Awaitable]) -> bool:
+        """Start `render` in the background unless disabled, busy or already running for `key`"""
+        if not self.enabled or key in self._tasks:
+            return False
+        if len(self._tasks) >= self.max_concurrency or self.is_saturated():
+            self.skipped += 1
+            return False
+
+        task = asyncio.ensure_future(render())
+        self._tasks[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        self.scheduled += 1
+        return True
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if task.cancelled():
+            self.cancelled += 1
+        elif task.exception() is not None:
+            self.failed += 1
+            logger.warning("Background PDF render for %s failed: %s", key, task.exception())
+        else:
+            self.completed += 1
+
+    def cancel(self, key: str) -> bool:
+        """Cancel a pending render, e.g. because the resume was deleted"""
+        task = self._tasks.get(key)
+        if task is None:
+            return False
+        return task.cancel()
+
+    async def cancel_all(self):
+        """Cancel every pending render and wait for them to finish"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._tasks),
+            "scheduled": self.scheduled,
+            "skipped": self.skipped,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import tempfile
+from typing import Optional
+
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+
+class LocalPDFStore:
+    """Stores rendered resume PDFs as files in a local object-store directory
+
+    Artifacts are addressed by the PDF content key, so a stored URL stays
+    valid exactly as long as the resume content it was rendered from.
+    Resumes with identical content share an artifact; deleting it for one
+    of them only means the other renders and stores it again on next use.
+    """
+
+    scheme = "local"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def url_for(self, key: str) -> str:
+        return f"{self.scheme}://{key}.pdf"
+
+    def _path(self, pdf_url: str) -> Optional[str]:
+        prefix = f"{self.scheme}://"
+        if not pdf_url or not pdf_url.startswith(prefix):
+            return None
+        filename = os.path.basename(pdf_url[len(prefix):])
+        return os.path.join(self.directory, filename)
+
+    def _write(self, path: str, data: bytes):
+        # Write to a temp file and rename so readers never see partial files
+        fd, temp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _read(self, path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    async def put(self, key: str, data: bytes) -> str:
+        """Store a PDF and return its URL"""
+        pdf_url = self.url_for(key)
+        await asyncio.to_thread(self._write, self._path(pdf_url), data)
+        return pdf_url
+
+    async def get(self, pdf_url: str) -> Optional[bytes]:
+        """Load a stored PDF, or None if it doesn't exist"""
+        path = self._path(pdf_url)
+        if path is None:
+            return None
+        return await asyncio.to_thread(self._read, path)
+
+    async def delete(self, pdf_url: str):
+        """Remove a stored PDF; unknown URLs are ignored"""
+        path = self._path(pdf_url)
+        if path is not None:
+            await asyncio.to_thread(self._remove, path)
+
+
+class GridFSPDFStore:
+    """Stores rendered resume PDFs in MongoDB GridFS"""
+
+    scheme = "gridfs"
+
+    def __init__(self, db, bucket_name: str = "resume_pdfs"):
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name)
+
+    def url_for(self, key: str) -> str:
+        return f"{self.scheme}://{key}"
+
+    def _filename(self, pdf_url: str) -> Optional[str]:
+        prefix = f"{self.scheme}://"
+        if not pdf_url or not pdf_url.startswith(prefix):
+            return None
+        return pdf_url[len(prefix):]
+
+    async def put(self, key: str, data: bytes) -> str:
+        """Store a PDF and return its URL"""
+        pdf_url = self.url_for(key)
+        # Content-addressed, so an existing file with this name is identical
+        if await self.get(pdf_url) is None:
+            await self.bucket.upload_from_stream(self._filename(pdf_url), data)
+        return pdf_url
+
+    async def get(self, pdf_url: str) -> Optional[bytes]:
+        """Load a stored PDF, or None if it doesn't exist"""
+        filename = self._filename(pdf_url)
+        if filename is None:
+            return None
+        try:
+            stream = await self.bucket.open_download_stream_by_name(filename)
+        except NoFile:
+            return None
+        return await stream.read()
+
+    async def delete(self, pdf_url: str):
+        """Remove a stored PDF; unknown URLs are ignored"""
+        filename = self._filename(pdf_url)
+        if filename is None:
+            return
+        async for stored in self.bucket.find({"filename": filename}):
+            try:
+                await self.bucket.delete(stored._id)
+            except NoFile:
+                # Deleted concurrently
+                pass
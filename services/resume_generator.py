@@ -1,10 +1,28 @@
 import os
+import asyncio
 import json
-from typing import Dict, List
+import copy
+import hashlib
+import inspect
+from typing import Any, AsyncIterator, Dict, List, Tuple
 import re
 
 import groq
+import httpx
 from models.resume_models import ResumeRequest, ResumeResponse
+from services.section_stream_parser import IncrementalSectionParser
+from services.cache import LRUCache, TieredCache, DiskCacheTier
+from services.single_flight import FlightAbandoned, SingleFlight
+from services.llm_scheduler import LLMScheduler, SchedulerOverloaded
+from services.circuit_breaker import CircuitBreaker
+from services.metrics import LLM_TOKENS, stage_timer
+from services.tracing import NULL_SPAN, current_span, span, traced
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever resume_prompt_template changes so cached generations are not reused
+PROMPT_TEMPLATE_VERSION = "1"
 
 class ResumeGenerator:
     """Resume generator using Groq API directly"""
@@ -12,14 +30,71 @@ class ResumeGenerator:
     def __init__(self):
         self.groq_api_key = os.getenv("GROQ_API_KEY")
         self.model_name = os.getenv("MODEL_NAME", "llama3-70b-8192")
+        # Point at a Groq-compatible server instead, e.g. loadtest/fake_groq.py
+        self.base_url = os.getenv("GROQ_BASE_URL") or None
         
-        print("Using model:", self.model_name)  # Debug print to verify model name
+        logger.info("Using model %s", self.model_name)
         
         if not self.groq_api_key:
-            raise ValueError("GROQ_API_KEY environment variable is required")
+            if not self.base_url:
+                raise ValueError("GROQ_API_KEY environment variable is required")
+            # Local stand-ins don't check the key, but the SDK insists on one
+            self.groq_api_key = "local"
+        
+        # Initialize async Groq client on a pooled keep-alive transport so LLM
+        # calls never block the event loop
+        self.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                float(os.getenv("GROQ_TIMEOUT_SECONDS", "60")),
+                connect=float(os.getenv("GROQ_CONNECT_TIMEOUT_SECONDS", "5")),
+            ),
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("GROQ_MAX_CONNECTIONS", "20")),
+                max_keepalive_connections=int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "10")),
+                keepalive_expiry=float(os.getenv("GROQ_KEEPALIVE_EXPIRY_SECONDS", "30")),
+            ),
+        )
+        self.client = groq.AsyncClient(
+            api_key=self.groq_api_key,
+            base_url=self.base_url,
+            http_client=self.http_client,
+            # Retries are owned by the scheduler so they respect rate limits
+            max_retries=0,
+        )
+        
+        # Admission control and rate limiting for every Groq call
+        self.scheduler = LLMScheduler(
+            max_concurrency=int(os.getenv("GROQ_MAX_CONCURRENCY", "8")),
+            max_queue=int(os.getenv("GROQ_MAX_QUEUE", "32")),
+            max_wait_seconds=float(os.getenv("GROQ_MAX_WAIT_SECONDS", "30")),
+            max_retries=int(os.getenv("GROQ_MAX_RETRIES", "3")),
+            requests_per_minute=float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30")),
+            tokens_per_minute=float(os.getenv("GROQ_TOKENS_PER_MINUTE", "30000")),
+            breaker=CircuitBreaker(
+                "groq",
+                failure_threshold=int(os.getenv("GROQ_BREAKER_FAILURES", "5")),
+                reset_timeout_seconds=float(os.getenv("GROQ_BREAKER_RESET_SECONDS", "30")),
+            ),
+        )
         
-        # Initialize Groq client
-        self.client = groq.Client(api_key=self.groq_api_key)
+        # Cache of parsed generations keyed on the normalized request
+        cache_ttl = float(os.getenv("GENERATION_CACHE_TTL_SECONDS", "3600"))
+        self.cache = TieredCache(
+            LRUCache(
+                max_entries=int(os.getenv("GENERATION_CACHE_SIZE", "256")),
+                ttl_seconds=cache_ttl,
+            ),
+            encode=lambda value: json.dumps(value).encode("utf-8"),
+            decode=lambda data: json.loads(data.decode("utf-8")),
+        )
+        if os.getenv("GENERATION_CACHE_TIER") == "disk":
+            self.cache.attach_tier(DiskCacheTier(
+                os.getenv("GENERATION_CACHE_DIR", ".cache/generations"),
+                ttl_seconds=cache_ttl,
+            ))
+        
+        # Identical requests already being generated share one LLM call
+        self.in_flight = SingleFlight()
         
         # Resume generation prompt template
         self.resume_prompt_template = """
@@ -133,41 +208,215 @@ Make sure the JSON is valid and properly formatted.
             "education": process_education(resume_request.education),            "projects": process_projects(resume_request.projects),
             "additional_info": clean_text(resume_request.additional_info)
         }
+    def _completion_params(self, processed_input: Dict[str, str]) -> Dict:
+        """Build the chat completion arguments for a preprocessed resume request"""
+        # Generate prompt
+        formatted_prompt = self.resume_prompt_template.format(**processed_input)
+        
+        # Ensure we're using the correct model
+        current_model = os.getenv("MODEL_NAME", "llama3-70b-8192")
+        logger.debug("API call using model %s", current_model)
+        
+        return {
+            "model": current_model,  # Use current model from environment
+            "messages": [
+                {
+                    "role": "user",
+                    "content": formatted_prompt
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": 2000
+        }
+
+    async def _create_completion(self, params: Dict, stream: bool = False):
+        """Send a chat completion through the scheduler and return the parsed result
+        
+        A stream keeps its scheduler slot until it is read; the caller must
+        call self.scheduler.release_slot() once it is done with it.
+        """
+        # Rough prompt size (~4 characters per token) plus the completion budget
+        prompt_chars = sum(len(message["content"]) for message in params["messages"])
+        estimated_tokens = prompt_chars // 4 + params["max_tokens"]
+        
+        with span("llm.completion", **{
+            "llm.model": params["model"], "llm.stream": stream, "llm.estimated_tokens": estimated_tokens
+        }) as llm_span:
+            raw_response = await self.scheduler.submit(
+                lambda: self.client.chat.completions.with_raw_response.create(**params, stream=stream),
+                estimated_tokens,
+                hold_slot=stream,
+            )
+            try:
+                parsed = raw_response.parse()
+                # Newer groq SDKs return an awaitable from parse() on the async client
+                if inspect.isawaitable(parsed):
+                    parsed = await parsed
+            except BaseException:
+                if stream:
+                    self.scheduler.release_slot()
+                raise
+            if not stream:
+                self._count_tokens(getattr(parsed, "usage", None), llm_span)
+        return parsed
+
+    def _cache_key(self, processed_input: Dict[str, str], params: Dict) -> str:
+        """Content-address a generation by its normalized input and LLM settings"""
+        key_material = json.dumps({
+            "input": processed_input,
+            "model": params["model"],
+            "temperature": params["temperature"],
+            "max_tokens": params["max_tokens"],
+            "prompt_version": PROMPT_TEMPLATE_VERSION,
+        }, sort_keys=True)
+        return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+    @traced("resume_generator.generate")
     async def generate_resume(self, resume_request: ResumeRequest) -> Dict:
         """Generate resume content using Groq API directly"""
         try:
             # Preprocess input
-            processed_input = self.preprocess_user_input(resume_request)
-            
-            # Generate prompt
-            formatted_prompt = self.resume_prompt_template.format(**processed_input)
+            with stage_timer("generate", "preprocess"):
+                processed_input = self.preprocess_user_input(resume_request)
+                params = self._completion_params(processed_input)
             
-            # Ensure we're using the correct model
-            current_model = os.getenv("MODEL_NAME", "llama3-70b-8192")
-            print(f"API call using model: {current_model}")
+            # Identical submissions reuse the previous generation
+            cache_key = self._cache_key(processed_input, params)
+            cached = await self.cache.get(cache_key)
+            current_span().set_attribute("generation.cache_hit", cached is not None)
+            if cached is not None:
+                return copy.deepcopy(cached)
             
-            # Get response from Groq
-            completion = self.client.chat.completions.create(
-                model=current_model,  # Use current model from environment
-                messages=[
-                    {
-                        "role": "user",
-                        "content": formatted_prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=2000
+            # Concurrent identical requests await the same generation
+            resume_content = await self.in_flight.do(
+                cache_key, lambda: self._generate_uncached(params, cache_key)
             )
+            return copy.deepcopy(resume_content)
             
-            response_content = completion.choices[0].message.content
-            
-            # Parse JSON response
+        except SchedulerOverloaded:
+            raise
+        except Exception as e:
+            raise Exception(f"Error generating resume: {str(e)}")
+
+    async def generate_resume_waiting(self, resume_request: ResumeRequest, max_overload_retries: int = 5) -> Dict:
+        """generate_resume for background work, waiting out scheduler overload instead of failing
+        
+        Each SchedulerOverloaded is retried after its retry_after, up to
+        `max_overload_retries` times.
+        """
+        for attempt in range(max_overload_retries + 1):
+            try:
+                return await self.generate_resume(resume_request)
+            except SchedulerOverloaded as e:
+                if attempt >= max_overload_retries:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+    async def _generate_uncached(self, params: Dict, cache_key: str) -> Dict:
+        """Call Groq, parse the response and store it in the cache"""
+        # Get response from Groq
+        with stage_timer("generate", "llm"):
+            completion = await self._create_completion(params)
+        
+        response_content = completion.choices[0].message.content
+        
+        # Parse JSON response
+        with stage_timer("generate", "parse"), span("resume_generator.parse", **{"llm.response_chars": len(response_content)}):
             resume_content = self._parse_resume_response(response_content)
+        
+        await self.cache.set(cache_key, resume_content)
+        return resume_content
+
+    async def stream_resume(self, resume_request: ResumeRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream resume generation, yielding sections as soon as they are complete
+        
+        Yields ("section", {"section": key, "value": value}) for every top-level
+        field of the resume JSON as it finishes streaming, then a final
+        ("resume", resume_data) with the fully parsed and validated resume.
+        """
+        try:
+            with stage_timer("generate_stream", "preprocess"):
+                processed_input = self.preprocess_user_input(resume_request)
+                params = self._completion_params(processed_input)
             
-            return resume_content
+            # A cached or already in-flight generation is replayed section by section
+            cache_key = self._cache_key(processed_input, params)
+            cached = await self.cache.get(cache_key)
+            if cached is None and cache_key in self.in_flight:
+                cached = await self.in_flight.do(
+                    cache_key, lambda: self._generate_uncached(params, cache_key)
+                )
+            if cached is not None:
+                resume_content = copy.deepcopy(cached)
+                for section, value in resume_content.items():
+                    yield "section", {"section": section, "value": value}
+                yield "resume", resume_content
+                return
             
+            # Identical requests arriving while this streams wait for its result
+            flight = self.in_flight.begin(cache_key)
+            try:
+                # Includes the time the client takes to read the yielded sections
+                with stage_timer("generate_stream", "llm"):
+                    stream = await self._create_completion(params, stream=True)
+                
+                    # Ended explicitly: a span entered here would be current across yields
+                    stream_span = span("llm.stream", **{"llm.model": params["model"]})
+                    parser = IncrementalSectionParser()
+                    try:
+                        async for chunk in stream:
+                            # Groq reports usage on the last chunk
+                            self._count_tokens(getattr(getattr(chunk, "x_groq", None), "usage", None), stream_span)
+                            if not chunk.choices:
+                                continue
+                            delta = chunk.choices[0].delta.content
+                            if not delta:
+                                continue
+                            for section, value in parser.feed(delta):
+                                yield "section", {"section": section, "value": value}
+                    finally:
+                        try:
+                            # Free the connection even if the client went away mid-stream
+                            await stream.close()
+                        finally:
+                            self.scheduler.release_slot()
+                        stream_span.set_attribute("llm.response_chars", len(parser.text))
+                        stream_span.end()
+                
+                # Validate the complete response exactly like the non-streaming path
+                with stage_timer("generate_stream", "parse"):
+                    resume_content = self._parse_resume_response(parser.text)
+            except Exception as e:
+                flight.set_exception(e)
+                raise
+            except BaseException:
+                # The client went away mid-stream, so waiters generate it themselves
+                flight.set_exception(FlightAbandoned("Streamed generation was abandoned"))
+                raise
+            # Waiters get their own copy; the caller may change this one
+            flight.set_result(copy.deepcopy(resume_content))
+            await self.cache.set(cache_key, copy.deepcopy(resume_content))
+            yield "resume", resume_content
+            
+        except SchedulerOverloaded:
+            raise
         except Exception as e:
             raise Exception(f"Error generating resume: {str(e)}")
+
+    @staticmethod
+    def _count_tokens(usage, llm_span=NULL_SPAN):
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        LLM_TOKENS.inc(prompt_tokens, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens, kind="completion")
+        llm_span.set_attributes({"llm.prompt_tokens": prompt_tokens, "llm.completion_tokens": completion_tokens})
+
+    async def aclose(self):
+        """Close the pooled HTTP connections used by the Groq client"""
+        await self.client.close()
+
     def _parse_resume_response(self, response_text: str) -> Dict:
         """Parse and validate the resume response"""
         try:
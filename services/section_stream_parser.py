@@ -0,0 +1,88 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class IncrementalSectionParser:
+    """Incrementally scan a streamed JSON object and emit top-level fields as they complete
+
+    The LLM streams the resume as one JSON object, possibly wrapped in some
+    surrounding prose. Characters before the first '{' are ignored (the same
+    rule `_parse_resume_response` uses), and every top-level key/value pair is
+    decoded as soon as the comma or closing brace that ends it arrives.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk of streamed text and return newly completed (key, value) pairs"""
+        self.text += chunk
+        completed = []
+
+        text = self.text
+        for index in range(self._position, len(text)):
+            if self.done:
+                break
+            char = text[index]
+
+            if self._depth == 0:
+                # Skip any preamble before the resume object starts
+                if char == '{':
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = self._decode(text[self._key_start:index + 1])
+                        self._key_start = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None:
+                    self._key_start = index
+            elif char in '{[':
+                self._depth += 1
+            elif char == ':' and self._depth == 1 and self._key is not None and self._value_start is None:
+                self._value_start = index + 1
+            elif char == ',' and self._depth == 1:
+                self._complete_field(text, index, completed)
+            elif char in '}]':
+                if self._depth == 1:
+                    self._complete_field(text, index, completed)
+                    self.done = True
+                self._depth -= 1
+
+        self._position = len(text)
+        return completed
+
+    def _complete_field(self, text: str, end: int, completed: List[Tuple[str, Any]]):
+        """Decode the value that just ended at `end` and reset the key state"""
+        if self._key is not None and self._value_start is not None:
+            value = self._decode(text[self._value_start:end].strip())
+            if value is not None:
+                completed.append((self._key, value))
+        self._key = None
+        self._value_start = None
+
+    @staticmethod
+    def _decode(fragment: str) -> Any:
+        """Decode a JSON fragment, returning None if it is not valid on its own"""
+        try:
+            return json.loads(fragment)
+        except (json.JSONDecodeError, ValueError):
+            return None
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class FlightAbandoned(Exception):
+    """Set on a begin() future whose owner stopped before producing a result"""
+
+
+class SingleFlight:
+    """Coalesce concurrent calls sharing a key into one in-flight execution
+
+    The first caller for a key starts the work as a task; callers that arrive
+    while it is running await the same task and receive its result or its
+    exception. The task is shielded, so one caller disconnecting does not
+    cancel the work the others are waiting on.
+
+    Work the caller drives itself, such as a stream it is reading, is
+    registered with begin() instead. If its owner gives up and sets
+    FlightAbandoned, waiters run the work themselves.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn` once for all concurrent callers using `key`"""
+        while True:
+            task = self._calls.get(key)
+            if task is None:
+                task = self._register(key, asyncio.ensure_future(fn()))
+            else:
+                self.coalesced += 1
+            try:
+                return await asyncio.shield(task)
+            except FlightAbandoned:
+                continue
+
+    def begin(self, key: str) -> Optional[asyncio.Future]:
+        """Register work for `key` that the caller runs itself, or None if it is already in flight
+
+        The caller must resolve the returned future with the result or the
+        exception, or with FlightAbandoned if it stops early.
+        """
+        if key in self._calls:
+            return None
+        return self._register(key, asyncio.get_running_loop().create_future())
+
+    def _register(self, key: str, task: asyncio.Future) -> asyncio.Future:
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        self.started += 1
+        return task
+
+    def _finish(self, key: str, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,544 @@
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Set for the duration of every HTTP request, traced or not, so logs can carry them
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+request_path_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_path", default=None)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+# Client supplied request IDs are echoed back and logged, so keep them tame
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+def current_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+class _NullSpan:
+    """Stands in for a span when the request isn't traced, so callers never branch"""
+
+    __slots__ = ()
+    recording = False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+    def update_name(self, name: str):
+        pass
+
+    def record_exception(self, exc: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """Spans recorded for one request, exported together when the root span ends"""
+
+    __slots__ = ("tracer", "trace_id", "request_id", "sampled", "spans", "finished", "dropped_spans")
+
+    def __init__(self, tracer: "Tracer", trace_id: str, request_id: Optional[str], sampled: bool):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.request_id = request_id
+        self.sampled = sampled
+        self.spans: List["Span"] = []
+        self.finished = False
+        self.dropped_spans = 0
+
+
+class Span:
+    """A timed operation within a trace, with attributes"""
+
+    __slots__ = (
+        "trace", "name", "span_id", "parent_id", "kind", "start_ns", "end_ns",
+        "_started", "attributes", "error", "_token",
+    )
+    recording = True
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any], kind: str = "internal"):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes)
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._started = time.perf_counter_ns()
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        self.attributes.update(attributes)
+
+    def update_name(self, name: str):
+        self.name = name
+
+    def record_exception(self, exc: BaseException):
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else self.start_ns + time.perf_counter_ns() - self._started
+        return (end - self.start_ns) / 1e6
+
+    def end(self):
+        if self.end_ns is not None:
+            return
+        # Wall clock start plus a monotonic duration, so clock steps can't make it negative
+        self.end_ns = self.start_ns + time.perf_counter_ns() - self._started
+        self.trace.tracer._finish(self)
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.record_exception(exc)
+        _current_span.reset(self._token)
+        self.end()
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "request_id": self.trace.request_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+        }
+
+
+class JSONLSpanExporter:
+    """Appends finished spans to a local file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Dict[str, Any]]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span, default=str, ensure_ascii=False) + "\n")
+
+    def shutdown(self):
+        pass
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _from_otlp_value(value: Dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    for kind in ("boolValue", "doubleValue", "stringValue"):
+        if kind in value:
+            return value[kind]
+    return None
+
+
+_OTLP_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+def to_otlp(spans: List[Dict[str, Any]], service_name: str) -> Dict[str, Any]:
+    """Encode spans as an OTLP/HTTP JSON ExportTraceServiceRequest"""
+    otlp_spans = []
+    for span in spans:
+        attributes = dict(span["attributes"])
+        if span.get("request_id"):
+            attributes["http.request_id"] = span["request_id"]
+        otlp_span = {
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": _OTLP_KINDS.get(span.get("kind"), 1),
+            "startTimeUnixNano": str(span["start_time_unix_nano"]),
+            "endTimeUnixNano": str(span["end_time_unix_nano"]),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+            "status": {"code": 2, "message": span["error"]} if span.get("error") else {"code": 1},
+        }
+        if span.get("parent_id"):
+            otlp_span["parentSpanId"] = span["parent_id"]
+        otlp_spans.append(otlp_span)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+        "scopeSpans": [{"scope": {"name": "resume_builder"}, "spans": otlp_spans}],
+    }]}
+
+
+def from_otlp(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Decode an OTLP/HTTP JSON request back into the flat span dicts the JSONL exporter writes"""
+    kinds = {number: name for name, number in _OTLP_KINDS.items()}
+    spans = []
+    for resource_spans in payload.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for otlp_span in scope_spans.get("spans", []):
+                attributes = {
+                    attribute["key"]: _from_otlp_value(attribute.get("value", {}))
+                    for attribute in otlp_span.get("attributes", [])
+                }
+                start, end = int(otlp_span["startTimeUnixNano"]), int(otlp_span["endTimeUnixNano"])
+                status = otlp_span.get("status", {})
+                spans.append({
+                    "trace_id": otlp_span["traceId"],
+                    "span_id": otlp_span["spanId"],
+                    "parent_id": otlp_span.get("parentSpanId") or None,
+                    "request_id": attributes.pop("http.request_id", None),
+                    "name": otlp_span["name"],
+                    "kind": kinds.get(otlp_span.get("kind"), "internal"),
+                    "start_time_unix_nano": start,
+                    "end_time_unix_nano": end,
+                    "duration_ms": round((end - start) / 1e6, 3),
+                    "attributes": attributes,
+                    "status": "error" if status.get("code") == 2 else "ok",
+                    "error": status.get("message") if status.get("code") == 2 else None,
+                })
+    return spans
+
+
+class OTLPHTTPSpanExporter:
+    """Posts spans to an OTLP/HTTP collector (JSON encoding)"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: List[Dict[str, Any]]):
+        response = self.client.post(self.endpoint, json=to_otlp(spans, self.service_name))
+        response.raise_for_status()
+
+    def shutdown(self):
+        self.client.close()
+
+
+class BatchSpanProcessor:
+    """Exports spans in batches from a background thread
+
+    Finishing a trace only queues its spans; file writes and HTTP posts
+    happen off the event loop. When the queue is full spans are dropped
+    and counted rather than slowing requests down.
+    """
+
+    def __init__(self, exporter, max_queue_size: int = 10000, max_batch: int = 512, interval_seconds: float = 1.0):
+        self.exporter = exporter
+        self.max_batch = max_batch
+        self.interval_seconds = interval_seconds
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        self.exported = 0
+        self.dropped = 0
+        self.failures = 0
+
+    def submit(self, spans: Iterable[Dict[str, Any]]):
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + self.interval_seconds
+            while len(batch) < self.max_batch:
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            if batch:
+                self._export(batch)
+        # Whatever was queued behind the stop marker
+        remaining = []
+        while True:
+            try:
+                span = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if span is not None:
+                remaining.append(span)
+        if remaining:
+            self._export(remaining)
+
+    def _export(self, batch: List[Dict[str, Any]]):
+        try:
+            self.exporter.export(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self.failures += 1
+            logger.warning("Failed to export %d spans: %s", len(batch), e)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Export what's queued and stop the thread"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self.exporter.shutdown()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "failures": self.failures,
+        }
+
+
+class Tracer:
+    """Creates request traces and their spans, and decides which ones get exported
+
+    With no processor, tracing is off and every span is NULL_SPAN. Otherwise a
+    `sample_rate` fraction of requests is recorded and exported. With
+    `slow_ms` set every request is recorded and those taking at least that
+    long are exported as well, sampled or not.
+    """
+
+    def __init__(
+        self,
+        processor: Optional[BatchSpanProcessor] = None,
+        sample_rate: float = 1.0,
+        slow_ms: float = 0.0,
+        max_spans_per_trace: int = 1000,
+    ):
+        self.processor = processor
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_spans_per_trace = max_spans_per_trace
+        self.traces = 0
+        self.exported_traces = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None
+
+    def start_trace(self, name: str, request_id: Optional[str] = None, traceparent: Optional[str] = None,
+                    attributes: Optional[Dict[str, Any]] = None):
+        """Root span for a request; not current until entered"""
+        if not self.enabled:
+            return NULL_SPAN
+        trace_id, parent_id, sampled = None, None, None
+        # Join a trace started upstream, and follow its sampling decision
+        match = _TRACEPARENT_PATTERN.match(traceparent or "")
+        if match:
+            trace_id, parent_id = match.group(1), match.group(2)
+            sampled = bool(int(match.group(3), 16) & 1)
+        if sampled is None:
+            sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+        if not sampled and not self.slow_ms:
+            return NULL_SPAN
+        self.traces += 1
+        trace = Trace(self, trace_id or secrets.token_hex(16), request_id, sampled)
+        return Span(trace, name, parent_id, attributes or {}, kind="server")
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """Child of the current span; a no-op outside a recorded trace"""
+        parent = _current_span.get()
+        if parent is None or not parent.recording or parent.trace.finished:
+            return NULL_SPAN
+        trace = parent.trace
+        if len(trace.spans) >= self.max_spans_per_trace:
+            trace.dropped_spans += 1
+            return NULL_SPAN
+        return Span(trace, name, parent.span_id, attributes or {})
+
+    def _finish(self, span: Span):
+        trace = span.trace
+        if trace.finished:
+            # Background work that outlived its request
+            return
+        trace.spans.append(span)
+        if span.kind != "server":
+            return
+        # The root span ended, so the request is done
+        trace.finished = True
+        if trace.sampled or span.duration_ms >= self.slow_ms:
+            if trace.dropped_spans:
+                span.set_attribute("trace.dropped_spans", trace.dropped_spans)
+            self.exported_traces += 1
+            self.processor.submit(recorded.to_dict() for recorded in trace.spans)
+
+    def shutdown(self):
+        if self.processor is not None:
+            self.processor.shutdown()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "slow_ms": self.slow_ms,
+            "traces": self.traces,
+            "exported_traces": self.exported_traces,
+            "exporter": self.processor.stats() if self.processor is not None else None,
+        }
+
+
+_tracer = Tracer()
+
+
+def configure_tracing() -> Tracer:
+    """Build the process tracer from TRACE_* environment variables
+
+    TRACE_EXPORTER is "none" (default), "jsonl" (TRACE_JSONL_PATH) or
+    "otlp" (TRACE_OTLP_ENDPOINT, an OTLP/HTTP traces URL).
+    """
+    global _tracer
+    exporter_name = os.getenv("TRACE_EXPORTER", "none")
+    service_name = os.getenv("TRACE_SERVICE_NAME", "resume-builder")
+    if exporter_name == "jsonl":
+        exporter = JSONLSpanExporter(os.getenv("TRACE_JSONL_PATH", "traces.jsonl"))
+    elif exporter_name == "otlp":
+        exporter = OTLPHTTPSpanExporter(
+            os.getenv("TRACE_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces"), service_name
+        )
+    else:
+        exporter = None
+    _tracer.shutdown()
+    _tracer = Tracer(
+        BatchSpanProcessor(exporter) if exporter is not None else None,
+        sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+        slow_ms=float(os.getenv("TRACE_SLOW_MS", "0")),
+        max_spans_per_trace=int(os.getenv("TRACE_MAX_SPANS", "1000")),
+    )
+    return _tracer
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str, **attributes):
+    """Child span of the current one, timed while used as a context manager
+
+    It can also be ended explicitly with end() without ever becoming the
+    current span, which suits async generators: a context variable set
+    before a yield may be reset from a different context.
+    """
+    return _tracer.span(name, attributes)
+
+
+def current_span():
+    current = _current_span.get()
+    return current if current is not None and not current.trace.finished else NULL_SPAN
+
+
+def traced(name: str):
+    """Decorator running a coroutine function inside a span"""
+    def decorator(function: Callable):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            with _tracer.span(name):
+                return await function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RequestTracingMiddleware:
+    """ASGI middleware giving every request an ID and, when traced, a root span
+
+    The ID comes from the X-Request-ID header when it looks sane, otherwise
+    a new one is made; either way it's echoed in the response. The root
+    span covers the whole response, body included, and is named after the
+    matched route template so span names stay low-cardinality.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        request_id = headers.get("x-request-id", "")
+        if not _REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        request_id_token = request_id_var.set(request_id)
+        request_path_token = request_path_var.set(scope["path"])
+
+        # Renamed to the route template once routing has run
+        root = _tracer.start_trace(
+            scope["method"],
+            request_id=request_id,
+            traceparent=headers.get("traceparent"),
+            # Only the route template is recorded: some paths carry the user's email
+            attributes={"http.method": scope["method"]},
+        )
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+                root.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        try:
+            with root:
+                try:
+                    await self.app(scope, receive, send_with_request_id)
+                finally:
+                    # The router records the matched route and endpoint in the scope
+                    route = scope.get("route")
+                    if route is not None and getattr(route, "path", None):
+                        root.update_name(f"{scope['method']} {route.path}")
+                        root.set_attribute("http.route", route.path)
+                    endpoint = scope.get("endpoint")
+                    if endpoint is not None:
+                        root.set_attribute("code.function", getattr(endpoint, "__name__", str(endpoint)))
+        finally:
+            request_id_var.reset(request_id_token)
+            request_path_var.reset(request_path_token)
@@ -0,0 +1,136 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Buffers documents and writes them in batches off the request path
+
+    `add` returns as soon as the document is queued. A background task
+    flushes the queue with `flush_batch` once it reaches `max_batch`
+    documents or `max_delay_seconds` after the last flush, whichever comes
+    first. Queued documents stay readable and updatable through `get` and
+    `update` until they are written. If `flush_batch` fails the batch goes
+    to `fallback` (e.g. a durable local store), or back into the queue.
+    """
+
+    def __init__(
+        self,
+        flush_batch: Callable[[List[dict]], Awaitable],
+        max_batch: int = 100,
+        max_delay_seconds: float = 0.5,
+        fallback: Optional[Callable[[List[dict]], Awaitable]] = None,
+    ):
+        self.flush_batch = flush_batch
+        self.max_batch = max_batch
+        self.max_delay_seconds = max_delay_seconds
+        self.fallback = fallback
+        self._pending: Dict[str, dict] = {}
+        self._flushing: Dict[str, dict] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        self.max_depth = 0
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def add(self, key: str, doc: dict):
+        """Queue a document for writing under `key`"""
+        self._pending[key] = doc
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._ensure_running()
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    def get(self, key: str) -> Optional[dict]:
+        """The queued document for `key`, if it hasn't been written yet"""
+        return self._pending.get(key) or self._flushing.get(key)
+
+    async def update(self, key: str, fields: dict) -> bool:
+        """Apply `fields` to a queued document
+
+        Returns False if the document isn't queued, so the caller should
+        update the database instead. If the document is being written right
+        now, this waits for that write to finish first.
+        """
+        doc = self._pending.get(key)
+        if doc is not None:
+            doc.update(fields)
+            return True
+        if key in self._flushing:
+            async with self._flush_lock:
+                pass
+            # A failed write puts the document back in the queue
+            doc = self._pending.get(key)
+            if doc is not None:
+                doc.update(fields)
+                return True
+        return False
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.max_delay_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            # Shielded so cancelling the loop never abandons a batch mid-write
+            await asyncio.shield(self.flush())
+
+    async def flush(self):
+        """Write everything queued so far"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            self._flushing, self._pending = self._pending, {}
+            batch = list(self._flushing.values())
+            try:
+                await self.flush_batch(batch)
+                self.flushed += len(batch)
+                self.batches += 1
+            except Exception as e:
+                self.failures += 1
+                logger.warning("Write-behind flush of %d documents failed: %s", len(batch), e)
+                if not await self._fall_back(batch):
+                    # Keep them for the next flush, behind anything queued meanwhile
+                    self._pending = {**self._flushing, **self._pending}
+            finally:
+                self._flushing = {}
+
+    async def _fall_back(self, batch: List[dict]) -> bool:
+        if self.fallback is None:
+            return False
+        try:
+            await self.fallback(batch)
+            return True
+        except Exception as e:
+            logger.error("Write-behind fallback for %d documents failed: %s", len(batch), e)
+            return False
+
+    async def close(self):
+        """Stop the background task and flush whatever is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": len(self._pending),
+            "in_flight": len(self._flushing),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failures": self.failures,
+        }
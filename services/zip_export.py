@@ -0,0 +1,52 @@
+import io
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator, List, Tuple
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back in chunks
+
+    zipfile detects that it cannot seek and writes data descriptors after
+    each member, which is what makes streaming an archive possible.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(entries: AsyncIterator[Tuple[str, bytes]]) -> AsyncIterator[bytes]:
+    """Build a ZIP archive from (filename, data) pairs, yielding bytes as each member is added
+
+    Only the member currently being written is held in memory. PDFs are
+    already compressed, so members are stored rather than deflated.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        async for filename, data in entries:
+            info = zipfile.ZipInfo(filename, date_time=datetime.now().timetuple()[:6])
+            archive.writestr(info, data)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    # Closing the archive writes the central directory
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
@@ -43,12 +43,7 @@ class ResumeBuilder {
         
         try {
             const formData = new FormData(this.form);
-            const response = await fetch('/generate-resume', {
-                method: 'POST',
-                body: formData
-            });
-            
-            const result = await response.json();
+            const result = await this.generateResumeStreaming(formData);
             
             if (result.success) {
                 this.currentResumeData = result.resume;
@@ -66,6 +61,101 @@ class ResumeBuilder {
         }
     }
     
+    async generateResumeStreaming(formData) {
+        // Fall back to the single-shot endpoint where response streaming isn't supported
+        if (!window.ReadableStream || !window.TextDecoder) {
+            const response = await fetch('/generate-resume', {
+                method: 'POST',
+                body: formData
+            });
+            return response.json();
+        }
+        
+        const response = await fetch('/generate-resume/stream', {
+            method: 'POST',
+            body: formData
+        });
+        
+        if (!response.ok || !response.body) {
+            throw new Error(`Streaming request failed: ${response.status}`);
+        }
+        
+        // Seed the preview with what we already know from the form
+        const partialResume = {
+            name: formData.get('name'),
+            contact_info: {
+                email: formData.get('email'),
+                phone: formData.get('phone')
+            }
+        };
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let firstSection = true;
+        
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            
+            buffer += decoder.decode(value, { stream: true });
+            
+            // SSE frames are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                const { event, data } = this.parseSSEFrame(frame);
+                if (!data) continue;
+                
+                if (event === 'section') {
+                    partialResume[data.section] = data.value;
+                    if (firstSection) {
+                        // Content is arriving, swap the modal for the live preview
+                        this.hideLoading();
+                        firstSection = false;
+                    }
+                    this.displayPartialResume(partialResume);
+                } else if (event === 'complete') {
+                    return data;
+                } else if (event === 'error') {
+                    throw new Error(data.detail);
+                }
+            }
+        }
+        
+        throw new Error('Resume stream ended unexpectedly');
+    }
+    
+    parseSSEFrame(frame) {
+        let event = 'message';
+        const dataLines = [];
+        
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+        
+        if (dataLines.length === 0) {
+            return { event, data: null };
+        }
+        
+        try {
+            return { event, data: JSON.parse(dataLines.join('\n')) };
+        } catch (error) {
+            console.error('Invalid stream frame:', frame);
+            return { event, data: null };
+        }
+    }
+    
+    displayPartialResume(partialResume) {
+        this.previewContent.innerHTML = this.generateResumeHTML(partialResume);
+    }
+    
     validateForm() {
         const requiredFields = [
             'name', 'email', 'phone', 'experience_level', 
@@ -106,6 +196,10 @@ class ResumeBuilder {
     }
     
     generateResumeHTML(data) {
+        // Sections that have not streamed in yet show a placeholder
+        const pending = '<div class="text-muted"><span class="spinner-border spinner-border-sm me-2"></span>Generating...</div>';
+        const section = (value, render) => value === undefined ? pending : render(value);
+        
         return `
             <div class="resume-content">
                 <!-- Header -->
@@ -119,25 +213,25 @@ class ResumeBuilder {
                 <!-- Professional Summary -->
                 <div class="resume-section">
                     <h2 class="resume-section-title">Professional Summary</h2>
-                    <div class="resume-summary">${data.summary}</div>
+                    ${section(data.summary, summary => `<div class="resume-summary">${summary}</div>`)}
                 </div>
                 
                 <!-- Education -->
                 <div class="resume-section">
                     <h2 class="resume-section-title">Education</h2>
-                    ${this.generateEducationHTML(data.education)}
+                    ${section(data.education, education => this.generateEducationHTML(education))}
                 </div>
                 
                 <!-- Skills -->
                 <div class="resume-section">
                     <h2 class="resume-section-title">Technical Skills</h2>
-                    ${this.generateSkillsHTML(data.skills)}
+                    ${section(data.skills, skills => this.generateSkillsHTML(skills))}
                 </div>
                 
                 <!-- Projects -->
                 <div class="resume-section">
                     <h2 class="resume-section-title">Projects</h2>
-                    ${this.generateProjectsHTML(data.projects)}
+                    ${section(data.projects, projects => this.generateProjectsHTML(projects))}
                 </div>
             </div>
         `;
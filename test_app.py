@@ -0,0 +1,122 @@
+import asyncio
+import importlib
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+RESUME = {"name": "Ann Example", "email": "ann@example.com", "summary": "Engineer.", "skills": "Python, SQL"}
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    """main, imported against a fake Groq URL with MongoDB unreachable"""
+    directory = tmp_path_factory.mktemp("app")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("GROQ_BASE_URL", "http://groq.test")
+        patch.setenv("PDF_RENDER_WORKERS", "0")
+        patch.setenv("OFFLINE_STORE_PATH", str(directory / "offline.db"))
+        patch.setenv("PDF_STORE_DIR", str(directory / "pdf_store"))
+        main = importlib.import_module("main")
+        yield main
+        main.pdf_generator.shutdown()
+
+
+@pytest.fixture
+def client(app):
+    return TestClient(app.app)
+
+
+def test_download_pdf_is_rendered_in_memory(client, monkeypatch):
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("rendering touched the disk")
+
+    monkeypatch.setattr(tempfile, "mkdtemp", no_temp_files)
+    monkeypatch.setattr(tempfile, "mkstemp", no_temp_files)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_temp_files)
+
+    response = client.post("/download-pdf", json=RESUME)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-disposition"] == 'attachment; filename="Ann_Example_resume.pdf"'
+    assert response.content.startswith(b"%PDF")
+    assert int(response.headers["content-length"]) == len(response.content)
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ("*", True),
+    ('"other"', False),
+])
+def test_etag_matches(app, header, matches):
+    assert app.etag_matches(header, '"abc"') is matches
+
+
+def test_download_pdf_honours_if_none_match(app, client, monkeypatch):
+    first = client.post("/download-pdf", json=RESUME)
+    etag = first.headers["etag"]
+    assert etag == f'"{app.pdf_generator.cache_key(app.normalize_resume_data_for_pdf(RESUME))}"'
+
+    async def no_render(resume_data):
+        raise AssertionError("a 304 needs no render")
+
+    monkeypatch.setattr(app.pdf_generator, "generate_pdf_cached", no_render)
+    response = client.post("/download-pdf", json=RESUME, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_changed_resume_gets_a_new_etag(client):
+    first = client.post("/download-pdf", json=RESUME)
+    changed = client.post("/download-pdf", json={**RESUME, "summary": "Senior engineer."},
+                          headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+
+
+def test_repeated_downloads_are_served_from_the_pdf_cache(app, client):
+    resume = {**RESUME, "name": "Cache Example"}
+    first = client.post("/download-pdf", json=resume)
+    hits = app.pdf_generator.cache.stats()["memory"]["hits"]
+    second = client.post("/download-pdf", json=resume)
+    assert second.content == first.content
+    assert app.pdf_generator.cache.stats()["memory"]["hits"] == hits + 1
+
+
+
+def test_saved_resume_pdf_is_stored_and_deleted_with_the_resume(app, client):
+    resume_id = asyncio.run(app.db_service.save_resume("ann@example.com", {**RESUME, "name": "Stored Example"}, "Resume"))
+    url = f"/resume/{resume_id}/pdf?user_email=ann@example.com"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    resume = asyncio.run(app.db_service.get_resume_by_id(resume_id, "ann@example.com"))
+    stored_path = os.path.join(app.pdf_store.directory, resume.pdf_url.removeprefix("local://"))
+    with open(stored_path, "rb") as f:
+        assert f.read() == first.content
+
+    # Served from the store once the in-process cache has forgotten it
+    app.pdf_generator.cache.memory.clear()
+    assert client.get(url).content == first.content
+
+    assert client.delete(f"/resume/{resume_id}?user_email=ann@example.com").status_code == 200
+    assert not os.path.exists(stored_path)
+
+
+def test_metrics_exposition_includes_app_collectors(client):
+    client.post("/download-pdf", json=RESUME)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    lines = response.text.splitlines()
+    assert "# TYPE resume_builder_cache_hits_total counter" in lines
+    assert 'resume_builder_circuit_breaker_open{dependency="mongodb"} 0' in lines
+    assert "resume_builder_pdf_renders_pending 0" in lines
+    assert any(line.startswith('resume_builder_stage_seconds_count{endpoint="pdf",stage="normalize"}') for line in lines)
+    assert all(line.startswith("#") or len(line.rsplit(" ", 1)) == 2 for line in lines if line)
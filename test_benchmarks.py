@@ -0,0 +1,35 @@
+import json
+import os
+
+from benchmarks.run import compare
+
+
+def results(**cases):
+    return {"results": {name: {"p50_ms": p50, "peak_memory_kb": peak} for name, (p50, peak) in cases.items()}}
+
+
+def test_compare_flags_regressions_beyond_the_tolerance():
+    baseline = results(fast=(1.0, 100.0), lean=(1.0, 100.0))
+    current = results(fast=(1.5, 100.0), lean=(1.0, 200.0))
+    regressions = compare(current, baseline, tolerance=0.25)
+    assert regressions == [
+        "fast: p50_ms 1.5 vs baseline 1.0 (+50%)",
+        "lean: peak_memory_kb 200.0 vs baseline 100.0 (+100%)",
+    ]
+    assert compare(current, baseline, tolerance=1.0) == []
+
+
+def test_compare_ignores_noise_and_missing_cases():
+    baseline = results(tiny=(0.002, 1.0), gone=(1.0, 1.0))
+    # Triple the baseline, but within the timer and allocator noise floors
+    current = results(tiny=(0.006, 3.0), new=(100.0, 1000.0))
+    assert compare(current, baseline, tolerance=0.25) == []
+
+
+def test_committed_baseline_is_comparable():
+    path = os.path.join(os.path.dirname(__file__), "benchmarks", "baseline.json")
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    for name, result in baseline["results"].items():
+        assert {"p50_ms", "peak_memory_kb"} <= set(result), name
+    assert compare(baseline, baseline, tolerance=0) == []
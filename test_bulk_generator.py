@@ -0,0 +1,110 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from services.bulk_generator import BulkResumeGenerator, BulkUploadTooLarge, parse_bulk_upload, read_upload
+from services.database_service import PartialSaveError
+
+
+def row(n):
+    return {
+        "name": f"Student {n}",
+        "email": f"s{n}@example.com",
+        "phone": "555-123-4567",
+        "experience_level": "entry",
+        "target_role": "Engineer",
+        "skills": "Python",
+        "education": "BSc",
+        "projects": "A project",
+    }
+
+
+class Upload:
+    def __init__(self, content):
+        self.file = io.BytesIO(content)
+
+    async def read(self, size=-1):
+        return self.file.read(size)
+
+
+def test_parse_jsonl_reports_bad_lines():
+    content = b'{"name": "A"}\n\nnot json\n[1]\n'
+    rows = parse_bulk_upload("cohort.jsonl", content)
+    assert rows[0] == {"name": "A"}
+    assert rows[1]["__error__"].startswith("Invalid JSON on line 3")
+    assert rows[2] == {"__error__": "Line 4 is not an object"}
+
+
+def test_parse_csv():
+    rows = parse_bulk_upload("cohort.csv", "﻿name,email\nA,a@example.com\n".encode("utf-8"))
+    assert rows == [{"name": "A", "email": "a@example.com"}]
+
+
+@pytest.mark.parametrize("filename, content", [
+    ("cohort.csv", b"name\n" + b"A\n" * 3),
+    ("cohort.jsonl", b'{"name": "A"}\n' * 3),
+])
+def test_parse_stops_past_the_row_limit(filename, content):
+    assert len(parse_bulk_upload(filename, content, max_rows=3)) == 3
+    with pytest.raises(BulkUploadTooLarge, match="more than 2 rows"):
+        parse_bulk_upload(filename, content, max_rows=2)
+
+
+def test_read_upload_stops_past_the_size_limit():
+    async def scenario():
+        assert await read_upload(Upload(b"x" * 10), max_bytes=10, chunk_size=4) == b"x" * 10
+        upload = Upload(b"x" * 100)
+        with pytest.raises(BulkUploadTooLarge):
+            await read_upload(upload, max_bytes=10, chunk_size=4)
+        # Stopped reading right after the limit
+        assert upload.file.tell() == 12
+
+    asyncio.run(scenario())
+
+
+class Generator:
+    async def generate_resume_waiting(self, resume_request, max_overload_retries):
+        if resume_request.name == "Student 2":
+            raise RuntimeError("LLM failed")
+        return {"name": resume_request.name}
+
+
+class Database:
+    def __init__(self, fail_index=None):
+        self.fail_index = fail_index
+        self.users = []
+        self.saved = []
+
+    async def create_or_get_users(self, users):
+        self.users.extend(users)
+
+    async def save_resumes(self, resumes):
+        resume_ids = [f"id-{resume['resume_data']['name']}" for resume in resumes]
+        if self.fail_index is not None:
+            resume_ids[self.fail_index] = None
+            raise PartialSaveError(resume_ids, {self.fail_index: "duplicate"})
+        self.saved.extend(resumes)
+        return resume_ids
+
+
+def test_run_reports_every_row():
+    db = Database()
+    rows = [row(1), row(2), {"name": "incomplete"}, row(4)]
+    report = asyncio.run(BulkResumeGenerator(Generator(), db, concurrency=2).run(rows))
+
+    assert (report["total"], report["saved"], report["failed"], report["invalid"]) == (4, 2, 1, 1)
+    assert [result["status"] for result in report["rows"]] == ["saved", "failed", "invalid", "saved"]
+    assert report["rows"][0]["resume_id"] == "id-Student 1"
+    assert len(db.users) == 3
+
+
+def test_partial_save_only_fails_the_rows_that_were_not_written():
+    report = asyncio.run(BulkResumeGenerator(Generator(), Database(fail_index=0), concurrency=1).run([row(1), row(3)]))
+    assert [(result["status"], result.get("resume_id")) for result in report["rows"]] == [
+        ("generated", None),
+        ("saved", "id-Student 3"),
+    ]
+    # The report is stored as the job result
+    assert json.loads(json.dumps(report)) == report
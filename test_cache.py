@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+
+from services import cache
+from services.cache import DiskCacheTier, LocalSharedCacheTier, LRUCache, TieredCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return time.time()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache, "time", fake)
+    return fake
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(max_entries=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert lru.evictions == 1
+
+
+def test_lru_respects_byte_budget():
+    lru = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+    lru.set("a", b"12345")
+    lru.set("b", b"12345")
+    lru.set("c", b"123")
+    assert lru.get("a") is None
+    assert lru.current_bytes == 8
+    # Larger than the whole budget: never cached
+    lru.set("d", b"x" * 11)
+    assert lru.get("d") is None
+    assert lru.current_bytes == 8
+
+
+def test_lru_overwrite_updates_size():
+    lru = LRUCache(max_bytes=100, sizeof=len)
+    lru.set("a", b"12345")
+    lru.set("a", b"12")
+    assert lru.current_bytes == 2
+    lru.delete("a")
+    assert lru.current_bytes == 0
+    assert len(lru) == 0
+
+
+def test_lru_ttl_expiry(clock):
+    lru = LRUCache(ttl_seconds=10)
+    lru.set("a", 1)
+    clock.now += 5
+    assert lru.get("a") == 1
+    clock.now += 6
+    assert lru.get("a") is None
+    assert len(lru) == 0
+    assert lru.stats()["misses"] == 1
+
+
+def test_lru_purge_expired(clock):
+    lru = LRUCache(ttl_seconds=10)
+    lru.set("old", 1)
+    clock.now += 6
+    lru.set("new", 2)
+    clock.now += 6
+    assert lru.purge_expired() == 1
+    assert lru.get("new") == 2
+
+
+def test_tiered_cache_reads_through_the_second_tier(tmp_path):
+    async def scenario():
+        tier = DiskCacheTier(str(tmp_path))
+        first = TieredCache(LRUCache(), tier=tier, encode=str.encode, decode=bytes.decode)
+        await first.set("abcdef", "value")
+
+        # A fresh memory tier finds the value on disk and keeps it in memory
+        second = TieredCache(LRUCache(), tier=tier, encode=str.encode, decode=bytes.decode)
+        assert await second.get("abcdef") == "value"
+        assert second.tier_hits == 1
+        assert second.memory.get("abcdef") == "value"
+
+        await second.delete("abcdef")
+        assert await TieredCache(LRUCache(), tier=tier).get("abcdef") is None
+
+    asyncio.run(scenario())
+
+
+def test_tiered_cache_treats_tier_errors_as_misses():
+    class BrokenTier:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, data):
+            raise ConnectionError("down")
+
+        async def delete(self, key):
+            raise ConnectionError("down")
+
+    async def scenario():
+        tiered = TieredCache(None, tier=BrokenTier())
+        await tiered.set("a", b"1")
+        assert await tiered.get("a") is None
+        await tiered.delete("a")
+        assert tiered.stats()["misses"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_local_shared_tier_is_bounded(clock):
+    async def scenario():
+        tier = LocalSharedCacheTier(ttl_seconds=10, max_entries=2)
+        await tier.set("a", b"1")
+        await tier.set("b", b"2")
+        await tier.set("c", b"3")
+        assert await tier.get("a") is None
+        assert await tier.get("c") == b"3"
+
+        # Expired entries are swept out by a later write
+        clock.now += 11
+        await tier.set("d", b"4")
+        assert len(tier._values) == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+def fail(breaker, times=1):
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            with breaker.track((ConnectionError,)):
+                raise ConnectionError("down")
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("db", failure_threshold=3, reset_timeout_seconds=10)
+    fail(breaker, 2)
+    assert breaker.state == CLOSED
+    fail(breaker)
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 1
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert breaker.retry_after() == pytest.approx(10)
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("db", failure_threshold=2)
+    fail(breaker)
+    with breaker.track((ConnectionError,)):
+        pass
+    fail(breaker)
+    assert breaker.state == CLOSED
+
+
+def test_other_errors_do_not_count(clock):
+    breaker = CircuitBreaker("db", failure_threshold=1)
+    with pytest.raises(ValueError):
+        with breaker.track((ConnectionError,)):
+            raise ValueError("bad input")
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout_seconds=10, half_open_max_calls=1)
+    fail(breaker)
+    clock.now += 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout_seconds=10)
+    fail(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    fail(breaker)
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    assert breaker.retry_after() == pytest.approx(10)
+
+
+def test_unrelated_error_frees_the_probe_slot(clock):
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout_seconds=10)
+    fail(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    with pytest.raises(ValueError):
+        with breaker.track((ConnectionError,)):
+            raise ValueError("bad input")
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_trip_and_reset(clock):
+    breaker = CircuitBreaker("db")
+    breaker.trip()
+    assert breaker.state == OPEN
+    breaker.reset()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["times_opened"] == 1
@@ -0,0 +1,298 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError, OperationFailure
+
+from services.circuit_breaker import CLOSED, HALF_OPEN
+from services.database_service import DatabaseService, InvalidCursor
+
+
+def test_cursor_round_trip():
+    updated_at = datetime(2026, 10, 17, 12, 30, 0, 123456)
+    resume_id = ObjectId()
+    cursor = DatabaseService.encode_cursor(updated_at, resume_id)
+    assert DatabaseService.decode_cursor(cursor) == (updated_at, resume_id)
+
+
+def test_cursor_is_url_safe():
+    cursor = DatabaseService.encode_cursor(datetime(2026, 1, 1), ObjectId())
+    assert all(character.isalnum() or character in "-_=" for character in cursor)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    "e30=",  # {}
+    DatabaseService.encode_cursor(datetime(2026, 1, 1), ObjectId())[:-8],
+])
+def test_malformed_cursor_raises_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        DatabaseService.decode_cursor(cursor)
+
+
+def test_invalid_cursor_is_a_value_error():
+    assert issubclass(InvalidCursor, ValueError)
+
+
+def test_breaker_only_sees_real_driver_calls(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_WRITE_BEHIND", "1")
+    monkeypatch.setenv("OFFLINE_STORE_PATH", str(tmp_path / "offline.db"))
+
+    async def scenario():
+        db = DatabaseService()
+        db.connected = True
+        written = []
+
+        async def flush_batch(batch):
+            written.extend(batch)
+
+        db.write_behind.flush_batch = flush_batch
+
+        async def driver_failure():
+            raise ConnectionFailure("down")
+
+        with pytest.raises(ConnectionFailure):
+            await db._mongo(driver_failure())
+        assert db.breaker.stats()["consecutive_failures"] == 1
+
+        # Answered by the write-behind buffer without touching MongoDB
+        resume_id = await db.save_resume("a@example.com", {"name": "A"}, "Resume")
+        assert (await db.get_resume_by_id(resume_id, "a@example.com")).title == "Resume"
+        assert db.breaker.stats()["consecutive_failures"] == 1
+
+        async def driver_success():
+            return "ok"
+
+        assert await db._mongo(driver_success()) == "ok"
+        assert db.breaker.stats()["consecutive_failures"] == 0
+
+        await db.write_behind.close()
+        assert [doc["_id"] for doc in written] == [ObjectId(resume_id)]
+
+    asyncio.run(scenario())
+
+
+def test_write_behind_keeps_a_copy_of_the_resume_data(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_WRITE_BEHIND", "1")
+    monkeypatch.setenv("OFFLINE_STORE_PATH", str(tmp_path / "offline.db"))
+
+    async def scenario():
+        db = DatabaseService()
+        db.connected = True
+        written = []
+
+        async def flush_batch(batch):
+            written.extend(batch)
+
+        db.write_behind.flush_batch = flush_batch
+        resume_data = {"name": "A"}
+        resume_id = await db.save_resume("a@example.com", resume_data, "Resume")
+        # What the endpoint does with the response body
+        resume_data["_id"] = resume_id
+
+        await db.write_behind.close()
+        assert written[0]["resume_data"] == {"name": "A"}
+
+    asyncio.run(scenario())
+
+
+def test_probe_frees_the_half_open_slot_on_unexpected_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv("OFFLINE_STORE_PATH", str(tmp_path / "offline.db"))
+
+    class Admin:
+        error = RuntimeError("unexpected")
+
+        async def command(self, name):
+            if self.error:
+                raise self.error
+            return {"ok": 1}
+
+    async def scenario():
+        db = DatabaseService()
+        db.connected = True
+        db.client = SimpleNamespace(admin=Admin())
+        db._start_replay = lambda: None
+        db.breaker.trip()
+        db.breaker._opened_at -= db.breaker.reset_timeout_seconds
+
+        with pytest.raises(RuntimeError):
+            await db.probe()
+        assert db.breaker.state == HALF_OPEN
+
+        db.client.admin.error = None
+        await db.probe()
+        assert db.breaker.state == CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_replay_moves_rejected_documents_aside(tmp_path, monkeypatch):
+    monkeypatch.setenv("OFFLINE_STORE_PATH", str(tmp_path / "offline.db"))
+
+    class Resumes:
+        def __init__(self):
+            self.written = []
+
+        async def bulk_write(self, operations, ordered):
+            documents = [operation._doc for operation in operations]
+            rejected = [index for index, doc in enumerate(documents) if doc["title"] == "poison"]
+            self.written.extend(doc["title"] for doc in documents if doc["title"] != "poison")
+            if rejected:
+                raise BulkWriteError({"writeErrors": [
+                    {"index": index, "code": 121, "errmsg": "Document failed validation"} for index in rejected
+                ]})
+
+    async def scenario():
+        db = DatabaseService()
+        db.replay_batch_size = 2
+        db.db = SimpleNamespace(resumes=Resumes())
+        titles = ["A", "poison", "B", "C"]
+        await db.offline_store.save_resumes([
+            {"user_email": "a@example.com", "resume_data": {}, "title": title} for title in titles
+        ])
+
+        assert await db.replay_offline_writes() == 3
+        assert sorted(db.db.resumes.written) == ["A", "B", "C"]
+        stats = await db.offline_store.stats()
+        assert (stats["pending_resumes"], stats["dead_letters"]) == (0, 1)
+        (dead,) = await db.offline_store.dead_letters()
+        assert dead["error"] == "Document failed validation"
+        db.offline_store.close()
+
+    asyncio.run(scenario())
+
+
+def test_ensure_indexes_keeps_going_past_a_failed_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("OFFLINE_STORE_PATH", str(tmp_path / "offline.db"))
+
+    class Collection:
+        def __init__(self, error=None):
+            self.error = error
+            self.created = []
+
+        async def create_indexes(self, models):
+            if self.error:
+                raise self.error
+            self.created.extend(model.document for model in models)
+
+    async def scenario():
+        db = DatabaseService()
+        db.db = {"users": Collection(OperationFailure("E11000 duplicate key")), "resumes": Collection()}
+        await db.ensure_indexes()
+
+        (index,) = db.db["resumes"].created
+        assert index["name"] == "user_active_updated_id"
+        assert list(index["key"]) == ["user_email", "is_active", "updated_at", "_id"]
+
+        db.db["users"].error = None
+        await db.ensure_indexes()
+        (index,) = db.db["users"].created
+        assert (index["name"], index["unique"]) == ("email_unique", True)
+        db.offline_store.close()
+
+    asyncio.run(scenario())
+
+
+def test_login_upsert_retries_after_losing_the_insert_race(tmp_path, monkeypatch):
+    monkeypatch.setenv("OFFLINE_STORE_PATH", str(tmp_path / "offline.db"))
+
+    class Users:
+        def __init__(self):
+            self.calls = []
+
+        async def find_one_and_update(self, query, update, upsert, return_document):
+            self.calls.append((query, update, upsert))
+            if len(self.calls) == 1:
+                raise DuplicateKeyError("E11000 duplicate key error")
+            return {"_id": ObjectId(), "email": query["email"], "name": "First", "created_at": datetime(2026, 1, 1)}
+
+    async def scenario():
+        db = DatabaseService()
+        db.connected = True
+        db.db = SimpleNamespace(users=Users())
+
+        user = await db.create_or_get_user("a@example.com", "Second")
+        assert (user.email, user.name) == ("a@example.com", "First")
+        assert len(db.db.users.calls) == 2
+        assert all(upsert for _, _, upsert in db.db.users.calls)
+        assert db.breaker.stats()["consecutive_failures"] == 0
+        db.offline_store.close()
+
+    asyncio.run(scenario())
+
+
+def test_bulk_upsert_tolerates_only_duplicate_key_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv("OFFLINE_STORE_PATH", str(tmp_path / "offline.db"))
+
+    class Users:
+        def __init__(self, code):
+            self.code = code
+
+        async def bulk_write(self, operations, ordered):
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": self.code, "errmsg": "rejected"}]})
+
+        def find(self, query):
+            docs = [{"_id": ObjectId(), "email": email, "name": "A"} for email in query["email"]["$in"]]
+            return SimpleNamespace(to_list=lambda length: asyncio.sleep(0, docs))
+
+    async def scenario():
+        db = DatabaseService()
+        db.connected = True
+        db.db = SimpleNamespace(users=Users(11000))
+        users = await db.create_or_get_users([("a@example.com", "A"), ("b@example.com", "B")])
+        assert [user.email for user in users] == ["a@example.com", "b@example.com"]
+
+        db.db.users.code = 121
+        with pytest.raises(BulkWriteError):
+            await db.create_or_get_users([("a@example.com", "A")])
+        db.offline_store.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("backend", ["memory", "shared"])
+def test_resume_cache_is_invalidated_by_writes(tmp_path, monkeypatch, backend):
+    monkeypatch.setenv("OFFLINE_STORE_PATH", str(tmp_path / "offline.db"))
+    monkeypatch.setenv("RESUME_CACHE_BACKEND", backend)
+    resume_id = ObjectId()
+
+    class Resumes:
+        def __init__(self):
+            self.doc = {
+                "_id": resume_id, "user_email": "a@example.com", "resume_data": {"name": "A"},
+                "title": "Old", "is_active": True,
+            }
+            self.reads = 0
+
+        async def find_one(self, query):
+            self.reads += 1
+            if self.doc["is_active"] and query["_id"] == self.doc["_id"]:
+                return dict(self.doc)
+            return None
+
+        async def update_one(self, query, update):
+            self.doc.update(update["$set"])
+            return SimpleNamespace(modified_count=1)
+
+    async def scenario():
+        db = DatabaseService()
+        db.connected = True
+        db.db = SimpleNamespace(resumes=Resumes())
+        get = lambda: db.get_resume_by_id(str(resume_id), "a@example.com")
+
+        assert (await get()).title == "Old"
+        (await get()).title = "Changed by a caller"
+        assert (await get()).title == "Old"
+        assert db.db.resumes.reads == 1
+
+        await db.update_resume(str(resume_id), "a@example.com", {"name": "A"}, title="New")
+        assert (await get()).title == "New"
+        assert db.db.resumes.reads == 2
+
+        await db.delete_resume(str(resume_id), "a@example.com")
+        assert await get() is None
+        db.offline_store.close()
+
+    asyncio.run(scenario())
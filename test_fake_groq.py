@@ -0,0 +1,61 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from loadtest.fake_groq import FakeGroqConfig, create_app
+from services.llm_scheduler import LLMScheduler, parse_reset_duration
+
+
+def client(**options):
+    config = FakeGroqConfig(latency="fixed", latency_ms=0, tokens_per_second=0, **options)
+    return TestClient(create_app(config))
+
+
+def complete(fake, max_tokens=100):
+    return fake.post("/openai/v1/chat/completions", json={
+        "model": "fake-model",
+        "max_tokens": max_tokens,
+        "messages": [{"role": "user", "content": "- Name: Ann Example"}],
+    })
+
+
+def test_headers_report_daily_requests_and_per_minute_tokens():
+    fake = client(requests_per_day=1000, tokens_per_minute=60000)
+    first, second = complete(fake), complete(fake)
+    assert first.status_code == second.status_code == 200
+    assert first.json()["choices"][0]["message"]["content"]
+
+    assert second.headers["x-ratelimit-limit-requests"] == "1000"
+    assert second.headers["x-ratelimit-remaining-requests"] == "998"
+    assert parse_reset_duration(second.headers["x-ratelimit-reset-requests"]) == pytest.approx(172.8)
+    assert second.headers["x-ratelimit-limit-tokens"] == "60000"
+    used = 60000 - int(second.headers["x-ratelimit-remaining-tokens"])
+    assert used > 2 * first.json()["usage"]["completion_tokens"]
+    assert parse_reset_duration(second.headers["x-ratelimit-reset-tokens"]) == pytest.approx(used / 1000, abs=0.1)
+
+
+def test_token_budget_is_enforced_with_429s():
+    fake = client(tokens_per_minute=2000)
+    assert complete(fake, max_tokens=1000).status_code == 200
+    limited = complete(fake, max_tokens=1900)
+    assert limited.status_code == 429
+    assert limited.json()["error"]["type"] == "tokens"
+    assert float(limited.headers["retry-after"]) > 0
+
+
+def test_per_minute_request_budget_only_shows_up_as_429s():
+    fake = client(requests_per_minute=1)
+    assert complete(fake).status_code == 200
+    limited = complete(fake)
+    assert limited.status_code == 429
+    assert limited.json()["error"]["type"] == "requests"
+    assert limited.headers["x-ratelimit-remaining-requests"] == "14399"
+
+
+def test_headers_feed_the_scheduler_token_bucket():
+    response = complete(client(tokens_per_minute=30000))
+    scheduler = LLMScheduler()
+    requests_before = scheduler.requests.capacity
+    scheduler._update_from_headers(response.headers)
+    assert scheduler.tokens.capacity == 30000
+    assert scheduler.tokens.available == int(response.headers["x-ratelimit-remaining-tokens"])
+    assert scheduler.requests.capacity == requests_before
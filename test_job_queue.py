@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from services.job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, InMemoryJobStore, JobQueue
+
+
+async def wait_for_status(queue, job_id, *statuses):
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"job {job_id} stuck in {job['status']}")
+
+
+def test_jobs_run_to_success_or_failure():
+    async def scenario():
+        queue = JobQueue(workers=1, poll_seconds=0.05)
+        gate = asyncio.Event()
+
+        async def echo(payload):
+            await gate.wait()
+            return {"echo": payload["value"]}
+
+        async def fail(payload):
+            raise RuntimeError("boom")
+
+        queue.register("echo", echo)
+        queue.register("fail", fail)
+        await queue.start()
+        try:
+            job_id = await queue.submit("echo", {"value": 1})
+            assert (await queue.get(job_id))["status"] in (QUEUED, RUNNING)
+            assert (await wait_for_status(queue, job_id, RUNNING))["started_at"] is not None
+
+            gate.set()
+            job = await wait_for_status(queue, job_id, SUCCEEDED)
+            assert job["result"] == {"echo": 1}
+            assert job["finished_at"] is not None
+
+            job = await wait_for_status(queue, await queue.submit("fail", {}), FAILED)
+            assert job["error"] == "boom"
+        finally:
+            await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_unknown_job_kind_is_rejected_on_submit():
+    async def scenario():
+        with pytest.raises(ValueError):
+            await JobQueue().submit("missing", {})
+
+    asyncio.run(scenario())
+
+
+def test_stopping_fails_running_in_memory_jobs():
+    async def scenario():
+        queue = JobQueue(workers=1, poll_seconds=0.05)
+
+        async def forever(payload):
+            await asyncio.Event().wait()
+
+        queue.register("forever", forever)
+        await queue.start()
+        job_id = await queue.submit("forever", {})
+        await wait_for_status(queue, job_id, RUNNING)
+        await queue.stop()
+
+        job = await queue.get(job_id)
+        assert (job["status"], job["error"]) == (FAILED, "Interrupted by shutdown")
+
+    asyncio.run(scenario())
+
+
+def test_in_memory_store_returns_copies():
+    async def scenario():
+        store = InMemoryJobStore()
+        queue = JobQueue(store=store)
+        queue.register("echo", lambda payload: payload)
+        job_id = await queue.submit("echo", {})
+
+        (await store.get(job_id))["status"] = FAILED
+        assert (await store.get(job_id))["status"] == QUEUED
+        claimed = await store.claim()
+        assert claimed["_id"] == job_id and claimed["status"] == RUNNING
+        assert await store.claim() is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,217 @@
+import asyncio
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+from services import llm_scheduler
+from services.circuit_breaker import CircuitBreaker
+from services.llm_scheduler import LLMScheduler, SchedulerOverloaded, TokenBucket, parse_reset_duration
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_scheduler, "time", fake)
+    return fake
+
+
+def api_error(error_type, status_code, headers=None):
+    response = httpx.Response(status_code, headers=headers or {}, request=httpx.Request("POST", "http://groq.test"))
+    return error_type("error", response=response, body=None)
+
+
+def ok_response(headers=None):
+    return SimpleNamespace(headers=headers or {})
+
+
+def scheduler(**kwargs):
+    options = dict(max_retries=2, backoff_base_seconds=0, backoff_max_seconds=0, max_wait_seconds=5)
+    options.update(kwargs)
+    return LLMScheduler(**options)
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("7.66s", 7.66),
+    ("2m59.56s", 179.56),
+    ("120ms", 0.12),
+    ("1h", 3600),
+    ("3", 3.0),
+])
+def test_parse_reset_duration(value, seconds):
+    assert parse_reset_duration(value) == pytest.approx(seconds)
+
+
+@pytest.mark.parametrize("value", [None, "", "soon"])
+def test_parse_reset_duration_rejects_garbage(value):
+    assert parse_reset_duration(value) is None
+
+
+def test_token_bucket_refills_per_minute(clock):
+    bucket = TokenBucket(60)
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.now += 30
+    assert bucket.wait_time(30) == 0
+    # Amounts larger than the bucket only wait for a full bucket
+    assert bucket.wait_time(1000) == pytest.approx(30)
+
+
+def test_token_bucket_update_keeps_per_minute_refill(clock):
+    bucket = TokenBucket(6000)
+    bucket.update(12000, 100)
+    assert bucket.capacity == 12000
+    assert bucket.available == 100
+    assert bucket.refill_per_second == pytest.approx(200)
+    # Remaining can't exceed the capacity
+    bucket.update(None, 50000)
+    assert bucket.available == 12000
+
+
+def test_request_headers_do_not_refill_the_request_bucket(clock):
+    llm = scheduler(requests_per_minute=30)
+    llm.requests.consume(30)
+    llm._update_from_headers({
+        "x-ratelimit-limit-requests": "14400",
+        "x-ratelimit-remaining-requests": "14000",
+        "x-ratelimit-reset-requests": "2m59.56s",
+        "x-ratelimit-limit-tokens": "18000",
+        "x-ratelimit-remaining-tokens": "17000",
+    })
+    assert llm.requests.available == pytest.approx(0)
+    assert llm.requests.refill_per_second == pytest.approx(0.5)
+    assert llm.tokens.available == 17000
+
+
+def test_rate_limited_call_is_retried():
+    async def scenario():
+        llm = scheduler()
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise api_error(groq.RateLimitError, 429, {"retry-after": "0"})
+            return ok_response()
+
+        await llm.submit(call, estimated_tokens=10)
+        assert attempts == 2
+        assert llm.retries == 1
+        assert llm.running == 0
+
+    asyncio.run(scenario())
+
+
+def test_persistent_rate_limiting_raises_overloaded():
+    async def scenario():
+        llm = scheduler(max_retries=1)
+
+        async def call():
+            raise api_error(groq.RateLimitError, 429, {"retry-after": "0.01"})
+
+        with pytest.raises(SchedulerOverloaded) as raised:
+            await llm.submit(call, estimated_tokens=10)
+        assert raised.value.retry_after == 1
+        assert llm.rejected == 1
+        assert llm.running == 0
+
+    asyncio.run(scenario())
+
+
+def test_server_errors_are_retried_then_raised_and_trip_the_breaker():
+    async def scenario():
+        breaker = CircuitBreaker("groq", failure_threshold=1)
+        llm = scheduler(max_retries=1, breaker=breaker)
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            raise api_error(groq.InternalServerError, 500)
+
+        with pytest.raises(groq.InternalServerError):
+            await llm.submit(call, estimated_tokens=10)
+        assert attempts == 2
+        with pytest.raises(SchedulerOverloaded):
+            await llm.submit(call, estimated_tokens=10)
+        assert attempts == 2
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_immediately():
+    async def scenario():
+        llm = scheduler(max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def slow_call():
+            await release.wait()
+            return ok_response()
+
+        running = asyncio.ensure_future(llm.submit(slow_call, estimated_tokens=1))
+        while not llm.running:
+            await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(llm.submit(slow_call, estimated_tokens=1))
+        await asyncio.sleep(0)
+        assert (llm.running, llm.waiting) == (1, 1)
+
+        with pytest.raises(SchedulerOverloaded, match="queue is full"):
+            await llm.submit(slow_call, estimated_tokens=1)
+        assert llm.rejected == 1
+
+        release.set()
+        await asyncio.gather(running, waiting)
+        assert (llm.running, llm.waiting) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_waiting_too_long_for_a_slot_raises_overloaded():
+    async def scenario():
+        llm = scheduler(max_concurrency=1, max_wait_seconds=0.05)
+        await llm.submit(lambda: asyncio.sleep(0, ok_response()), estimated_tokens=1, hold_slot=True)
+
+        with pytest.raises(SchedulerOverloaded, match="Timed out"):
+            await llm.submit(lambda: asyncio.sleep(0, ok_response()), estimated_tokens=1)
+        assert llm.waiting == 0
+
+    asyncio.run(scenario())
+
+
+def test_held_slot_is_kept_until_released():
+    async def scenario():
+        llm = scheduler(max_concurrency=1)
+        await llm.submit(lambda: asyncio.sleep(0, ok_response()), estimated_tokens=1, hold_slot=True)
+        assert llm.running == 1
+
+        llm.release_slot()
+        assert llm.running == 0
+        await asyncio.wait_for(
+            llm.submit(lambda: asyncio.sleep(0, ok_response()), estimated_tokens=1), timeout=1
+        )
+
+    asyncio.run(scenario())
+
+
+def test_failed_call_releases_a_held_slot():
+    async def scenario():
+        llm = scheduler(max_concurrency=1, max_retries=0)
+
+        async def call():
+            raise api_error(groq.BadRequestError, 400)
+
+        with pytest.raises(groq.BadRequestError):
+            await llm.submit(call, estimated_tokens=1, hold_slot=True)
+        assert llm.running == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,99 @@
+import json
+import logging
+
+import pytest
+
+from services.logging_config import JSONFormatter, RequestContextFilter, parse_sample_rates, redact
+from services.tracing import request_id_var, request_path_var
+
+
+@pytest.mark.parametrize("text", [
+    "+1 555 123 4567",
+    "+44 20 7946 0958",
+    "(555) 123-4567",
+    "555-123-4567",
+    "555.123.4567",
+    "98765 43210",
+])
+def test_redact_masks_phone_numbers(text):
+    assert redact(f"call {text} today") == "call <phone> today"
+
+
+@pytest.mark.parametrize("text", [
+    "PDF generated successfully (123456789 bytes)",
+    "ids 123 456 789 012",
+    "took 0.123456789s",
+    "resume 65f1c2a9e4b0a1b2c3d4e5f6 saved",
+    "2026-10-17 12:30:00",
+    "order 1234567890123",
+])
+def test_redact_keeps_numbers_that_are_not_phones(text):
+    assert redact(text) == text
+
+
+def test_redact_hashes_emails_stably():
+    first = redact("login from Jane.Doe@example.com")
+    second = redact("login from jane.doe@example.com")
+    assert first == second
+    assert "example.com" not in first
+    assert first.startswith("login from <email:")
+
+
+def _record(level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, "message", (), None)
+
+
+def _filter_in_request(log_filter, request_id, path, level=logging.INFO):
+    id_token = request_id_var.set(request_id)
+    path_token = request_path_var.set(path)
+    try:
+        record = _record(level)
+        return log_filter.filter(record), record
+    finally:
+        request_id_var.reset(id_token)
+        request_path_var.reset(path_token)
+
+
+def test_request_context_filter_tags_records():
+    kept, record = _filter_in_request(RequestContextFilter(), "abc123", "/generate-resume")
+    assert kept
+    assert record.request_id == "abc123"
+    assert record.http_path == "/generate-resume"
+
+
+def test_request_context_filter_samples_per_request():
+    log_filter = RequestContextFilter({"/download-pdf": 0.0, "/resume": 1.0})
+    assert not _filter_in_request(log_filter, "abc123", "/download-pdf")[0]
+    assert _filter_in_request(log_filter, "abc123", "/resume/1")[0]
+    assert log_filter.sampled_out == 1
+
+
+def test_request_context_filter_never_samples_warnings():
+    log_filter = RequestContextFilter({"/download-pdf": 0.0})
+    assert _filter_in_request(log_filter, "abc123", "/download-pdf", logging.WARNING)[0]
+
+
+def test_request_context_filter_decision_is_stable_per_request():
+    log_filter = RequestContextFilter({"/": 0.5})
+    for request_id in ("a", "b", "c", "d"):
+        decisions = {_filter_in_request(log_filter, request_id, "/x")[0] for _ in range(5)}
+        assert len(decisions) == 1
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("/download-pdf=0.1, /generate-resume=0.5,") == {
+        "/download-pdf": 0.1,
+        "/generate-resume": 0.5,
+    }
+
+
+def test_json_formatter_redacts_the_request_path():
+    log_filter = RequestContextFilter()
+    _, record = _filter_in_request(log_filter, "abc123", "/user/ann@example.com/resumes/export.zip")
+    entry = json.loads(JSONFormatter().format(record))
+    assert "ann@example.com" not in entry["path"]
+    assert entry["path"].startswith("/user/<email:")
+    assert entry["path"].endswith("/resumes/export.zip")
+
+    entry = json.loads(JSONFormatter(redact_pii=False).format(record))
+    assert entry["path"] == "/user/ann@example.com/resumes/export.zip"
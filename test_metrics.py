@@ -0,0 +1,74 @@
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from services.metrics import MetricsRegistry, MongoPoolMetrics
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_render_uses_the_prometheus_text_format(registry):
+    requests = registry.counter("app_requests_total", "Requests", ("route",))
+    requests.inc(route="/a")
+    requests.inc(2, route='/b"x')
+    registry.gauge("app_queue_depth", "Queued jobs").set(3)
+
+    assert registry.render() == (
+        "# HELP app_requests_total Requests\n"
+        "# TYPE app_requests_total counter\n"
+        'app_requests_total{route="/a"} 1\n'
+        'app_requests_total{route="/b\\"x"} 2\n'
+        "# HELP app_queue_depth Queued jobs\n"
+        "# TYPE app_queue_depth gauge\n"
+        "app_queue_depth 3\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    latency = registry.histogram("app_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, stage="render")
+
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'app_seconds_bucket{stage="render",le="0.1"} 1',
+        'app_seconds_bucket{stage="render",le="1"} 2',
+        'app_seconds_bucket{stage="render",le="+Inf"} 3',
+        'app_seconds_sum{stage="render"} 5.55',
+        'app_seconds_count{stage="render"} 3',
+    ]
+
+
+def test_collectors_skip_missing_values(registry):
+    registry.add_collector(lambda: [("app_hits", "gauge", "Hits", [({"cache": "a"}, 1.5), ({"cache": "b"}, None)])])
+    assert registry.render().splitlines()[2:] == ['app_hits{cache="a"} 1.5']
+
+
+def test_pool_events_from_many_threads_are_not_lost(registry):
+    pool = MongoPoolMetrics(registry)
+    event = SimpleNamespace(address=("db", 27017))
+
+    def churn():
+        for _ in range(2000):
+            pool.connection_checked_out(event)
+            pool.connection_checked_in(event)
+
+    switch_interval = sys.getswitchinterval()
+    # Switch threads often so unlocked updates would interleave
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=churn) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert pool.checked_out.value(address="db:27017") == 0
+    assert pool.checkouts.value(address="db:27017", result="ok") == 16000
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from services.offline_store import OfflineStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    offline_store = OfflineStore(str(tmp_path / "offline" / "store.db"))
+    yield offline_store
+    offline_store.close()
+
+
+def resume(title, user_email="a@example.com"):
+    return {"user_email": user_email, "resume_data": {"name": title}, "title": title}
+
+
+def test_file_is_only_created_on_first_write(store):
+    async def scenario():
+        assert not store.exists()
+        assert await store.stats() == {
+            "path": store.path, "pending_users": 0, "pending_resumes": 0, "dead_letters": 0,
+        }
+        await store.save_resumes([resume("A")])
+        assert store.exists()
+
+    asyncio.run(scenario())
+
+
+def test_resumes_round_trip(store):
+    async def scenario():
+        resume_id = str(ObjectId())
+        ids = await store.save_resumes([{**resume("A"), "_id": resume_id}, resume("B")])
+        assert ids[0] == resume_id
+
+        doc = await store.get_resume(resume_id, "a@example.com")
+        assert doc["_id"] == ObjectId(resume_id)
+        assert doc["resume_data"] == {"name": "A"}
+        assert await store.get_resume(resume_id, "b@example.com") is None
+
+        assert await store.update_resume(resume_id, "a@example.com", {"is_active": False})
+        assert await store.get_resume(resume_id, "a@example.com") is None
+        assert [doc["title"] for doc in await store.list_resumes("a@example.com")] == ["B"]
+
+    asyncio.run(scenario())
+
+
+def test_replayed_resumes_are_removed_unless_written_again(store):
+    async def scenario():
+        first, second = await store.save_resumes([resume("A"), resume("B")])
+        pending = await store.pending_resumes(10)
+        assert [version for _, version in pending] == [1, 1]
+
+        # Written again while the replay was in flight: it must stay pending
+        await store.update_resume(second, "a@example.com", {"title": "B2"})
+        await store.mark_resumes_replayed([(str(doc["_id"]), version) for doc, version in pending])
+
+        remaining = await store.pending_resumes(10)
+        assert [(str(doc["_id"]), doc["title"], version) for doc, version in remaining] == [(second, "B2", 2)]
+
+        await store.mark_resumes_replayed([(second, 2)])
+        assert await store.pending_resumes(10) == []
+
+    asyncio.run(scenario())
+
+
+def test_replayed_users_are_removed_unless_they_logged_in_again(store):
+    async def scenario():
+        user = await store.create_or_get_user("a@example.com", "A")
+        await store.create_or_get_users([("b@example.com", "B"), ("a@example.com", "Ignored")])
+        pending = await store.pending_users(10)
+        assert sorted(doc["email"] for doc, _ in pending) == ["a@example.com", "b@example.com"]
+
+        again = await store.create_or_get_user("a@example.com", "A")
+        assert again["_id"] == user["_id"]
+        await store.mark_users_replayed([(doc["email"], version) for doc, version in pending])
+
+        remaining = await store.pending_users(10)
+        assert [(doc["email"], version) for doc, version in remaining] == [("a@example.com", 2)]
+
+    asyncio.run(scenario())
+
+
+def test_list_resumes_pages_by_keyset(store):
+    async def scenario():
+        await store.save_resumes([resume(title) for title in "ABCDE"])
+        first_page = await store.list_resumes("a@example.com", limit=2)
+        last = first_page[-1]
+        rest = await store.list_resumes("a@example.com", after=(last["updated_at"], last["_id"]))
+        titles = [doc["title"] for doc in first_page + rest]
+        assert sorted(titles) == list("ABCDE")
+        assert len(set(titles)) == 5
+
+    asyncio.run(scenario())
+
+
+def test_dead_lettered_rows_leave_the_replay_queue(store):
+    async def scenario():
+        first, second = await store.save_resumes([resume("A"), resume("B")])
+        await store.create_or_get_user("a@example.com", "A")
+        pending = await store.pending_resumes(10)
+        versions = {str(doc["_id"]): version for doc, version in pending}
+
+        # Written again after it was handed out, so it gets another attempt
+        await store.update_resume(second, "a@example.com", {"title": "B2"})
+        await store.dead_letter_resumes([(first, versions[first], "too large"), (second, versions[second], "too large")])
+        await store.dead_letter_users([("a@example.com", 1, "bad user")])
+
+        assert [str(doc["_id"]) for doc, _ in await store.pending_resumes(10)] == [second]
+        assert await store.pending_users(10) == []
+        dead = await store.dead_letters()
+        assert [(entry["kind"], entry["key"], entry["error"]) for entry in dead] == [
+            ("resume", first, "too large"),
+            ("user", "a@example.com", "bad user"),
+        ]
+        assert dead[0]["document"]["title"] == "A"
+        assert (await store.stats())["dead_letters"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import signal
+import threading
+
+import pytest
+
+from services.pdf_generator import PDFGenerator, PDFRenderBusy
+
+RESUME = {
+    "name": "Ann Example",
+    "contact_info": {"email": "ann@example.com", "phone": "+1 555 123 4567"},
+    "summary": "Engineer.",
+    "skills": ["Python"],
+}
+
+
+@pytest.fixture
+def blocked_generator():
+    """Renders on threads, each blocking until `release` is set"""
+    generator = PDFGenerator(render_workers=0)
+    generator.release = threading.Event()
+    build = generator._build_pdf
+
+    def blocked_build(resume_data):
+        generator.release.wait(5)
+        return build(resume_data)
+
+    generator._build_pdf = blocked_build
+    yield generator
+    generator.release.set()
+    generator.shutdown()
+
+
+def test_renders_past_max_pending_are_rejected(blocked_generator):
+    blocked_generator.max_pending = 2
+
+    async def scenario():
+        renders = [asyncio.ensure_future(blocked_generator.generate_pdf(RESUME)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert blocked_generator.is_saturated()
+        with pytest.raises(PDFRenderBusy):
+            await blocked_generator.generate_pdf(RESUME)
+
+        blocked_generator.release.set()
+        for pdf_bytes in await asyncio.gather(*renders):
+            assert pdf_bytes.startswith(b"%PDF")
+        await asyncio.sleep(0)
+        assert blocked_generator.pending == 0
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_render_keeps_its_slot_until_the_build_ends(blocked_generator):
+    blocked_generator.render_timeout = 0.05
+
+    async def scenario():
+        with pytest.raises(Exception, match="Error generating PDF"):
+            await blocked_generator.generate_pdf(RESUME)
+        # The build is still running on its thread
+        assert blocked_generator.pending == 1
+
+        blocked_generator.release.set()
+        for _ in range(100):
+            if blocked_generator.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert blocked_generator.pending == 0
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def process_generator(monkeypatch):
+    monkeypatch.setenv("PDF_RENDER_START_METHOD", "fork")
+    generator = PDFGenerator(render_workers=1)
+    yield generator
+    generator.shutdown()
+
+
+def test_render_pool_is_rebuilt_after_a_worker_dies(process_generator):
+    async def scenario():
+        assert (await process_generator.generate_pdf(RESUME)).startswith(b"%PDF")
+
+        (pid,) = process_generator.executor._processes
+        os.kill(pid, signal.SIGKILL)
+        for _ in range(3):
+            assert (await process_generator.generate_pdf(RESUME)).startswith(b"%PDF")
+        assert process_generator.stats()["pool_restarts"] == 1
+        await asyncio.sleep(0)
+        assert process_generator.pending == 0
+
+    asyncio.run(scenario())
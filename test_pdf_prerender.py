@@ -0,0 +1,76 @@
+import asyncio
+
+from services.pdf_prerender import PDFPrerenderer
+
+
+def blocked():
+    gate = asyncio.Event()
+
+    async def render():
+        await gate.wait()
+
+    return gate, render
+
+
+def test_disabled_prerenderer_schedules_nothing():
+    async def scenario():
+        prerenderer = PDFPrerenderer(enabled=False)
+        assert not prerenderer.schedule("a", blocked()[1])
+        assert prerenderer.stats()["skipped"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_renders_are_skipped_rather_than_queued():
+    async def scenario():
+        saturated = False
+        prerenderer = PDFPrerenderer(enabled=True, max_concurrency=1, is_saturated=lambda: saturated)
+        gate, render = blocked()
+        assert prerenderer.schedule("a", render)
+        assert not prerenderer.schedule("a", render)  # Already running for this resume
+        assert not prerenderer.schedule("b", render)  # At the concurrency limit
+
+        gate.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        saturated = True
+        assert not prerenderer.schedule("b", render)  # Render pool is saturated
+        assert prerenderer.stats() == {
+            "enabled": True, "in_flight": 0, "scheduled": 1, "skipped": 2,
+            "completed": 1, "failed": 0, "cancelled": 0,
+        }
+
+    asyncio.run(scenario())
+
+
+def test_cancel_and_failure_are_counted():
+    async def scenario():
+        prerenderer = PDFPrerenderer(enabled=True, max_concurrency=3)
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        assert prerenderer.schedule("a", blocked()[1])
+        assert prerenderer.schedule("b", fail)
+        await asyncio.sleep(0)
+        assert prerenderer.cancel("a")
+        assert not prerenderer.cancel("missing")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        stats = prerenderer.stats()
+        assert (stats["in_flight"], stats["cancelled"], stats["failed"]) == (0, 1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_cancel_all_waits_for_every_render():
+    async def scenario():
+        prerenderer = PDFPrerenderer(enabled=True, max_concurrency=3)
+        for key in "abc":
+            prerenderer.schedule(key, blocked()[1])
+        await prerenderer.cancel_all()
+        assert prerenderer.stats()["in_flight"] == 0
+        assert prerenderer.stats()["cancelled"] == 3
+
+    asyncio.run(scenario())
@@ -0,0 +1,47 @@
+import asyncio
+import os
+
+from services.pdf_store import LocalPDFStore
+
+
+def test_local_store_round_trip(tmp_path):
+    async def scenario():
+        store = LocalPDFStore(str(tmp_path / "pdfs"))
+        pdf_url = await store.put("abc123", b"%PDF-1.4")
+        assert pdf_url == "local://abc123.pdf"
+        assert await store.get(pdf_url) == b"%PDF-1.4"
+        # Only the final file is left, no temp files
+        assert os.listdir(store.directory) == ["abc123.pdf"]
+
+        assert await store.get("local://missing.pdf") is None
+        assert await store.get("gridfs://abc123") is None
+        assert await store.get(None) is None
+
+    asyncio.run(scenario())
+
+
+def test_local_store_urls_cannot_escape_the_directory(tmp_path):
+    async def scenario():
+        (tmp_path / "secret.pdf").write_bytes(b"secret")
+        store = LocalPDFStore(str(tmp_path / "pdfs"))
+        assert await store.get("local://../secret.pdf") is None
+        await store.delete("local://../secret.pdf")
+        assert (tmp_path / "secret.pdf").exists()
+
+    asyncio.run(scenario())
+
+
+def test_local_store_delete(tmp_path):
+    async def scenario():
+        store = LocalPDFStore(str(tmp_path))
+        pdf_url = await store.put("abc123", b"%PDF-1.4")
+        await store.delete(pdf_url)
+        assert await store.get(pdf_url) is None
+        assert os.listdir(store.directory) == []
+
+        # Already gone, or not one of ours
+        await store.delete(pdf_url)
+        await store.delete("gridfs://abc123")
+        await store.delete(None)
+
+    asyncio.run(scenario())
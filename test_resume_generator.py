@@ -0,0 +1,175 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from models.resume_models import ResumeRequest
+from services.resume_generator import ResumeGenerator
+
+RESUME = {
+    "name": "Ann Example",
+    "contact_info": {"email": "ann@example.com", "phone": "555-123-4567"},
+    "summary": "Engineer.",
+    "education": [],
+    "skills": ["Python"],
+    "projects": [],
+}
+
+
+def resume_request():
+    return ResumeRequest(
+        name="Ann Example", email="ann@example.com", phone="555-123-4567", experience_level="entry",
+        target_role="Engineer", skills="Python", education="BSc", projects="A project",
+    )
+
+
+class FakeStream:
+    def __init__(self, text, release):
+        self.pieces = [text[index:index + 16] for index in range(0, len(text), 16)]
+        self.release = release
+        self.closed = False
+
+    async def __aiter__(self):
+        for index, piece in enumerate(self.pieces):
+            if index == len(self.pieces) - 1:
+                await self.release.wait()
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], x_groq=None)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions.with_raw_response"""
+
+    def __init__(self, text=json.dumps(RESUME)):
+        self.text = text
+        self.calls = []
+        self.release = asyncio.Event()
+        self.streams = []
+
+    async def create(self, stream=False, **params):
+        self.calls.append(stream)
+        if stream:
+            parsed = FakeStream(self.text, self.release)
+            self.streams.append(parsed)
+        else:
+            await self.release.wait()
+            parsed = SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))], usage=None
+            )
+        return SimpleNamespace(headers={}, parse=lambda: parsed)
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setenv("GROQ_BASE_URL", "http://groq.test")
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    resume_generator = ResumeGenerator()
+    completions = FakeCompletions()
+    resume_generator.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        with_raw_response=completions
+    )))
+    resume_generator.fake = completions
+    return resume_generator
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+def test_request_during_a_stream_waits_for_it(generator):
+    async def scenario():
+        streaming = asyncio.ensure_future(collect(generator.stream_resume(resume_request())))
+        while not generator.fake.streams:
+            await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(generator.generate_resume(resume_request()))
+        await asyncio.sleep(0)
+        generator.fake.release.set()
+
+        events, generated = await asyncio.gather(streaming, waiting)
+        assert generator.fake.calls == [True]
+        assert events[-1] == ("resume", RESUME)
+        assert generated == RESUME
+        assert generator.fake.streams[0].closed
+        assert generator.scheduler.running == 0
+
+    asyncio.run(scenario())
+
+
+def test_abandoned_stream_lets_waiters_generate_themselves(generator):
+    async def scenario():
+        stream = generator.stream_resume(resume_request())
+        assert (await stream.__anext__())[0] == "section"
+        waiting = asyncio.ensure_future(generator.generate_resume(resume_request()))
+        await asyncio.sleep(0)
+        # The streaming client disconnects
+        await stream.aclose()
+        generator.fake.release.set()
+
+        assert await waiting == RESUME
+        assert generator.fake.calls == [True, False]
+        assert generator.in_flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_failed_stream_fails_its_waiters(generator):
+    generator.fake.text = "I can't write this resume right now, sorry."
+
+    async def scenario():
+        streaming = asyncio.ensure_future(collect(generator.stream_resume(resume_request())))
+        while not generator.fake.streams:
+            await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(generator.generate_resume(resume_request()))
+        await asyncio.sleep(0)
+        generator.fake.release.set()
+
+        for task in (streaming, waiting):
+            with pytest.raises(Exception, match="No valid JSON"):
+                await task
+        assert generator.fake.calls == [True]
+
+    asyncio.run(scenario())
+
+
+def test_api_key_is_required_for_the_real_api(monkeypatch):
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.delenv("GROQ_BASE_URL", raising=False)
+    with pytest.raises(ValueError, match="GROQ_API_KEY"):
+        ResumeGenerator()
+
+
+def test_client_shares_one_pooled_transport_and_closes_it(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "key")
+    monkeypatch.delenv("GROQ_BASE_URL", raising=False)
+    monkeypatch.setenv("GROQ_TIMEOUT_SECONDS", "12")
+    monkeypatch.setenv("GROQ_MAX_CONNECTIONS", "3")
+
+    async def scenario():
+        resume_generator = ResumeGenerator()
+        assert resume_generator.client._client is resume_generator.http_client
+        # Retries belong to the scheduler
+        assert resume_generator.client.max_retries == 0
+        assert resume_generator.http_client.timeout.read == 12
+        assert resume_generator.http_client._transport._pool._max_connections == 3
+
+        await resume_generator.aclose()
+        assert resume_generator.http_client.is_closed
+
+    asyncio.run(scenario())
+
+
+def test_generation_does_not_block_the_event_loop(generator):
+    async def scenario():
+        generating = asyncio.ensure_future(generator.generate_resume(resume_request()))
+        while not generator.fake.calls:
+            await asyncio.sleep(0)
+        # Other requests are served while the LLM call is outstanding
+        assert await asyncio.wait_for(asyncio.sleep(0, "served"), timeout=1) == "served"
+        assert not generating.done()
+        generator.fake.release.set()
+        assert await generating == RESUME
+
+    asyncio.run(scenario())
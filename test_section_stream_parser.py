@@ -0,0 +1,57 @@
+import json
+
+from services.section_stream_parser import IncrementalSectionParser
+
+RESUME = {
+    "name": "Jane \"JD\" Doe",
+    "contact_info": {"email": "jane@example.com", "links": ["a", "b"]},
+    "summary": "Builds {fast} things, with commas, and \\ backslashes",
+    "skills": ["Python", "SQL [advanced]"],
+    "projects": [{"title": "Parser", "details": "Handles }] in strings"}],
+}
+
+
+def feed_in_chunks(parser, text, size):
+    sections = []
+    for start in range(0, len(text), size):
+        sections.extend(parser.feed(text[start:start + size]))
+    return sections
+
+
+def test_emits_every_section_in_order_for_any_chunking():
+    text = "Here is the resume:\n" + json.dumps(RESUME, indent=2) + "\nThanks!"
+    for size in (1, 2, 3, 7, 64, len(text)):
+        parser = IncrementalSectionParser()
+        sections = feed_in_chunks(parser, text, size)
+        assert sections == list(RESUME.items()), size
+        assert parser.done
+        assert parser.text == text
+
+
+def test_section_is_emitted_as_soon_as_it_completes():
+    parser = IncrementalSectionParser()
+    assert parser.feed('{"name": "Jane", "summ') == [("name", "Jane")]
+    assert parser.feed('ary": "Hi"') == []
+    assert parser.feed("}") == [("summary", "Hi")]
+
+
+def test_escaped_quotes_split_across_chunks():
+    parser = IncrementalSectionParser()
+    assert parser.feed('{"summary": "say \\') == []
+    assert parser.feed('"hi\\" now", "skills": []}') == [("summary", 'say "hi" now'), ("skills", [])]
+
+
+def test_escaped_key():
+    parser = IncrementalSectionParser()
+    assert parser.feed('{"we\\"ird": 1}') == [('we"ird', 1)]
+
+
+def test_ignores_text_after_the_object():
+    parser = IncrementalSectionParser()
+    assert parser.feed('{"a": 1} {"b": 2}') == [("a", 1)]
+    assert parser.feed(', "c": 3}') == []
+
+
+def test_invalid_value_is_skipped():
+    parser = IncrementalSectionParser()
+    assert parser.feed('{"a": nope, "b": true}') == [("b", True)]
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from services.single_flight import FlightAbandoned, SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"value": calls}
+
+        waiters = [asyncio.ensure_future(flight.do("key", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert "key" in flight
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert results == [{"value": 1}] * 5
+        assert flight.stats() == {"in_flight": 0, "started": 1, "coalesced": 4}
+
+    asyncio.run(scenario())
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+
+        assert await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2))) == [1, 2]
+        assert flight.started == 2
+
+    asyncio.run(scenario())
+
+
+def test_exception_reaches_every_waiter_and_key_is_released():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+        assert [str(result) for result in results] == ["boom", "boom"]
+        assert "key" not in flight
+
+        # The next call starts fresh work
+        async def succeed():
+            return "ok"
+
+        assert await flight.do("key", succeed) == "ok"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_shared_work():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+        assert await second == "done"
+
+    asyncio.run(scenario())
+
+
+def test_begin_registers_work_run_by_the_caller():
+    async def scenario():
+        flight = SingleFlight()
+        owned = flight.begin("key")
+        assert flight.begin("key") is None
+
+        async def work():
+            raise AssertionError("should wait for the owner")
+
+        waiter = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        owned.set_result("streamed")
+        assert await waiter == "streamed"
+        assert "key" not in flight
+
+    asyncio.run(scenario())
+
+
+def test_abandoned_work_is_run_by_the_waiter():
+    async def scenario():
+        flight = SingleFlight()
+        owned = flight.begin("key")
+
+        async def work():
+            return "own"
+
+        waiter = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        owned.set_exception(FlightAbandoned())
+        assert await waiter == "own"
+        assert flight.stats() == {"in_flight": 0, "started": 2, "coalesced": 1}
+
+    asyncio.run(scenario())
@@ -0,0 +1,148 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services import tracing
+from services.tracing import NULL_SPAN, RequestTracingMiddleware, Tracer, from_otlp, to_otlp
+
+
+class Processor:
+    def __init__(self):
+        self.spans = []
+
+    def submit(self, spans):
+        self.spans.extend(spans)
+
+    def shutdown(self):
+        pass
+
+    def stats(self):
+        return {}
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    recorded = Processor()
+    monkeypatch.setattr(tracing, "_tracer", Tracer(recorded))
+    return recorded
+
+
+def record_trace(tracer, **root_options):
+    root = tracer.start_trace("GET /resumes", request_id="req-1", **root_options)
+    with root:
+        with tracer.span("db.list", {"db.system": "mongodb", "limit": 20, "cached": False, "ratio": 0.5}):
+            pass
+    return root
+
+
+def test_disabled_tracer_hands_out_null_spans():
+    tracer = Tracer()
+    assert tracer.start_trace("GET /") is NULL_SPAN
+    assert tracer.span("child") is NULL_SPAN
+
+
+def test_sampled_trace_exports_root_and_children(processor):
+    record_trace(tracing.get_tracer())
+    root, child = sorted(processor.spans, key=lambda span: span["kind"] != "server")
+    assert root["name"] == "GET /resumes"
+    assert root["request_id"] == "req-1"
+    assert child["parent_id"] == root["span_id"]
+    assert child["trace_id"] == root["trace_id"]
+
+
+def test_unsampled_trace_is_not_recorded(monkeypatch):
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.9)
+    processor = Processor()
+    tracer = Tracer(processor, sample_rate=0.5)
+    assert tracer.start_trace("GET /") is NULL_SPAN
+    assert tracer.traces == 0
+
+
+def test_sampled_fraction_is_recorded(monkeypatch):
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.1)
+    processor = Processor()
+    tracer = Tracer(processor, sample_rate=0.5)
+    record_trace(tracer)
+    assert tracer.exported_traces == 1
+    assert len(processor.spans) == 2
+
+
+def test_slow_unsampled_trace_is_still_exported(monkeypatch):
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.9)
+    processor = Processor()
+    tracer = Tracer(processor, sample_rate=0.5, slow_ms=1e9)
+    record_trace(tracer)
+    # Recorded so it could be kept if slow, but it wasn't
+    assert tracer.traces == 1
+    assert tracer.exported_traces == 0
+
+    tracer.slow_ms = 1e-9
+    record_trace(tracer)
+    assert tracer.exported_traces == 1
+
+
+def test_upstream_sampling_decision_is_followed():
+    processor = Processor()
+    tracer = Tracer(processor, sample_rate=1.0)
+    trace_id, parent_id = "ab" * 16, "cd" * 8
+    assert tracer.start_trace("GET /", traceparent=f"00-{trace_id}-{parent_id}-00") is NULL_SPAN
+
+    record_trace(tracer, traceparent=f"00-{trace_id}-{parent_id}-01")
+    root = next(span for span in processor.spans if span["kind"] == "server")
+    assert (root["trace_id"], root["parent_id"]) == (trace_id, parent_id)
+
+
+def test_spans_beyond_the_limit_are_dropped():
+    processor = Processor()
+    tracer = Tracer(processor, max_spans_per_trace=2)
+    with tracer.start_trace("GET /"):
+        for _ in range(4):
+            with tracer.span("child"):
+                pass
+    assert len(processor.spans) == 3
+    root = next(span for span in processor.spans if span["kind"] == "server")
+    assert root["attributes"]["trace.dropped_spans"] == 2
+
+
+def test_otlp_round_trip(processor):
+    tracer = tracing.get_tracer()
+    root = tracer.start_trace("POST /export", request_id="req-2")
+    with pytest.raises(RuntimeError):
+        with root:
+            raise RuntimeError("render failed")
+    record_trace(tracer)
+
+    payload = to_otlp(processor.spans, "resume-builder")
+    resource = payload["resourceSpans"][0]["resource"]
+    assert resource["attributes"] == [{"key": "service.name", "value": {"stringValue": "resume-builder"}}]
+    assert from_otlp(payload) == processor.spans
+
+
+def test_root_span_is_named_after_the_route_template(processor):
+    app = FastAPI()
+
+    @app.get("/user/{user_email}/resumes")
+    async def get_resume(user_email: str):
+        return {"email": user_email}
+
+    app.add_middleware(RequestTracingMiddleware)
+    response = TestClient(app).get("/user/ann@example.com/resumes", headers={"X-Request-ID": "req-3"})
+    assert response.headers["x-request-id"] == "req-3"
+
+    (root,) = processor.spans
+    assert root["name"] == "GET /user/{user_email}/resumes"
+    assert root["attributes"]["http.route"] == "/user/{user_email}/resumes"
+    assert "ann@example.com" not in json.dumps(root)
+    assert root["attributes"]["http.status_code"] == 200
+    assert root["attributes"]["code.function"] == "get_resume"
+
+
+def test_unmatched_request_keeps_the_method_name(processor):
+    app = FastAPI()
+    app.add_middleware(RequestTracingMiddleware)
+    assert TestClient(app).get("/nowhere").status_code == 404
+    (root,) = processor.spans
+    assert root["name"] == "GET"
+    assert "http.route" not in root["attributes"]
@@ -0,0 +1,103 @@
+import asyncio
+
+from services.write_behind import WriteBehindBuffer
+
+
+class Sink:
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("down")
+        self.batches.append([doc["n"] for doc in batch])
+
+
+def test_flushes_when_the_batch_is_full():
+    async def scenario():
+        sink = Sink()
+        buffer = WriteBehindBuffer(sink, max_batch=3, max_delay_seconds=60)
+        for n in range(3):
+            await buffer.add(str(n), {"n": n})
+        await asyncio.sleep(0.01)
+        assert sink.batches == [[0, 1, 2]]
+        assert buffer.stats()["batches"] == 1
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_flushes_after_the_delay():
+    async def scenario():
+        sink = Sink()
+        buffer = WriteBehindBuffer(sink, max_batch=100, max_delay_seconds=0.02)
+        await buffer.add("a", {"n": 1})
+        assert sink.batches == []
+        await asyncio.sleep(0.1)
+        assert sink.batches == [[1]]
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_queued_documents_are_readable_and_updatable():
+    async def scenario():
+        sink = Sink()
+        buffer = WriteBehindBuffer(sink, max_batch=100, max_delay_seconds=60)
+        await buffer.add("a", {"n": 1})
+        assert buffer.get("a") == {"n": 1}
+        assert await buffer.update("a", {"n": 2})
+        assert not await buffer.update("missing", {"n": 3})
+
+        await buffer.close()
+        assert sink.batches == [[2]]
+        assert buffer.get("a") is None
+
+    asyncio.run(scenario())
+
+
+def test_failed_flush_goes_to_the_fallback():
+    async def scenario():
+        sink = Sink(failures=1)
+        fallback = Sink()
+        buffer = WriteBehindBuffer(sink, max_delay_seconds=60, fallback=fallback)
+        await buffer.add("a", {"n": 1})
+        await buffer.flush()
+        assert fallback.batches == [[1]]
+        assert buffer.stats()["failures"] == 1
+        assert buffer.stats()["queue_depth"] == 0
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_failed_flush_without_fallback_is_retried():
+    async def scenario():
+        sink = Sink(failures=1)
+        buffer = WriteBehindBuffer(sink, max_delay_seconds=60)
+        await buffer.add("a", {"n": 1})
+        await buffer.flush()
+        assert buffer.get("a") == {"n": 1}
+
+        await buffer.add("b", {"n": 2})
+        await buffer.flush()
+        # Retried documents keep their place ahead of newer ones
+        assert sink.batches == [[1, 2]]
+        await buffer.close()
+
+    asyncio.run(scenario())
+
+
+def test_close_flushes_everything():
+    async def scenario():
+        sink = Sink()
+        buffer = WriteBehindBuffer(sink, max_batch=100, max_delay_seconds=60)
+        for n in range(5):
+            await buffer.add(str(n), {"n": n})
+        await buffer.close()
+        assert sink.batches == [[0, 1, 2, 3, 4]]
+        assert buffer.stats()["flushed"] == 5
+
+    asyncio.run(scenario())
@@ -0,0 +1,36 @@
+import asyncio
+import io
+import zipfile
+
+from services.zip_export import stream_zip
+
+
+async def entries(members):
+    for filename, data in members:
+        yield filename, data
+
+
+def build_zip(members):
+    async def collect():
+        return [chunk async for chunk in stream_zip(entries(members))]
+
+    return asyncio.run(collect())
+
+
+def test_streamed_archive_is_valid():
+    members = [("a.pdf", b"%PDF-1.4 first"), ("b.pdf", b"%PDF-1.4 second" * 1000)]
+    chunks = build_zip(members)
+    # One chunk per member plus the central directory
+    assert len(chunks) == 3
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["a.pdf", "b.pdf"]
+        for filename, data in members:
+            assert archive.read(filename) == data
+            assert archive.getinfo(filename).compress_type == zipfile.ZIP_STORED
+
+
+def test_empty_archive_is_valid():
+    with zipfile.ZipFile(io.BytesIO(b"".join(build_zip([])))) as archive:
+        assert archive.namelist() == []